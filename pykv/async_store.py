@@ -0,0 +1,128 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pykv.durability import DURABILITY_PERIODIC
+from pykv.main import KeyValueStore
+from pykv.utils import is_passed
+
+
+class AsyncKeyValueStore:
+    def __init__(self, max_workers: int = 4, **key_value_store_options):
+        self.kv_store = KeyValueStore(**key_value_store_options)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pykv")
+        self.background_tasks: List[asyncio.Task] = []
+
+    def is_file_store(self) -> bool:
+        return self.kv_store.store is self.kv_store.file_store
+
+    async def run_blocking(self, function, *args):
+        if not self.is_file_store():
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(function, *args))
+
+    async def run_periodically(self, job, interval_in_seconds: float):
+        while True:
+            await asyncio.sleep(interval_in_seconds)
+            await self.run_blocking(job)
+
+    async def run_expiry_cycles(self):
+        active_expiry = self.kv_store.store.active_expiry
+        while True:
+            await asyncio.sleep(active_expiry.next_interval_in_seconds())
+            await self.run_blocking(self.kv_store.store.expire_cycle)
+
+    def start(self):
+        if self.kv_store.read_only:
+            return
+
+        self.background_tasks.append(asyncio.create_task(self.run_expiry_cycles()))
+
+        if self.is_file_store():
+            file_store = self.kv_store.file_store
+            self.background_tasks.append(asyncio.create_task(
+                self.run_periodically(file_store.write_hint_file_if_changed, file_store.hint_interval_in_seconds)))
+            if file_store.durability.policy.mode == DURABILITY_PERIODIC:
+                self.background_tasks.append(asyncio.create_task(
+                    self.run_periodically(file_store.durability.flush,
+                                          file_store.durability.policy.flush_interval_in_milliseconds / 1000)))
+            if file_store.compaction_budget_per_cycle > 0:
+                self.background_tasks.append(asyncio.create_task(
+                    self.run_periodically(functools.partial(file_store.compact, file_store.compaction_budget_per_cycle),
+                                          file_store.background_jobs_frequency_in_seconds)))
+
+    async def stop_background_jobs(self):
+        for background_task in self.background_tasks:
+            background_task.cancel()
+        await asyncio.gather(*self.background_tasks, return_exceptions=True)
+        self.background_tasks = []
+
+    async def close(self):
+        await self.stop_background_jobs()
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.kv_store.file_store.close)
+        self.executor.shutdown()
+
+    async def shutdown(self):
+        await self.stop_background_jobs()
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.kv_store.file_store.write_hint_file)
+        self.executor.shutdown()
+
+    def read_cached(self, key_string: str) -> Tuple[bool, Any]:
+        # Returns whether the key was served from the cache along with its value, since a cached value may be None.
+        value_cache = self.kv_store.file_store.value_cache
+        if not self.is_file_store() or value_cache is None:
+            return False, None
+
+        cached_value = value_cache.get(key_string, count_miss=False)
+        if cached_value is None:
+            return False, None
+
+        value, ttl_in_seconds = cached_value
+        if ttl_in_seconds > 0 and is_passed(ttl_in_seconds):
+            return False, None
+        return True, value
+
+    async def read(self, key_string: str):
+        is_cached, value = self.read_cached(key_string)
+        if is_cached:
+            return value
+        return await self.run_blocking(self.kv_store.read, key_string)
+
+    async def write(self, key_string: str, value: Any, time_to_live_in_seconds=0):
+        return await self.run_blocking(self.kv_store.write, key_string, value, time_to_live_in_seconds)
+
+    async def delete(self, key_string: str):
+        return await self.run_blocking(self.kv_store.delete, key_string)
+
+    async def get_all(self) -> Dict[str, Any]:
+        return await self.run_blocking(self.kv_store.get_all)
+
+    async def range(self, start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None,
+                    keys_only=False) -> List[Any]:
+        return await self.run_blocking(self.kv_store.range, start, end, limit, keys_only)
+
+    async def prefix(self, prefix: str, limit: Optional[int] = None, keys_only=False) -> List[Any]:
+        return await self.run_blocking(self.kv_store.prefix, prefix, limit, keys_only)
+
+    async def scan(self, cursor: int = 0, count: int = 100, match: Optional[str] = None, keys_only=False):
+        return await self.run_blocking(self.kv_store.scan, cursor, count, match, keys_only)
+
+    async def scan_iter(self, match: Optional[str] = None, keys_only=False, count: int = 100) -> AsyncIterator[Any]:
+        cursor = 0
+        while True:
+            cursor, keys_and_values = await self.scan(cursor, count, match, keys_only)
+            for key_or_item in keys_and_values:
+                yield key_or_item
+            if cursor == 0:
+                return
+
+    async def read_many(self, key_strings: List[str]) -> Dict[str, Any]:
+        return await self.run_blocking(self.kv_store.read_many, key_strings)
+
+    async def write_many(self, keys_and_values: Dict[str, Any],
+                         time_to_live_in_seconds=0) -> Dict[str, Optional[Exception]]:
+        return await self.run_blocking(self.kv_store.write_many, keys_and_values, time_to_live_in_seconds)
+
+    async def delete_many(self, key_strings: List[str]) -> Dict[str, Optional[Exception]]:
+        return await self.run_blocking(self.kv_store.delete_many, key_strings)
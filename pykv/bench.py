@@ -0,0 +1,361 @@
+import argparse
+import json
+import mmap
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone
+from time import perf_counter, sleep, time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pykv.main import KeyValueStore
+from pykv.record import RecordManager
+
+SMALL_VALUE = {'1': 'small value'}
+THIRTY_SLOT_VALUE = {'1': 14980 * 'v'}
+
+BenchmarkResult = Dict[str, Any]
+
+
+class BenchmarkContext:
+    def __init__(self, store_kind: str, records: int, load_records: int, threads: int, directory: str, seed: int):
+        self.store_kind = store_kind
+        self.records = records
+        self.load_records = load_records
+        self.threads = threads
+        self.directory = directory
+        self.random = random.Random(seed)
+        self.file_index = 0
+
+    def new_file_path(self) -> str:
+        self.file_index += 1
+        return os.path.relpath(os.path.join(self.directory, f"bench_{self.file_index}.bin"))
+
+    def new_store(self, **options) -> KeyValueStore:
+        return KeyValueStore(file_path=self.new_file_path(), mem_store_mode=self.store_kind == "mem", **options)
+
+    def new_filled_store(self, count: int, value: Any = SMALL_VALUE, **options) -> KeyValueStore:
+        kv_store = self.new_store(**options)
+        for start in range(0, count, 1000):
+            kv_store.write_many({f"key_{index}": value for index in range(start, min(start + 1000, count))})
+        return kv_store
+
+
+def timed(function: Callable[[], Any]) -> float:
+    started_at = perf_counter()
+    function()
+    return perf_counter() - started_at
+
+
+def bench_write_single(context: BenchmarkContext) -> Tuple[int, float]:
+    kv_store = context.new_store()
+
+    def run():
+        for index in range(context.records):
+            kv_store.write(f"key_{index}", SMALL_VALUE)
+
+    elapsed = timed(run)
+    kv_store.close()
+    return context.records, elapsed
+
+
+def bench_write_batch(context: BenchmarkContext) -> Tuple[int, float]:
+    kv_store = context.new_store()
+
+    def run():
+        for start in range(0, context.records, 100):
+            kv_store.write_many({f"key_{index}": SMALL_VALUE
+                                 for index in range(start, min(start + 100, context.records))})
+
+    elapsed = timed(run)
+    kv_store.close()
+    return context.records, elapsed
+
+
+def bench_read(context: BenchmarkContext, value: Any, count: int) -> Tuple[int, float]:
+    kv_store = context.new_filled_store(count, value)
+    key_strings = [f"key_{context.random.randrange(count)}" for _ in range(context.records)]
+
+    def run():
+        for key_string in key_strings:
+            kv_store.read(key_string)
+
+    elapsed = timed(run)
+    kv_store.close()
+    return len(key_strings), elapsed
+
+
+def bench_read_1_slot(context: BenchmarkContext) -> Tuple[int, float]:
+    return bench_read(context, SMALL_VALUE, context.records)
+
+
+def bench_read_30_slot(context: BenchmarkContext) -> Tuple[int, float]:
+    return bench_read(context, THIRTY_SLOT_VALUE, max(1, context.records // 30))
+
+
+def bench_delete_churn(context: BenchmarkContext) -> Tuple[int, float]:
+    kv_store = context.new_filled_store(context.records)
+    key_strings = [f"key_{index}" for index in range(context.records)]
+    context.random.shuffle(key_strings)
+
+    def run():
+        # Every delete frees a hole that the following write, with a different size, has to fit somewhere.
+        for index, key_string in enumerate(key_strings):
+            kv_store.delete(key_string)
+            kv_store.write(key_string, SMALL_VALUE if index % 2 else {'1': 1200 * 'c'})
+
+    elapsed = timed(run)
+    kv_store.close()
+    return 2 * len(key_strings), elapsed
+
+
+def bench_load(context: BenchmarkContext, with_hint_file: bool) -> Tuple[int, float]:
+    kv_store = context.new_filled_store(context.load_records)
+    kv_store.shutdown()
+    file_path = kv_store.__file_path__
+    if not with_hint_file:
+        os.remove(file_path + ".hint")
+
+    reopened_store = None
+
+    def run():
+        nonlocal reopened_store
+        reopened_store = KeyValueStore(file_path=file_path)
+
+    elapsed = timed(run)
+    reopened_store.close()
+    return context.load_records, elapsed
+
+
+def bench_load_scan(context: BenchmarkContext) -> Tuple[int, float]:
+    return bench_load(context, with_hint_file=False)
+
+
+def bench_load_hint(context: BenchmarkContext) -> Tuple[int, float]:
+    return bench_load(context, with_hint_file=True)
+
+
+def bench_get_all(context: BenchmarkContext) -> Tuple[int, float]:
+    kv_store = context.new_filled_store(context.records)
+    elapsed = timed(kv_store.get_all)
+    kv_store.close()
+    return context.records, elapsed
+
+
+def bench_expiry_storm(context: BenchmarkContext) -> Tuple[int, float]:
+    kv_store = context.new_store()
+    for start in range(0, context.records, 1000):
+        kv_store.write_many({f"key_{index}": SMALL_VALUE for index in range(start, min(start + 1000, context.records))},
+                            time_to_live_in_seconds=1)
+
+    expiry_queue = kv_store.store.expiry_queue
+    while expiry_queue.peek_expiry() is not None and expiry_queue.peek_expiry() >= time():
+        sleep(0.05)
+
+    elapsed = timed(kv_store.store.expire_cycle)
+    kv_store.close()
+    return context.records, elapsed
+
+
+def bench_mixed_threads(context: BenchmarkContext) -> Tuple[int, float]:
+    kv_store = context.new_filled_store(context.records)
+    operations_per_thread = context.records // context.threads
+
+    def work(thread_index: int):
+        thread_random = random.Random(thread_index)
+        for index in range(operations_per_thread):
+            if index % 5 == 0:
+                kv_store.write(f"thread_{thread_index}_{index}", SMALL_VALUE)
+            else:
+                kv_store.read(f"key_{thread_random.randrange(context.records)}")
+
+    workers = [threading.Thread(target=work, args=(thread_index,)) for thread_index in range(context.threads)]
+
+    def run():
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    elapsed = timed(run)
+    kv_store.close()
+    return operations_per_thread * context.threads, elapsed
+
+
+def bench_record_write(context: BenchmarkContext) -> Tuple[int, float]:
+    record_manager = RecordManager()
+    file_pointer = mmap.mmap(-1, context.records * record_manager.slot_size_in_bytes)
+    value_as_bytes = 200 * b"v"
+
+    def run():
+        for index in range(context.records):
+            record_manager.write(file_pointer, index * record_manager.slot_size_in_bytes, b"key", value_as_bytes)
+
+    elapsed = timed(run)
+    file_pointer.close()
+    return context.records, elapsed
+
+
+def bench_record_read(context: BenchmarkContext) -> Tuple[int, float]:
+    record_manager = RecordManager()
+    file_pointer = mmap.mmap(-1, context.records * record_manager.slot_size_in_bytes)
+    for index in range(context.records):
+        record_manager.write(file_pointer, index * record_manager.slot_size_in_bytes, b"key", 200 * b"v")
+
+    def run():
+        for index in range(context.records):
+            record_manager.read(file_pointer, index * record_manager.slot_size_in_bytes)
+
+    elapsed = timed(run)
+    file_pointer.close()
+    return context.records, elapsed
+
+
+STORE_BENCHMARKS = {
+    "write_single": bench_write_single,
+    "write_batch": bench_write_batch,
+    "read_1_slot": bench_read_1_slot,
+    "read_30_slot": bench_read_30_slot,
+    "delete_churn": bench_delete_churn,
+    "get_all": bench_get_all,
+    "expiry_storm": bench_expiry_storm,
+    "mixed_threads": bench_mixed_threads,
+}
+FILE_STORE_BENCHMARKS = {
+    "load_scan": bench_load_scan,
+    "load_hint": bench_load_hint,
+}
+RECORD_BENCHMARKS = {
+    "record_write": bench_record_write,
+    "record_read": bench_record_read,
+}
+BENCHMARKS = {**STORE_BENCHMARKS, **FILE_STORE_BENCHMARKS, **RECORD_BENCHMARKS}
+
+
+def get_benchmark_targets(store_kinds: List[str], benchmark_names: List[str]) -> List[Tuple[str, str]]:
+    targets = []
+    for benchmark_name in benchmark_names:
+        if benchmark_name in RECORD_BENCHMARKS:
+            targets.append(("record", benchmark_name))
+        elif benchmark_name in FILE_STORE_BENCHMARKS:
+            if "file" in store_kinds:
+                targets.append(("file", benchmark_name))
+        else:
+            targets.extend((store_kind, benchmark_name) for store_kind in store_kinds)
+    return targets
+
+
+def run_benchmarks(store_kinds: List[str],
+                   benchmark_names: List[str],
+                   records: int = 10000,
+                   load_records: int = 100000,
+                   repeat: int = 3,
+                   threads: int = 4,
+                   seed: int = 7) -> Dict[str, Any]:
+    results = {}
+    directory = tempfile.mkdtemp(prefix="pykv_bench_")
+    try:
+        for store_kind, benchmark_name in get_benchmark_targets(store_kinds, benchmark_names):
+            timings = []
+            operations = 0
+            for repetition in range(repeat):
+                context = BenchmarkContext(store_kind, records, load_records, threads, directory, seed + repetition)
+                operations, elapsed = BENCHMARKS[benchmark_name](context)
+                timings.append(elapsed)
+
+            # The median of repeated runs is reported, it is less sensitive to one noisy run than the mean.
+            seconds = max(statistics.median(timings), 1e-9)
+            results[f"{store_kind}/{benchmark_name}"] = {
+                "operations": operations,
+                "seconds": seconds,
+                "operations_per_second": operations / seconds,
+                "runs": timings
+            }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "records": records,
+            "load_records": load_records,
+            "repeat": repeat,
+            "threads": threads,
+            "seed": seed,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        },
+        "results": results
+    }
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[BenchmarkResult]:
+    comparisons = []
+    for name, result in report["results"].items():
+        baseline_result = baseline["results"].get(name)
+        if baseline_result is None:
+            continue
+        ratio = result["operations_per_second"] / baseline_result["operations_per_second"]
+        comparisons.append({
+            "name": name,
+            "baseline_operations_per_second": baseline_result["operations_per_second"],
+            "operations_per_second": result["operations_per_second"],
+            "ratio": ratio,
+            "is_regression": ratio < 1 - threshold
+        })
+    return comparisons
+
+
+def parse_arguments(arguments: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m pykv.bench", description="Benchmark pykv hot paths")
+    parser.add_argument("--stores", nargs="+", choices=("file", "mem"), default=["file", "mem"])
+    parser.add_argument("--benchmarks", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--load-records", type=int, default=100000,
+                        help="records in the file reopened by the load benchmarks, use 1000000 for full runs")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown against the baseline, as a fraction, reported as a regression")
+    return parser.parse_args(arguments)
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    options = parse_arguments(arguments)
+    report = run_benchmarks(store_kinds=options.stores,
+                            benchmark_names=options.benchmarks,
+                            records=options.records,
+                            load_records=options.load_records,
+                            repeat=options.repeat,
+                            threads=options.threads,
+                            seed=options.seed)
+
+    if options.baseline is not None:
+        with open(options.baseline) as f:
+            report["comparison"] = compare_with_baseline(report, json.load(f), options.threshold)
+
+    if options.output is not None:
+        with open(options.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    for comparison in report.get("comparison", []):
+        print(f"{comparison['name']:<28} {comparison['ratio']:>6.2f}x"
+              f"{'  REGRESSION' if comparison['is_regression'] else ''}", file=sys.stderr)
+
+    return 1 if any(comparison["is_regression"] for comparison in report.get("comparison", [])) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+import socket
+import threading
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from queue import Empty, LifoQueue
+from typing import Any, Dict, Iterator, List, Optional
+
+from pykv.protocol import Command, ProtocolException, decode_response, encode_batch, encode_frame, receive_frame
+
+
+class Connection:
+    def __init__(self, host: str, port: int, unix_socket_path: Optional[str], timeout_in_seconds: float):
+        if unix_socket_path is not None:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.settimeout(timeout_in_seconds)
+            self.socket.connect(unix_socket_path)
+        else:
+            self.socket = socket.create_connection((host, port), timeout=timeout_in_seconds)
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def execute(self, command_name: str, args: list) -> Any:
+        self.socket.sendall(encode_frame([command_name, args]))
+        return decode_response(command_name, receive_frame(self.socket))
+
+    def execute_batch(self, commands: List[Command]) -> List[Any]:
+        self.socket.sendall(encode_batch(commands))
+        is_success, responses = receive_frame(self.socket)
+        if not is_success:
+            raise ProtocolException(responses["message"])
+        return [decode_response(command_name, response) for (command_name, _), response in zip(commands, responses)]
+
+    def close(self):
+        self.socket.close()
+
+
+class ConnectionPool:
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 7070,
+                 unix_socket_path: Optional[str] = None,
+                 max_connections: int = 4,
+                 timeout_in_seconds: float = 10):
+        self.host = host
+        self.port = port
+        self.unix_socket_path = unix_socket_path
+        self.timeout_in_seconds = timeout_in_seconds
+        self.idle_connections = LifoQueue()
+        self.available_connections = threading.Semaphore(max_connections)
+
+    @contextmanager
+    def connection(self):
+        self.available_connections.acquire()
+        try:
+            try:
+                connection = self.idle_connections.get_nowait()
+            except Empty:
+                connection = Connection(self.host, self.port, self.unix_socket_path, self.timeout_in_seconds)
+
+            try:
+                yield connection
+            except (OSError, ProtocolException):
+                # A connection that failed mid-request may still carry an unread response, so it is not reused.
+                connection.close()
+                raise
+            self.idle_connections.put(connection)
+        finally:
+            self.available_connections.release()
+
+    def close(self):
+        while True:
+            try:
+                self.idle_connections.get_nowait().close()
+            except Empty:
+                break
+
+
+class KeyValueClient:
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 7070,
+                 unix_socket_path: Optional[str] = None,
+                 max_connections: int = 4,
+                 timeout_in_seconds: float = 10,
+                 auto_batching: bool = True,
+                 max_batch_size: int = 256):
+        self.pool = ConnectionPool(host=host,
+                                   port=port,
+                                   unix_socket_path=unix_socket_path,
+                                   max_connections=max_connections,
+                                   timeout_in_seconds=timeout_in_seconds)
+        self.auto_batching = auto_batching
+        self.max_batch_size = max_batch_size
+        self.pending_commands = deque()
+        self.pending_lock = threading.Lock()
+
+    def execute(self, command_name: str, *args) -> Any:
+        if not self.auto_batching:
+            with self.pool.connection() as connection:
+                result = connection.execute(command_name, list(args))
+        else:
+            pending_command = (command_name, list(args), Future())
+            with self.pending_lock:
+                self.pending_commands.append(pending_command)
+            try:
+                self.send_pending_commands()
+            except Exception:
+                with self.pending_lock:
+                    is_unsent = pending_command in self.pending_commands
+                    if is_unsent:
+                        self.pending_commands.remove(pending_command)
+                if is_unsent:
+                    raise
+            result = pending_command[2].result()
+
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def send_pending_commands(self):
+        # Whichever caller gets a connection sends every command queued so far as one batch frame, so concurrent
+        # callers share round trips; callers whose command was taken by another batch just wait for its result.
+        with self.pool.connection() as connection:
+            with self.pending_lock:
+                batch = [self.pending_commands.popleft()
+                         for _ in range(min(self.max_batch_size, len(self.pending_commands)))]
+            if not batch:
+                return
+
+            try:
+                results = connection.execute_batch([(command_name, args) for command_name, args, _ in batch])
+            except Exception as exception:
+                for _, _, future in batch:
+                    future.set_exception(exception)
+                raise
+
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def pipeline(self) -> "Pipeline":
+        return Pipeline(self)
+
+    def read(self, key_string: str):
+        return self.execute("read", key_string)
+
+    def delete(self, key_string: str):
+        return self.execute("delete", key_string)
+
+    def write(self, key_string: str, value: Any, time_to_live_in_seconds=0):
+        return self.execute("write", key_string, value, time_to_live_in_seconds)
+
+    def read_many(self, key_strings: List[str]) -> Dict[str, Any]:
+        return self.execute("read_many", key_strings)
+
+    def write_many(self, keys_and_values: Dict[str, Any], time_to_live_in_seconds=0) -> Dict[str, Optional[Exception]]:
+        return self.execute("write_many", keys_and_values, time_to_live_in_seconds)
+
+    def delete_many(self, key_strings: List[str]) -> Dict[str, Optional[Exception]]:
+        return self.execute("delete_many", key_strings)
+
+    def compact(self, max_records_to_move: Optional[int] = None) -> int:
+        return self.execute("compact", max_records_to_move)
+
+    def flush(self):
+        return self.execute("flush")
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self.execute("cache_stats")
+
+    def expiry_stats(self) -> Dict[str, float]:
+        return self.execute("expiry_stats")
+
+    def durability_stats(self) -> Dict[str, int]:
+        return self.execute("durability_stats")
+
+    def stats(self) -> Dict[str, Any]:
+        return self.execute("stats")
+
+    def get_all(self):
+        return self.execute("get_all")
+
+    def range(self, start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None,
+              keys_only=False) -> List[Any]:
+        results = self.execute("range", start, end, limit, keys_only)
+        return results if keys_only else [(key_string, value) for key_string, value in results]
+
+    def prefix(self, prefix: str, limit: Optional[int] = None, keys_only=False) -> List[Any]:
+        results = self.execute("prefix", prefix, limit, keys_only)
+        return results if keys_only else [(key_string, value) for key_string, value in results]
+
+    def scan(self, cursor: int = 0, count: int = 100, match: Optional[str] = None, keys_only=False):
+        next_cursor, keys_and_values = self.execute("scan", cursor, count, match, keys_only)
+        if keys_only:
+            return next_cursor, keys_and_values
+        return next_cursor, [(key_string, value) for key_string, value in keys_and_values]
+
+    def scan_iter(self, match: Optional[str] = None, keys_only=False, count: int = 100) -> Iterator[Any]:
+        cursor = 0
+        while True:
+            cursor, keys_and_values = self.scan(cursor, count, match, keys_only)
+            yield from keys_and_values
+            if cursor == 0:
+                return
+
+    def close(self):
+        self.pool.close()
+
+
+class Pipeline:
+    def __init__(self, client: KeyValueClient):
+        self.client = client
+        self.commands: List[Command] = []
+
+    def add(self, command_name: str, *args) -> "Pipeline":
+        self.commands.append((command_name, list(args)))
+        return self
+
+    def read(self, key_string: str) -> "Pipeline":
+        return self.add("read", key_string)
+
+    def write(self, key_string: str, value: Any, time_to_live_in_seconds=0) -> "Pipeline":
+        return self.add("write", key_string, value, time_to_live_in_seconds)
+
+    def delete(self, key_string: str) -> "Pipeline":
+        return self.add("delete", key_string)
+
+    def execute(self) -> List[Any]:
+        commands, self.commands = self.commands, []
+        with self.client.pool.connection() as connection:
+            return connection.execute_batch(commands)
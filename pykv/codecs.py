@@ -0,0 +1,114 @@
+import json
+import marshal
+import pickle
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Union
+
+from pykv.store import StoreException
+
+
+class ValueCodec(ABC):
+    # The id is stored in one byte of the file header, so it has to be an integer from 0 to 255.
+    codec_id: Optional[int] = None
+    name: Optional[str] = None
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, value_as_bytes: bytes) -> Any:
+        pass
+
+
+class JsonCodec(ValueCodec):
+    codec_id = 0
+    name = "json"
+
+    def encode(self, value: Any) -> bytes:
+        return str.encode(json.dumps(value))
+
+    def decode(self, value_as_bytes: bytes) -> Any:
+        return json.loads(value_as_bytes)
+
+
+class MarshalCodec(ValueCodec):
+    codec_id = 1
+    name = "marshal"
+
+    def encode(self, value: Any) -> bytes:
+        return marshal.dumps(value)
+
+    def decode(self, value_as_bytes: bytes) -> Any:
+        return marshal.loads(value_as_bytes)
+
+
+class PickleCodec(ValueCodec):
+    codec_id = 2
+    name = "pickle"
+
+    def encode(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=5)
+
+    def decode(self, value_as_bytes: bytes) -> Any:
+        return pickle.loads(value_as_bytes)
+
+
+class BytesCodec(ValueCodec):
+    codec_id = 3
+    name = "bytes"
+
+    def encode(self, value: Any) -> bytes:
+        if not isinstance(value, (bytes, bytearray, memoryview)):
+            raise TypeError(f"Bytes codec can only store bytes-like values, got {type(value).__name__}")
+        return bytes(value)
+
+    def decode(self, value_as_bytes: bytes) -> Any:
+        return bytes(value_as_bytes)
+
+
+VALUE_CODECS: Dict[str, ValueCodec] = {}
+VALUE_CODECS_BY_ID: Dict[int, ValueCodec] = {}
+
+
+def validate_codec(codec: ValueCodec):
+    codec_id = codec.codec_id
+    if not isinstance(codec_id, int) or isinstance(codec_id, bool) or not 0 <= codec_id <= 255:
+        raise ValueError(f"Value codec {type(codec).__name__} needs an integer codec_id between 0 and 255, "
+                         f"got {codec_id!r}")
+
+
+def register_codec(codec: ValueCodec):
+    validate_codec(codec)
+    registered_codec = VALUE_CODECS_BY_ID.get(codec.codec_id)
+    if registered_codec is not None and type(registered_codec) is not type(codec):
+        raise ValueError(f"Codec id {codec.codec_id} is already registered for {type(registered_codec).__name__}")
+    if codec.name is not None:
+        named_codec = VALUE_CODECS.get(codec.name)
+        if named_codec is not None and type(named_codec) is not type(codec):
+            raise ValueError(f"Codec name {codec.name} is already registered for {type(named_codec).__name__}")
+        VALUE_CODECS[codec.name] = codec
+    VALUE_CODECS_BY_ID[codec.codec_id] = codec
+
+
+for builtin_codec in (JsonCodec(), MarshalCodec(), PickleCodec(), BytesCodec()):
+    register_codec(builtin_codec)
+
+
+def get_codec(codec: Union[str, ValueCodec]) -> ValueCodec:
+    if isinstance(codec, ValueCodec):
+        validate_codec(codec)
+        return codec
+    if codec not in VALUE_CODECS:
+        raise ValueError(f"Unknown value codec {codec}, expected one of {', '.join(VALUE_CODECS)}")
+    return VALUE_CODECS[codec]
+
+
+def get_codec_by_id(codec_id: int, given_codec: Optional[ValueCodec] = None) -> ValueCodec:
+    # A codec passed by the caller is trusted for its own id, so unregistered custom codecs can reopen their files.
+    if given_codec is not None and given_codec.codec_id == codec_id:
+        return given_codec
+    if codec_id not in VALUE_CODECS_BY_ID:
+        raise StoreException(f"Store file was written with unknown value codec {codec_id}, "
+                             f"pass that codec or register it with register_codec")
+    return VALUE_CODECS_BY_ID[codec_id]
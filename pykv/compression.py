@@ -0,0 +1,25 @@
+import zlib
+from typing import Optional
+
+
+class CompressionPolicy:
+    def __init__(self,
+                 minimum_size_in_bytes: int = 256,
+                 level: int = 6):
+
+        if minimum_size_in_bytes < 0:
+            raise ValueError("Minimum size for compression should not be negative")
+        if not 0 <= level <= 9:
+            raise ValueError("Compression level should be between 0 and 9")
+
+        self.minimum_size_in_bytes = minimum_size_in_bytes
+        self.level = level
+
+    def compress(self, value_as_bytes: bytes) -> Optional[bytes]:
+        if len(value_as_bytes) < self.minimum_size_in_bytes:
+            return None
+        return zlib.compress(value_as_bytes, self.level)
+
+
+def decompress(value_as_bytes: bytes) -> bytes:
+    return zlib.decompress(value_as_bytes)
@@ -0,0 +1,74 @@
+import threading
+from heapq import heapify, heappop, heappush
+from typing import Dict, List, Optional, Tuple
+
+
+class ExpiryQueue:
+    def __init__(self):
+        self.heap: List[Tuple[int, str]] = []
+        self.expiries: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def schedule(self, key_string: str, expires_at: int):
+        with self.lock:
+            self.expiries[key_string] = expires_at
+            heappush(self.heap, (expires_at, key_string))
+            self._rebuild_if_mostly_stale()
+
+    def cancel(self, key_string: str):
+        with self.lock:
+            if self.expiries.pop(key_string, None) is not None:
+                self._rebuild_if_mostly_stale()
+
+    def get_expiry(self, key_string: str) -> Optional[int]:
+        return self.expiries.get(key_string)
+
+    def peek_expiry(self) -> Optional[int]:
+        with self.lock:
+            self._drop_stale_entries()
+            if self.heap:
+                return self.heap[0][0]
+            return None
+
+    def pop_expired(self, now: float, limit: Optional[int] = None) -> List[str]:
+        expired_keys = []
+        with self.lock:
+            while limit is None or len(expired_keys) < limit:
+                self._drop_stale_entries()
+                if not self.heap or self.heap[0][0] >= now:
+                    break
+                _, key_string = heappop(self.heap)
+                self.expiries.pop(key_string)
+                expired_keys.append(key_string)
+        return expired_keys
+
+    def count_expired(self, now: float) -> int:
+        expired_keys_count = 0
+        with self.lock:
+            # Only entries below an expired parent can be expired themselves, so the walk stops at the frontier.
+            pending_indexes = [0] if self.heap else []
+            while pending_indexes:
+                index = pending_indexes.pop()
+                expires_at, key_string = self.heap[index]
+                if expires_at >= now:
+                    continue
+                if self.expiries.get(key_string) == expires_at:
+                    expired_keys_count += 1
+                pending_indexes.extend(child for child in (2 * index + 1, 2 * index + 2) if child < len(self.heap))
+        return expired_keys_count
+
+    def _drop_stale_entries(self):
+        while self.heap and self.expiries.get(self.heap[0][1]) != self.heap[0][0]:
+            heappop(self.heap)
+
+    def _rebuild_if_mostly_stale(self):
+        # Cancelled and rescheduled keys leave their old entries behind, rebuild once they dominate the heap.
+        if len(self.heap) > 2 * len(self.expiries) + 64:
+            self.heap = [(expires_at, key_string) for key_string, expires_at in self.expiries.items()]
+            heapify(self.heap)
+
+    def is_empty(self) -> bool:
+        return not self.expiries
+
+    def __len__(self):
+        return len(self.expiries)
@@ -0,0 +1,73 @@
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class LRUCache:
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0, copy_on_read: bool = False):
+        # Cached values are shared by every reader and must be treated as read-only, unless copy_on_read hands each
+        # hit its own deep copy.
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.copy_on_read = copy_on_read
+        self.entries: "OrderedDict[str, Tuple[Any, int, int]]" = OrderedDict()
+        self.size_in_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key_string: str, count_miss: bool = True) -> Optional[Tuple[Any, int]]:
+        with self.lock:
+            entry = self.entries.get(key_string)
+            if entry is None:
+                if count_miss:
+                    self.misses += 1
+                return None
+
+            self.entries.move_to_end(key_string)
+            self.hits += 1
+            value, ttl_in_seconds, _ = entry
+
+        if self.copy_on_read:
+            value = copy.deepcopy(value)
+        return value, ttl_in_seconds
+
+    def put(self, key_string: str, value: Any, ttl_in_seconds: int, size_in_bytes: int):
+        with self.lock:
+            if key_string in self.entries:
+                self.size_in_bytes -= self.entries.pop(key_string)[2]
+
+            if self.max_bytes and size_in_bytes > self.max_bytes:
+                return
+
+            self.entries[key_string] = (value, ttl_in_seconds, size_in_bytes)
+            self.size_in_bytes += size_in_bytes
+
+            while ((self.max_entries and len(self.entries) > self.max_entries)
+                   or (self.max_bytes and self.size_in_bytes > self.max_bytes)):
+                _, (_, _, evicted_size_in_bytes) = self.entries.popitem(last=False)
+                self.size_in_bytes -= evicted_size_in_bytes
+                self.evictions += 1
+
+    def invalidate(self, key_string: str):
+        with self.lock:
+            entry = self.entries.pop(key_string, None)
+            if entry is not None:
+                self.size_in_bytes -= entry[2]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size_in_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "size_in_bytes": self.size_in_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,69 @@
+from typing import Iterator, List, Optional
+
+
+class SizeTree:
+    def __init__(self, capacity: int = 64):
+        # A Fenwick tree counting which sizes are present, over 1..capacity with capacity a power of two. Adding,
+        # removing and finding the smallest present size at least n are all O(log capacity).
+        self.capacity = 1
+        while self.capacity < capacity:
+            self.capacity *= 2
+        self.tree: List[int] = [0] * (self.capacity + 1)
+        self.sizes_count = 0
+
+    def add(self, size: int):
+        while size > self.capacity:
+            self._double_capacity()
+        self._update(size, 1)
+        self.sizes_count += 1
+
+    def remove(self, size: int):
+        self._update(size, -1)
+        self.sizes_count -= 1
+
+    def find_at_least(self, size: int) -> Optional[int]:
+        rank = self._count_up_to(size - 1) + 1
+        if rank > self.sizes_count:
+            return None
+
+        # Descends the implicit tree to the smallest size whose running count reaches the rank.
+        position = 0
+        step = self.capacity
+        while step:
+            if position + step <= self.capacity and self.tree[position + step] < rank:
+                position += step
+                rank -= self.tree[position]
+            step //= 2
+        return position + 1
+
+    def clear(self):
+        self.tree = [0] * (self.capacity + 1)
+        self.sizes_count = 0
+
+    def __iter__(self) -> Iterator[int]:
+        size = self.find_at_least(1)
+        while size is not None:
+            yield size
+            size = self.find_at_least(size + 1)
+
+    def __len__(self) -> int:
+        return self.sizes_count
+
+    def _count_up_to(self, size: int) -> int:
+        size = min(size, self.capacity)
+        count = 0
+        while size > 0:
+            count += self.tree[size]
+            size -= size & -size
+        return count
+
+    def _update(self, size: int, delta: int):
+        while size <= self.capacity:
+            self.tree[size] += delta
+            size += size & -size
+
+    def _double_capacity(self):
+        # Every node past the old capacity covers only new, empty sizes, except the new root which covers them all.
+        self.tree.extend([0] * self.capacity)
+        self.capacity *= 2
+        self.tree[self.capacity] = self.sizes_count
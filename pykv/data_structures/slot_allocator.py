@@ -0,0 +1,79 @@
+from typing import Dict, Optional, Tuple
+
+from pykv.data_structures.size_tree import SizeTree
+
+
+class SlotAllocator:
+    def __init__(self):
+        # Holes are grouped by size, with a tree over the distinct sizes for the best fit search, so releasing and
+        # allocating are O(log largest hole).
+        self.holes_by_start: Dict[int, int] = {}
+        self.holes_by_end: Dict[int, int] = {}
+        self.holes_by_size: Dict[int, Dict[int, None]] = {}
+        self.hole_sizes = SizeTree()
+        self.free_slots_total = 0
+
+    def release(self, start: int, count: int) -> Tuple[int, int]:
+        if start in self.holes_by_end:
+            previous_start = self.holes_by_end[start]
+            count += self.holes_by_start[previous_start]
+            self._remove(previous_start)
+            start = previous_start
+
+        if start + count in self.holes_by_start:
+            next_start = start + count
+            count += self.holes_by_start[next_start]
+            self._remove(next_start)
+
+        self._add(start, count)
+        return start, count
+
+    def allocate(self, count: int) -> Optional[int]:
+        hole_size = self.hole_sizes.find_at_least(count)
+        if hole_size is None:
+            return None
+
+        hole_start = next(iter(self.holes_by_size[hole_size]))
+        self._remove(hole_start)
+        if hole_size > count:
+            self._add(hole_start + count, hole_size - count)
+        return hole_start
+
+    def trim(self, end: int) -> int:
+        if end in self.holes_by_end:
+            start = self.holes_by_end[end]
+            self._remove(start)
+            return start
+        return end
+
+    def clear(self):
+        self.holes_by_start.clear()
+        self.holes_by_end.clear()
+        self.holes_by_size.clear()
+        self.hole_sizes.clear()
+        self.free_slots_total = 0
+
+    def free_slots_count(self) -> int:
+        return self.free_slots_total
+
+    def holes_count(self) -> int:
+        return len(self.holes_by_start)
+
+    def _add(self, start: int, count: int):
+        self.holes_by_start[start] = count
+        self.holes_by_end[start + count] = start
+        self.free_slots_total += count
+        if count not in self.holes_by_size:
+            self.holes_by_size[count] = {}
+            self.hole_sizes.add(count)
+        self.holes_by_size[count][start] = None
+
+    def _remove(self, start: int):
+        count = self.holes_by_start.pop(start)
+        self.holes_by_end.pop(start + count)
+        self.free_slots_total -= count
+        holes = self.holes_by_size[count]
+        del holes[start]
+        if not holes:
+            del self.holes_by_size[count]
+            self.hole_sizes.remove(count)
@@ -0,0 +1,87 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import takewhile
+from typing import Iterable, Iterator, List, Optional
+
+
+class SortedKeyIndex:
+    def __init__(self, chunk_size: int = 512):
+        # Keys are kept in sorted chunks with a list of each chunk's last key, so inserts and deletes only shift
+        # one chunk instead of the whole key list.
+        self.chunk_size = chunk_size
+        self.chunks: List[List[str]] = []
+        self.chunk_maximums: List[str] = []
+        self.keys_count = 0
+
+    def add(self, key_string: str):
+        if not self.chunks:
+            self.chunks.append([key_string])
+            self.chunk_maximums.append(key_string)
+            self.keys_count += 1
+            return
+
+        chunk_index = min(bisect_left(self.chunk_maximums, key_string), len(self.chunks) - 1)
+        chunk = self.chunks[chunk_index]
+        insort(chunk, key_string)
+        self.chunk_maximums[chunk_index] = chunk[-1]
+        self.keys_count += 1
+
+        if len(chunk) > 2 * self.chunk_size:
+            self.chunks.insert(chunk_index + 1, chunk[self.chunk_size:])
+            del chunk[self.chunk_size:]
+            self.chunk_maximums.insert(chunk_index, chunk[-1])
+
+    def remove(self, key_string: str) -> bool:
+        chunk_index = bisect_left(self.chunk_maximums, key_string)
+        if chunk_index == len(self.chunks):
+            return False
+
+        chunk = self.chunks[chunk_index]
+        key_index = bisect_left(chunk, key_string)
+        if key_index == len(chunk) or chunk[key_index] != key_string:
+            return False
+
+        del chunk[key_index]
+        self.keys_count -= 1
+        if chunk:
+            self.chunk_maximums[chunk_index] = chunk[-1]
+        else:
+            del self.chunks[chunk_index]
+            del self.chunk_maximums[chunk_index]
+        return True
+
+    def rebuild(self, key_strings: Iterable[str]):
+        sorted_keys = sorted(key_strings)
+        self.chunks = [sorted_keys[start:start + self.chunk_size]
+                       for start in range(0, len(sorted_keys), self.chunk_size)]
+        self.chunk_maximums = [chunk[-1] for chunk in self.chunks]
+        self.keys_count = len(sorted_keys)
+
+    def clear(self):
+        self.rebuild([])
+
+    def irange(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[str]:
+        if start is None:
+            chunk_index, key_index = 0, 0
+        else:
+            chunk_index = bisect_left(self.chunk_maximums, start)
+            key_index = bisect_left(self.chunks[chunk_index], start) if chunk_index < len(self.chunks) else 0
+
+        for chunk in self.chunks[chunk_index:]:
+            end_index = len(chunk) if end is None else bisect_left(chunk, end)
+            yield from chunk[key_index:end_index]
+            if end_index < len(chunk):
+                return
+            key_index = 0
+
+    def iprefix(self, prefix: str) -> Iterator[str]:
+        return takewhile(lambda key_string: key_string.startswith(prefix), self.irange(prefix))
+
+    def __contains__(self, key_string: str) -> bool:
+        chunk_index = bisect_left(self.chunk_maximums, key_string)
+        if chunk_index == len(self.chunks):
+            return False
+        chunk = self.chunks[chunk_index]
+        return bisect_right(chunk, key_string) > bisect_left(chunk, key_string)
+
+    def __len__(self):
+        return self.keys_count
@@ -0,0 +1,105 @@
+import mmap
+import threading
+from typing import Callable, Dict, List, Tuple
+
+DURABILITY_NONE = "none"
+DURABILITY_PERIODIC = "periodic"
+DURABILITY_GROUP_COMMIT = "group_commit"
+
+DURABILITY_MODES = (DURABILITY_NONE, DURABILITY_PERIODIC, DURABILITY_GROUP_COMMIT)
+
+FlushRange = Tuple[int, int]
+
+
+class DurabilityPolicy:
+    def __init__(self,
+                 mode: str = DURABILITY_NONE,
+                 flush_interval_in_milliseconds: int = 100):
+
+        if mode not in DURABILITY_MODES:
+            raise ValueError(f"Durability mode should be one of {', '.join(DURABILITY_MODES)}")
+        if flush_interval_in_milliseconds <= 0:
+            raise ValueError("Flush interval should be positive")
+
+        self.mode = mode
+        self.flush_interval_in_milliseconds = flush_interval_in_milliseconds
+
+
+class DirtyRangeFlusher:
+    def __init__(self,
+                 policy: DurabilityPolicy,
+                 flush_ranges: Callable[[List[FlushRange]], None],
+                 page_size_in_bytes: int = mmap.ALLOCATIONGRANULARITY):
+        self.policy = policy
+        self.flush_ranges = flush_ranges
+        self.page_size_in_bytes = page_size_in_bytes
+        self.is_tracking = policy.mode != DURABILITY_NONE
+        self.condition = threading.Condition(threading.Lock())
+        self.dirty_pages = set()
+        self.written_sequence = 0
+        self.flushed_sequence = 0
+        self.is_flushing = False
+        self.flushes = 0
+        self.flushed_bytes = 0
+
+    def mark_dirty(self, offset: int, length: int):
+        if not self.is_tracking:
+            return
+        with self.condition:
+            self.dirty_pages.update(range(offset // self.page_size_in_bytes,
+                                          (offset + length - 1) // self.page_size_in_bytes + 1))
+            self.written_sequence += 1
+
+    def commit(self):
+        if self.policy.mode == DURABILITY_GROUP_COMMIT:
+            self.flush()
+
+    def flush(self):
+        if not self.is_tracking:
+            return
+
+        # Group commit: whoever finds no flush running flushes every range dirtied so far, writers arriving
+        # meanwhile wait and are covered together by the next single flush.
+        with self.condition:
+            target_sequence = self.written_sequence
+            while self.flushed_sequence < target_sequence:
+                if self.is_flushing:
+                    self.condition.wait()
+                    continue
+
+                self.is_flushing = True
+                flushing_sequence = self.written_sequence
+                dirty_pages, self.dirty_pages = self.dirty_pages, set()
+                self.condition.release()
+                try:
+                    flush_ranges = self.get_flush_ranges(dirty_pages)
+                    self.flush_ranges(flush_ranges)
+                except BaseException:
+                    self.condition.acquire()
+                    self.dirty_pages.update(dirty_pages)
+                    self.is_flushing = False
+                    self.condition.notify_all()
+                    raise
+                self.condition.acquire()
+                self.flushes += 1
+                self.flushed_bytes += sum(length for _, length in flush_ranges)
+                self.flushed_sequence = flushing_sequence
+                self.is_flushing = False
+                self.condition.notify_all()
+
+    def get_flush_ranges(self, dirty_pages) -> List[FlushRange]:
+        flush_ranges = []
+        for page in sorted(dirty_pages):
+            if flush_ranges and flush_ranges[-1][0] + flush_ranges[-1][1] == page * self.page_size_in_bytes:
+                flush_ranges[-1] = (flush_ranges[-1][0], flush_ranges[-1][1] + self.page_size_in_bytes)
+            else:
+                flush_ranges.append((page * self.page_size_in_bytes, self.page_size_in_bytes))
+        return flush_ranges
+
+    def stats(self) -> Dict[str, int]:
+        with self.condition:
+            return {
+                "dirty_pages": len(self.dirty_pages),
+                "flushes": self.flushes,
+                "flushed_bytes": self.flushed_bytes
+            }
@@ -0,0 +1,107 @@
+from time import monotonic, time
+from typing import Callable, Dict, List, Optional
+
+from pykv.data_structures.expiry_queue import ExpiryQueue
+
+
+class ActiveExpiryPolicy:
+    def __init__(self,
+                 keys_per_cycle: int = 1000,
+                 time_budget_per_cycle_in_seconds: float = 0.01,
+                 keys_per_batch: int = 100,
+                 minimum_interval_in_seconds: float = 0.05):
+
+        if keys_per_cycle < 1 or keys_per_batch < 1:
+            raise ValueError("Expiry cycles should expire at least one key")
+
+        self.keys_per_cycle = keys_per_cycle
+        self.time_budget_per_cycle_in_seconds = time_budget_per_cycle_in_seconds
+        self.keys_per_batch = min(keys_per_batch, keys_per_cycle)
+        self.minimum_interval_in_seconds = minimum_interval_in_seconds
+
+
+class ActiveExpiry:
+    def __init__(self,
+                 expiry_queue: ExpiryQueue,
+                 delete_keys: Callable[[List[str]], object],
+                 maximum_interval_in_seconds: float,
+                 policy: Optional[ActiveExpiryPolicy] = None):
+        self.expiry_queue = expiry_queue
+        self.delete_keys = delete_keys
+        self.maximum_interval_in_seconds = maximum_interval_in_seconds
+        self.policy = policy
+        self.cycles = 0
+        self.expired_keys = 0
+        self.last_cycle_expired_keys = 0
+        self.last_cycle_duration_in_seconds = 0.0
+        self.last_cycle_hit_budget = False
+        self.maximum_lag_in_seconds = 0.0
+
+    def run_cycle(self) -> int:
+        started_at = monotonic()
+        now = time()
+        self.record_lag(now)
+
+        if self.policy is None:
+            expired_keys = self.expiry_queue.pop_expired(now)
+            self.delete_keys(expired_keys)
+            expired_keys_count = len(expired_keys)
+            self.last_cycle_hit_budget = False
+        else:
+            expired_keys_count = 0
+            self.last_cycle_hit_budget = True
+            # Deleting in small batches releases the store lock between them, so a mass expiry never stalls readers
+            # for longer than one batch.
+            while expired_keys_count < self.policy.keys_per_cycle:
+                if monotonic() - started_at >= self.policy.time_budget_per_cycle_in_seconds > 0:
+                    break
+                batch_size = min(self.policy.keys_per_batch, self.policy.keys_per_cycle - expired_keys_count)
+                expired_keys = self.expiry_queue.pop_expired(now, limit=batch_size)
+                self.delete_keys(expired_keys)
+                expired_keys_count += len(expired_keys)
+                if len(expired_keys) < batch_size:
+                    self.last_cycle_hit_budget = False
+                    break
+
+        self.cycles += 1
+        self.expired_keys += expired_keys_count
+        self.last_cycle_expired_keys = expired_keys_count
+        self.last_cycle_duration_in_seconds = monotonic() - started_at
+        return expired_keys_count
+
+    def record_lag(self, now: float):
+        self.maximum_lag_in_seconds = max(self.maximum_lag_in_seconds, self.get_lag_in_seconds(now))
+
+    def get_lag_in_seconds(self, now: float) -> float:
+        next_expiry = self.expiry_queue.peek_expiry()
+        if next_expiry is None or next_expiry >= now:
+            return 0.0
+        return now - next_expiry
+
+    def next_interval_in_seconds(self) -> float:
+        if self.policy is None:
+            return self.maximum_interval_in_seconds
+
+        # Run again right away while the backlog keeps filling whole cycles, otherwise sleep until the next key is due.
+        if self.last_cycle_hit_budget:
+            return self.policy.minimum_interval_in_seconds
+
+        next_expiry = self.expiry_queue.peek_expiry()
+        if next_expiry is None:
+            return self.maximum_interval_in_seconds
+        return min(max(next_expiry - time(), self.policy.minimum_interval_in_seconds),
+                   self.maximum_interval_in_seconds)
+
+    def stats(self) -> Dict[str, float]:
+        now = time()
+        return {
+            "tracked_keys": len(self.expiry_queue),
+            "backlog": self.expiry_queue.count_expired(now),
+            "lag_in_seconds": self.get_lag_in_seconds(now),
+            "maximum_lag_in_seconds": self.maximum_lag_in_seconds,
+            "cycles": self.cycles,
+            "expired_keys": self.expired_keys,
+            "last_cycle_expired_keys": self.last_cycle_expired_keys,
+            "last_cycle_duration_in_seconds": self.last_cycle_duration_in_seconds,
+            "next_interval_in_seconds": self.next_interval_in_seconds()
+        }
@@ -1,42 +1,142 @@
-import json
+import mmap
 import os
-from datetime import datetime
-from time import sleep
-from typing import Dict
-
-from pykv.data_structures.heap import Heap
-from pykv.record import RecordManager
-from pykv.store import StoreGetException, StoreException, Store
-from pykv.utils import create_file_if_not_exists, extend_file, get_memory_mapped_file_pointer, is_passed, add_seconds, \
-    get_timestamp
+from contextlib import contextmanager
+from typing import Dict, List, Union, Any, Tuple, Optional, Iterator
+
+from pykv.codecs import ValueCodec, get_codec, get_codec_by_id, JsonCodec
+from pykv.compression import CompressionPolicy
+from pykv.data_structures.expiry_queue import ExpiryQueue
+from pykv.durability import DurabilityPolicy, DirtyRangeFlusher, DURABILITY_PERIODIC, FlushRange
+from pykv.expiry import ActiveExpiry, ActiveExpiryPolicy
+from pykv.data_structures.lru_cache import LRUCache
+from pykv.data_structures.slot_allocator import SlotAllocator
+from pykv.data_structures.sorted_key_index import SortedKeyIndex
+from pykv.growth import GrowthPolicy
+from pykv.locks import ReadWriteLock
+from pykv.hint import HintRecord, read_hint_file, write_hint_file
+from pykv.record import RecordManager, HINT_GENERATION_LENGTH, COMPRESSED_PRIMARY_SLOT, DEFAULT_SLOT_SIZE_IN_BYTES, \
+    FORMAT_V1, create_record_manager, get_format_version
+from pykv.scan import ScannedRecord, parallel_scan, scan_slot_range
+from pykv.shared_index import SharedIndexWriter
+from pykv.store import StoreGetException, StoreException, Store, ScanBatch, StoreRecordSizeException
+from pykv.utils import create_file_if_not_exists, extend_file, get_memory_mapped_file_pointer, is_passed, \
+    get_expiry_timestamp, resize_file, is_key_matching, is_key_in_range
 
 
 class FileStore(Store):
     def __init__(self,
                  file_path: str,
-                 background_jobs_frequency_in_seconds: int):
+                 background_jobs_frequency_in_seconds: int,
+                 growth_policy: Optional[GrowthPolicy] = None,
+                 hint_interval_in_seconds: int = 60,
+                 scan_workers: Optional[int] = None,
+                 parallel_scan_minimum_slots: int = 1 << 16,
+                 compaction_budget_per_cycle: int = 0,
+                 value_codec: Union[str, ValueCodec, None] = None,
+                 cache_max_entries: int = 0,
+                 cache_max_bytes: int = 0,
+                 cache_copy_on_read: bool = False,
+                 active_expiry_policy: Optional[ActiveExpiryPolicy] = None,
+                 durability_policy: Optional[DurabilityPolicy] = None,
+                 shared_index: bool = False,
+                 sorted_index: bool = False,
+                 compression_policy: Optional[CompressionPolicy] = None,
+                 slot_size_in_bytes: Optional[int] = None,
+                 format_version: Optional[int] = None):
 
         self.keys_and_offsets: Dict[str, int] = {}
         self.current_slot = 0
         self.starting_offset = 10
-        self.total_blocks = 10
+        self.initial_total_blocks = 10
+        self.total_blocks = self.initial_total_blocks
         self.record_count = 0
-        self.block_size_in_bytes = 512
         self.file_path = file_path
-        self.record_manager = RecordManager()
-        self.heap = Heap()
+        self.record_manager = create_record_manager(slot_size_in_bytes or DEFAULT_SLOT_SIZE_IN_BYTES,
+                                                    format_version or FORMAT_V1)
+        self.block_size_in_bytes = self.record_manager.slot_size_in_bytes
+        self.lock = ReadWriteLock()
+        self.expiry_queue = ExpiryQueue()
+        self.active_expiry = ActiveExpiry(self.expiry_queue, self.delete_many,
+                                          maximum_interval_in_seconds=background_jobs_frequency_in_seconds,
+                                          policy=active_expiry_policy)
+        self.free_slots = SlotAllocator()
+        self.growth_policy = growth_policy or GrowthPolicy()
+        self.hint_file_path = file_path + ".hint"
+        self.hint_interval_in_seconds = hint_interval_in_seconds
+        self.hint_generation = 0
+        self.resizes = 0
+        self.remaps = 0
+        self.retired_file_pointers: List[mmap.mmap] = []
+        self.hint_is_fresh = False
+        self.scan_workers = scan_workers or os.cpu_count() or 1
+        self.parallel_scan_minimum_slots = parallel_scan_minimum_slots
+        self.compaction_budget_per_cycle = compaction_budget_per_cycle
+        self.changed_since_hint_file = False
+        self.codec = get_codec(value_codec or JsonCodec.name)
+        self.compression_policy = compression_policy
+        self.sorted_keys = SortedKeyIndex() if sorted_index else None
+        self.shared_index = SharedIndexWriter(file_path + ".index") if shared_index else None
+        self.durability = DirtyRangeFlusher(durability_policy or DurabilityPolicy(), self.flush_ranges)
+        self.value_cache = LRUCache(max_entries=cache_max_entries, max_bytes=cache_max_bytes,
+                                    copy_on_read=cache_copy_on_read) \
+            if cache_max_entries > 0 or cache_max_bytes > 0 else None
 
         if create_file_if_not_exists(file_path):
-            extend_file(bytes_to_append=self.total_blocks * self.block_size_in_bytes,
+            if os.path.exists(self.hint_file_path):
+                os.remove(self.hint_file_path)
+            extend_file(bytes_to_append=self.starting_offset + self.total_blocks * self.block_size_in_bytes,
                         file_path=file_path)
             self.file_pointer = get_memory_mapped_file_pointer(file_path)
+            self.total_blocks = (len(self.file_pointer) - self.starting_offset) // self.block_size_in_bytes
             self.record_manager.write_magic_bytes(self.file_pointer)
+            self.record_manager.set_codec_id(self.file_pointer, self.codec.codec_id)
+            self.record_manager.set_slot_size(self.file_pointer, self.block_size_in_bytes)
         else:
             self.file_pointer = get_memory_mapped_file_pointer(file_path)
+            file_format_version = get_format_version(self.file_pointer)
+            if file_format_version is None:
+                raise StoreException("Existing data file is not valid, failed to load")
+            if format_version is not None and file_format_version != format_version:
+                raise StoreException(f"Existing data file was written in record format {file_format_version}, "
+                                     f"not {format_version}")
+            file_slot_size_in_bytes = RecordManager.get_slot_size(self.file_pointer)
+            if slot_size_in_bytes is not None and file_slot_size_in_bytes != slot_size_in_bytes:
+                raise StoreException(f"Existing data file was written with {file_slot_size_in_bytes}-byte slots, "
+                                     f"not {slot_size_in_bytes}")
+            self.record_manager = create_record_manager(file_slot_size_in_bytes, file_format_version)
+            self.block_size_in_bytes = file_slot_size_in_bytes
             self.load()
 
+            file_codec = get_codec_by_id(self.record_manager.get_codec_id(self.file_pointer), self.codec)
+            if value_codec is not None and file_codec.codec_id != self.codec.codec_id:
+                raise StoreException(f"Existing data file was written with {file_codec.name} codec, "
+                                     f"not {self.codec.name}")
+            self.codec = file_codec
+
+        if self.shared_index is not None:
+            self.shared_index.rebuild(self.keys_and_offsets, len(self.file_pointer))
+
         super().__init__(self.expire_keys,
                          background_jobs_frequency_in_seconds)
+        self.add_background_job(self.refresh_hint_file)
+        if compaction_budget_per_cycle > 0:
+            self.add_background_job(self.compact_in_background)
+        if self.durability.policy.mode == DURABILITY_PERIODIC:
+            self.add_background_job(self.flush_periodically)
+
+    @contextmanager
+    def write_section(self):
+        with self.lock.write_lock():
+            if self.shared_index is None:
+                yield
+                return
+
+            # Readers in other processes retry whatever they read while the sequence was odd or changed under them.
+            self.shared_index.begin_write()
+            try:
+                yield
+            finally:
+                self.shared_index.end_write()
 
     def is_exists(self, key_string: str):
         if key_string in self.keys_and_offsets:
@@ -44,122 +144,607 @@ class FileStore(Store):
         return False
 
     def get(self, key_string: str):
-        record_offset = self.starting_offset + (self.keys_and_offsets[key_string] * self.block_size_in_bytes)
-        if self.is_exists(key_string) and self.record_manager.is_available(
-                file_pointer=self.file_pointer,
-                record_offset=record_offset):
-            _, _, ttl_in_seconds, _, _, _, value_as_bytes = self.record_manager.read(
+        with self.lock.read_lock():
+            if not self.is_exists(key_string):
+                return None
+            value, is_expired = self.read_value(key_string)
+
+        if is_expired:
+            self.delete(key_string)
+            raise StoreGetException(f"Attempt to retrieve expired key {key_string}")
+        return value
+
+    def read_value(self, key_string: str) -> Tuple[Any, bool]:
+        if self.value_cache is not None:
+            cached_value = self.value_cache.get(key_string)
+            if cached_value is not None:
+                value, ttl_in_seconds = cached_value
+                return value, ttl_in_seconds > 0 and is_passed(ttl_in_seconds)
+
+        _, _, ttl_in_seconds, _, _, _, value_as_bytes = self.record_manager.read(
+            file_pointer=self.file_pointer,
+            record_offset=self.starting_offset + (self.keys_and_offsets[key_string] * self.block_size_in_bytes))
+
+        if ttl_in_seconds > 0 and is_passed(ttl_in_seconds):
+            return None, True
+
+        value = self.codec.decode(value_as_bytes)
+        if self.value_cache is not None:
+            self.value_cache.put(key_string, value, ttl_in_seconds, len(value_as_bytes))
+            if self.value_cache.copy_on_read:
+                value = self.codec.decode(value_as_bytes)
+        return value, False
+
+    def read_raw(self, key_string: str) -> Union[memoryview, List[memoryview]]:
+        """
+        Returns the stored value bytes without copying them out of the memory mapped file.
+
+        A value held in a single slot is returned as one memoryview, a value spanning several slots as a list of
+        memoryview segments in order. Compressed values can not be viewed in place and are returned as a view of
+        the decompressed copy. The views point into the mapping that is current at the time of the call.
+        When the file is later extended and remapped, existing views keep the previous mapping alive and still see
+        the same file pages, and the file is never shrunk below a mapping that still has views. The views are not
+        tied to the key though: deleting or expiring it frees its slots for other records, and compaction can move
+        a live key's record to other slots and reuse the old ones, so views should be consumed and released
+        (``view.release()``) before the store is written to, compacted or expires keys.
+        """
+        with self.lock.read_lock():
+            if not self.is_exists(key_string):
+                return None
+
+            record_offset = self.starting_offset + (self.keys_and_offsets[key_string] * self.block_size_in_bytes)
+            type_flag, _, ttl_in_seconds, key_len, value_len = self.record_manager.read_header(
                 file_pointer=self.file_pointer,
                 record_offset=record_offset)
 
-            if ttl_in_seconds > 0 and is_passed(ttl_in_seconds):
-                self.delete(key_string)
-                raise StoreGetException(f"Attempt to retrieve expired key {key_string}")
-
-            return json.loads(value_as_bytes)
-
-    def create(self, key_string: str, key_value: Dict, time_to_live_in_seconds: int = 0):
-        if not self.is_exists(key_string):
-            key_as_bytes = str.encode(key_string)
-            value_as_bytes = str.encode(json.dumps(key_value))
-
-            number_of_slots_needed = self.record_manager.get_slots_needed(len(key_as_bytes), len(value_as_bytes))
-
-            if self.total_blocks <= self.current_slot + number_of_slots_needed:
-                existing_slots = self.total_blocks - self.current_slot
-                slot_shortage = number_of_slots_needed - existing_slots
-                self.file_pointer.flush()
-                extend_file(bytes_to_append=(2 * slot_shortage) * self.block_size_in_bytes,
-                            file_path=self.file_path)
-                self.file_pointer = get_memory_mapped_file_pointer(self.file_path)
+            is_expired = ttl_in_seconds > 0 and is_passed(ttl_in_seconds)
+            if not is_expired and type_flag == COMPRESSED_PRIMARY_SLOT:
+                segments = [memoryview(self.record_manager.read(self.file_pointer, record_offset)[6])]
+            elif not is_expired:
+                file_view = memoryview(self.file_pointer)
+                segments = [file_view[segment_offset:segment_offset + segment_length]
+                            for segment_offset, segment_length in
+                            self.record_manager.get_value_segments(record_offset, key_len, value_len)]
+                file_view.release()
+
+        if is_expired:
+            self.delete(key_string)
+            raise StoreGetException(f"Attempt to retrieve expired key {key_string}")
+
+        if len(segments) == 1:
+            return segments[0]
+        return segments
+
+    def get_many(self, key_strings: List[str]) -> Dict[str, Any]:
+        keys_and_values = {}
+        expired_keys = []
+
+        with self.lock.read_lock():
+            for key_string in key_strings:
+                if self.is_exists(key_string):
+                    value, is_expired = self.read_value(key_string)
+                    if is_expired:
+                        expired_keys.append(key_string)
+                        value = StoreGetException(f"Attempt to retrieve expired key {key_string}")
+                    keys_and_values[key_string] = value
+
+        self.delete_many(expired_keys)
+        return keys_and_values
+
+    def create(self, key_string: str, key_value: Any, time_to_live_in_seconds: int = 0,
+               value_as_bytes: Optional[bytes] = None):
+        value_as_bytes, is_compressed = self.prepare_value(key_string, key_value, value_as_bytes)
+
+        with self.write_section():
+            if self.insert(key_string, value_as_bytes, time_to_live_in_seconds, is_compressed):
+                self.write_record_count()
+        self.durability.commit()
+
+    def create_many(self, keys_values_and_ttls: List[Tuple[str, Any, int, Optional[bytes]]]) -> Dict[str, bool]:
+        encoded_records = [(key_string,
+                            *self.prepare_value(key_string, key_value, value_as_bytes),
+                            time_to_live_in_seconds)
+                           for key_string, key_value, time_to_live_in_seconds, value_as_bytes in keys_values_and_ttls]
+        results = {}
+
+        with self.write_section():
+            # Slots are planned for the whole batch first: holes are taken from the allocator and only the records
+            # that fit in no hole are appended, so the file grows once and only by what the holes can not hold.
+            planned_records = []
+            planned_keys = set()
+            hole_slots = []
+            appended_slots_count = 0
+            for key_string, value_as_bytes, is_compressed, time_to_live_in_seconds in encoded_records:
+                slot = None
+                if key_string not in planned_keys and not self.is_exists(key_string):
+                    planned_keys.add(key_string)
+                    number_of_slots_needed = self.record_manager.get_slots_needed(len(str.encode(key_string)),
+                                                                                  len(value_as_bytes))
+                    slot = self.free_slots.allocate(number_of_slots_needed)
+                    if slot is None:
+                        slot = self.current_slot + appended_slots_count
+                        appended_slots_count += number_of_slots_needed
+                    else:
+                        hole_slots.append((slot, number_of_slots_needed))
+                planned_records.append((key_string, value_as_bytes, is_compressed, time_to_live_in_seconds, slot))
+
+            try:
+                self.ensure_capacity(appended_slots_count)
+            except StoreException:
+                for slot, slots_count in hole_slots:
+                    self.free_slots.release(slot, slots_count)
+                raise
+            self.current_slot += appended_slots_count
+
+            for key_string, value_as_bytes, is_compressed, time_to_live_in_seconds, slot in planned_records:
+                results[key_string] = slot is not None and self.insert(key_string, value_as_bytes,
+                                                                       time_to_live_in_seconds, is_compressed, slot)
+
+            self.write_record_count()
+
+        self.durability.commit()
+        return results
+
+    def check_record_size(self, key_string: str, value_as_bytes: bytes):
+        key_len = len(str.encode(key_string))
+        if key_len > self.record_manager.maximum_key_length_in_bytes:
+            raise StoreRecordSizeException(f"Key {key_string} does not fit in a {self.block_size_in_bytes}-byte slot")
+        if len(value_as_bytes) > self.record_manager.get_maximum_value_length(key_len):
+            raise StoreRecordSizeException(f"Value of key {key_string} does not fit in "
+                                           f"{self.record_manager.maximum_slots_count} slots "
+                                           f"of {self.block_size_in_bytes} bytes")
+
+    def prepare_value(self, key_string: str, key_value: Any, value_as_bytes: Optional[bytes]) -> Tuple[bytes, bool]:
+        if value_as_bytes is None:
+            value_as_bytes = self.codec.encode(key_value)
+        if self.compression_policy is None:
+            return value_as_bytes, False
+
+        # Compressing happens before the write lock is taken, and is kept only when it frees at least one slot.
+        compressed_value_as_bytes = self.compression_policy.compress(value_as_bytes)
+        key_len = len(str.encode(key_string))
+        if compressed_value_as_bytes is None or \
+                self.record_manager.get_slots_needed(key_len, len(compressed_value_as_bytes)) >= \
+                self.record_manager.get_slots_needed(key_len, len(value_as_bytes)):
+            return value_as_bytes, False
+        return compressed_value_as_bytes, True
+
+    def insert(self, key_string: str, value_as_bytes: bytes, time_to_live_in_seconds: int = 0,
+               is_compressed: bool = False, slot: Optional[int] = None) -> bool:
+        if self.is_exists(key_string):
+            return False
 
-            time_to_live = get_timestamp(add_seconds(datetime.now())) if time_to_live_in_seconds > 0 else 0
-            self.record_manager.write(
-                file_pointer=self.file_pointer,
-                offset=self.starting_offset + (self.current_slot * self.block_size_in_bytes),
-                key_as_bytes=key_as_bytes,
-                value_as_bytes=value_as_bytes,
-                ttl_in_seconds=time_to_live
-            )
+        self.invalidate_hint_file()
+        key_as_bytes = str.encode(key_string)
 
-            if time_to_live_in_seconds > 0:
-                self.heap.push((time_to_live, key_string))
+        number_of_slots_needed = self.record_manager.get_slots_needed(len(key_as_bytes), len(value_as_bytes))
 
-            self.keys_and_offsets[key_string] = self.current_slot
+        if slot is None:
+            slot = self.free_slots.allocate(number_of_slots_needed)
+        if slot is None:
+            self.ensure_capacity(number_of_slots_needed)
+            slot = self.current_slot
             self.current_slot += number_of_slots_needed
-            self.record_count += 1
-            self.record_manager.set_record_count(self.file_pointer, self.record_count)
 
-    def delete(self, key_string: str):
-        if self.is_exists(key_string):
-            self.record_manager.delete(
-                self.file_pointer,
-                self.starting_offset + (self.keys_and_offsets[key_string] * self.block_size_in_bytes))
+        time_to_live = get_expiry_timestamp(time_to_live_in_seconds) if time_to_live_in_seconds > 0 else 0
+        record_offset = self.starting_offset + (slot * self.block_size_in_bytes)
+        self.record_manager.write(
+            file_pointer=self.file_pointer,
+            offset=record_offset,
+            key_as_bytes=key_as_bytes,
+            value_as_bytes=value_as_bytes,
+            ttl_in_seconds=time_to_live,
+            is_compressed=is_compressed
+        )
+        self.durability.mark_dirty(record_offset, number_of_slots_needed * self.block_size_in_bytes)
+
+        if time_to_live_in_seconds > 0:
+            self.expiry_queue.schedule(key_string, time_to_live)
+
+        self.keys_and_offsets[key_string] = slot
+        if self.sorted_keys is not None:
+            self.sorted_keys.add(key_string)
+        if self.shared_index is not None and not self.shared_index.put(key_as_bytes, slot):
+            self.shared_index.rebuild(self.keys_and_offsets, len(self.file_pointer))
+        self.record_count += 1
+        return True
+
+    def ensure_capacity(self, number_of_slots_needed: int):
+        if self.total_blocks < self.current_slot + number_of_slots_needed:
+            self.resize(self.growth_policy.get_total_blocks(total_blocks=self.total_blocks,
+                                                            blocks_needed=self.current_slot + number_of_slots_needed,
+                                                            block_size_in_bytes=self.block_size_in_bytes,
+                                                            starting_offset=self.starting_offset))
+
+    def resize(self, total_blocks: int):
+        if total_blocks < self.total_blocks:
+            total_blocks = max(total_blocks, self.get_minimum_total_blocks_of_retired_mappings())
+            if total_blocks >= self.total_blocks:
+                return
+
+        size_in_bytes = self.starting_offset + total_blocks * self.block_size_in_bytes
+        try:
+            self.file_pointer.resize(size_in_bytes)
+        except (BufferError, SystemError):
+            if total_blocks < self.total_blocks:
+                # Truncating the file under views that are still in use would fault their readers.
+                return
+            # Views handed out by read_raw pin the current mapping (or the platform cannot remap in place),
+            # so the file is grown underneath it and mapped again; the old mapping lives as long as its views.
+            resize_file(size_in_bytes=size_in_bytes, file_path=self.file_path)
+            self.retired_file_pointers.append(self.file_pointer)
+            self.file_pointer = get_memory_mapped_file_pointer(self.file_path)
+            self.remaps += 1
+        self.resizes += 1
+        self.total_blocks = total_blocks
+        if self.shared_index is not None:
+            self.shared_index.set_data_size(len(self.file_pointer))
+
+    def get_minimum_total_blocks_of_retired_mappings(self) -> int:
+        # A retired mapping that still has views can only be closed once they are released; until then the file must
+        # not be truncated below its end, or reading those views faults the process (SIGBUS).
+        exported_file_pointers = []
+        for file_pointer in self.retired_file_pointers:
+            try:
+                file_pointer.close()
+            except BufferError:
+                exported_file_pointers.append(file_pointer)
+        self.retired_file_pointers = exported_file_pointers
+
+        if not exported_file_pointers:
+            return 0
+        largest_size_in_bytes = max(len(file_pointer) for file_pointer in exported_file_pointers)
+        return -(-(largest_size_in_bytes - self.starting_offset) // self.block_size_in_bytes)
 
-            self.keys_and_offsets.pop(key_string)
-            self.record_count -= 1
-            self.record_manager.set_record_count(self.file_pointer, self.record_count)
+    def delete(self, key_string: str):
+        with self.write_section():
+            if self.remove(key_string):
+                self.write_record_count()
+        self.durability.commit()
+
+    def delete_many(self, key_strings: List[str]) -> Dict[str, bool]:
+        with self.write_section():
+            results = {key_string: self.remove(key_string) for key_string in key_strings}
+            if any(results.values()):
+                self.write_record_count()
+        self.durability.commit()
+        return results
+
+    def write_record_count(self):
+        self.record_manager.set_record_count(self.file_pointer, self.record_count)
+        self.durability.mark_dirty(0, self.starting_offset)
+
+    def remove(self, key_string: str) -> bool:
+        if not self.is_exists(key_string):
+            return False
+
+        self.invalidate_hint_file()
+        if self.value_cache is not None:
+            self.value_cache.invalidate(key_string)
+        self.expiry_queue.cancel(key_string)
+        slot = self.keys_and_offsets[key_string]
+        record_offset = self.starting_offset + (slot * self.block_size_in_bytes)
+        slots_count = self.record_manager.delete(self.file_pointer, record_offset)
+        self.durability.mark_dirty(record_offset, slots_count * self.block_size_in_bytes)
+        if self.shared_index is not None:
+            self.shared_index.delete(str.encode(key_string), slot)
+
+        self.keys_and_offsets.pop(key_string)
+        if self.sorted_keys is not None:
+            self.sorted_keys.remove(key_string)
+        self.release_slots(slot, slots_count)
+        self.record_count -= 1
+        return True
+
+    def release_slots(self, slot: int, slots_count: int):
+        hole_start, hole_size = self.free_slots.release(slot, slots_count)
+        if hole_start + hole_size == self.current_slot:
+            self.current_slot = self.free_slots.trim(self.current_slot)
 
     def load(self):
 
         if not self.record_manager.is_magic_bytes_exists(self.file_pointer):
             raise StoreException("Existing data file is not valid, failed to load")
 
-        slot = 0
-        added_records = 0
-
         self.record_count = self.record_manager.get_record_count(self.file_pointer)
-
-        while added_records < self.record_count:
+        self.total_blocks = (len(self.file_pointer) - self.starting_offset) // self.block_size_in_bytes
+        self.hint_generation = self.record_manager.get_hint_generation(self.file_pointer)
+
+        records = self.load_hint_file()
+        if records is None:
+            records = self.scan_records()
+
+        self.rebuild_index(records)
+
+    def load_hint_file(self) -> Optional[List[HintRecord]]:
+        hint = read_hint_file(self.hint_file_path)
+        if hint is None:
+            return None
+
+        hint_generation, record_count, current_slot, records = hint
+        if (hint_generation != self.hint_generation or record_count != self.record_count
+                or len(records) != record_count or current_slot > self.total_blocks):
+            os.remove(self.hint_file_path)
+            return None
+
+        self.hint_is_fresh = True
+        return records
+
+    def scan_records(self) -> List[HintRecord]:
+        records = self.scan_slots(end_slot=self.total_blocks, with_values=False)
+        if len(records) < self.record_count:
+            raise StoreException("Existing data file has fewer records than its header claims, failed to load")
+
+        return [(key_as_bytes, slot, slots_count, ttl_in_seconds)
+                for key_as_bytes, slot, slots_count, ttl_in_seconds, _ in records]
+
+    def scan_slots(self, end_slot: int, with_values: bool) -> List[ScannedRecord]:
+        if self.scan_workers > 1 and end_slot >= self.parallel_scan_minimum_slots:
+            return parallel_scan(file_path=self.file_path,
+                                 starting_offset=self.starting_offset,
+                                 slot_size_in_bytes=self.block_size_in_bytes,
+                                 format_version=self.record_manager.format_version,
+                                 end_slot=end_slot,
+                                 workers=self.scan_workers,
+                                 with_values=with_values)
+
+        return scan_slot_range(file_pointer=self.file_pointer,
+                               record_manager=self.record_manager,
+                               starting_offset=self.starting_offset,
+                               start_slot=0,
+                               end_slot=end_slot,
+                               with_values=with_values,
+                               limit=self.record_count)
+
+    def rebuild_index(self, records: List[HintRecord]):
+        self.keys_and_offsets.clear()
+        self.free_slots.clear()
+        next_slot = 0
+
+        for key_as_bytes, slot, slots_count, ttl_in_seconds in records:
+            key_string = key_as_bytes.decode("utf-8")
+            self.keys_and_offsets[key_string] = slot
+
+            if ttl_in_seconds > 0:
+                self.expiry_queue.schedule(key_string, ttl_in_seconds)
+
+            if slot > next_slot:
+                self.free_slots.release(next_slot, slot - next_slot)
+            next_slot = slot + slots_count
+
+        self.current_slot = next_slot
+        if self.sorted_keys is not None:
+            self.sorted_keys.rebuild(self.keys_and_offsets)
+
+    def invalidate_hint_file(self):
+        self.changed_since_hint_file = True
+        if self.hint_is_fresh:
+            self.hint_is_fresh = False
+            self.hint_generation = (self.hint_generation + 1) % (1 << (8 * HINT_GENERATION_LENGTH))
+            self.record_manager.set_hint_generation(self.file_pointer, self.hint_generation)
+            self.file_pointer.flush(0, min(mmap.PAGESIZE, len(self.file_pointer)))
+
+    def write_hint_file(self):
+        with self.lock.read_lock():
+            if self.hint_is_fresh:
+                return
+
+            records = []
+            for key_string, slot in sorted(self.keys_and_offsets.items(), key=lambda key_and_slot: key_and_slot[1]):
+                _, slots_count, ttl_in_seconds, _, _ = self.record_manager.read_header(
+                    self.file_pointer, self.starting_offset + (slot * self.block_size_in_bytes))
+                records.append((str.encode(key_string), slot, slots_count, ttl_in_seconds))
+
+            hint_generation, record_count, current_slot = self.hint_generation, self.record_count, self.current_slot
+            self.hint_is_fresh = True
+            self.changed_since_hint_file = False
+
+        self.file_pointer.flush()
+        write_hint_file(file_path=self.hint_file_path,
+                        hint_generation=hint_generation,
+                        record_count=record_count,
+                        current_slot=current_slot,
+                        records=records)
+
+    def refresh_hint_file(self):
+        while not self.stop_event.wait(self.hint_interval_in_seconds):
+            self.write_hint_file_if_changed()
+
+    def write_hint_file_if_changed(self):
+        if self.changed_since_hint_file:
+            self.write_hint_file()
+
+    def compact(self, max_records_to_move: Optional[int] = None) -> int:
+        moved_records = 0
+        while max_records_to_move is None or moved_records < max_records_to_move:
+            with self.write_section():
+                if not self.move_tail_record():
+                    break
+            moved_records += 1
+
+        with self.write_section():
+            total_blocks = self.growth_policy.get_shrunk_total_blocks(total_blocks=self.total_blocks,
+                                                                      blocks_used=self.current_slot,
+                                                                      minimum_total_blocks=self.initial_total_blocks)
+            # Readers sharing the index may still map the tail of the file, so it is never truncated under them.
+            if total_blocks is not None and self.shared_index is None:
+                self.resize(total_blocks)
+
+        self.durability.commit()
+        return moved_records
+
+    def move_tail_record(self) -> bool:
+        tail_record = self.find_tail_record()
+        if tail_record is None:
+            return False
+
+        key_string, slot, slots_count = tail_record
+        target_slot = self.free_slots.allocate(slots_count)
+        if target_slot is None:
+            return False
+
+        self.invalidate_hint_file()
+        record_offset = self.starting_offset + (slot * self.block_size_in_bytes)
+        target_offset = self.starting_offset + (target_slot * self.block_size_in_bytes)
+        self.file_pointer.move(target_offset, record_offset, slots_count * self.block_size_in_bytes)
+        self.keys_and_offsets[key_string] = target_slot
+        if self.shared_index is not None:
+            self.shared_index.move(str.encode(key_string), slot, target_slot)
+        self.record_manager.delete(self.file_pointer, record_offset)
+        self.durability.mark_dirty(target_offset, slots_count * self.block_size_in_bytes)
+        self.durability.mark_dirty(record_offset, slots_count * self.block_size_in_bytes)
+        self.release_slots(slot, slots_count)
+        return True
+
+    def find_tail_record(self) -> Optional[Tuple[str, int, int]]:
+        # No free run ends at current_slot, so the last record ends exactly there; primary flags that are
+        # really value bytes are told apart by checking the key against the index.
+        lowest_slot = max(0, self.current_slot - self.record_manager.maximum_slots_count)
+        for slot in range(self.current_slot - 1, lowest_slot - 1, -1):
             record_offset = self.starting_offset + (slot * self.block_size_in_bytes)
-            if self.record_manager.is_available(file_pointer=self.file_pointer,
-                                                record_offset=record_offset):
-                _, slots_count, _, _, _, key_as_bytes, value_as_bytes = self.record_manager.read(
-                    self.file_pointer, record_offset
-                )
-
-                self.keys_and_offsets[key_as_bytes.decode("utf-8")] = record_offset
+            if not self.record_manager.is_available(self.file_pointer, record_offset):
+                continue
+
+            _, slots_count, _, key_len, _ = self.record_manager.read_header(self.file_pointer, record_offset)
+            if slot + slots_count != self.current_slot:
+                continue
+
+            key_as_bytes = self.record_manager.read_key(self.file_pointer, record_offset, key_len)
+            key_string = key_as_bytes.decode("utf-8", "replace")
+            if self.keys_and_offsets.get(key_string) == slot:
+                return key_string, slot, slots_count
+        return None
+
+    def flush_ranges(self, flush_ranges: List[FlushRange]):
+        # Holding the read lock keeps compaction from shrinking or remapping the file under the flush.
+        with self.lock.read_lock():
+            file_size = len(self.file_pointer)
+            for offset, length in flush_ranges:
+                if offset < file_size:
+                    self.file_pointer.flush(offset, min(length, file_size - offset))
+
+    def flush_periodically(self):
+        while not self.stop_event.wait(self.durability.policy.flush_interval_in_milliseconds / 1000):
+            self.durability.flush()
+
+    def compact_in_background(self):
+        while not self.stop_event.wait(self.background_jobs_frequency_in_seconds):
+            self.compact(self.compaction_budget_per_cycle)
+
+    def get_all_keys_and_values(self) -> Dict[str, Any]:
+        with self.lock.read_lock():
+            records = self.scan_slots(end_slot=self.current_slot, with_values=True)
+
+        return {key_as_bytes.decode("utf-8"): self.codec.decode(value_as_bytes)
+                for key_as_bytes, _, _, _, value_as_bytes in records}
+
+    def scan(self, cursor: int = 0, count: int = 100, match: Optional[str] = None, keys_only: bool = False) -> ScanBatch:
+        keys_and_values = []
+        with self.lock.read_lock():
+            slot = cursor
+            examined_records = 0
+            while slot < self.current_slot and examined_records < count:
+                record_offset = self.starting_offset + (slot * self.block_size_in_bytes)
+                if not self.record_manager.is_available(self.file_pointer, record_offset):
+                    slot += 1
+                    continue
+
+                # Writes between batches may leave the cursor inside a record, whose value bytes can look like a
+                # primary flag, so only records the index points at are taken.
+                _, slots_count, ttl_in_seconds, key_len, _ = self.record_manager.read_header(self.file_pointer,
+                                                                                             record_offset)
+                key_string = self.record_manager.read_key(self.file_pointer, record_offset, key_len).decode(
+                    "utf-8", "replace")
+                if self.keys_and_offsets.get(key_string) != slot:
+                    slot += 1
+                    continue
 
                 slot += slots_count
-                added_records += 1
-            else:
-                slot += 1
-
-    def get_all_keys_and_values(self) -> Dict[str, dict]:
+                examined_records += 1
+                if (ttl_in_seconds > 0 and is_passed(ttl_in_seconds)) or not is_key_matching(key_string, match):
+                    continue
 
-        all_keys_and_values = {}
+                if keys_only:
+                    keys_and_values.append((key_string, None))
+                else:
+                    _, _, _, _, _, _, value_as_bytes = self.record_manager.read(self.file_pointer, record_offset)
+                    keys_and_values.append((key_string, value_as_bytes))
 
-        slot = 0
-        added_records = 0
+            next_cursor = slot if slot < self.current_slot else 0
 
-        while added_records < self.record_count:
-            record_offset = self.starting_offset + (slot * self.block_size_in_bytes)
-            if self.record_manager.is_available(file_pointer=self.file_pointer,
-                                                record_offset=record_offset):
-                _, slots_count, _, _, _, key_as_bytes, value_as_bytes = self.record_manager.read(
-                    self.file_pointer, record_offset
-                )
+        if keys_only:
+            return next_cursor, [key_string for key_string, _ in keys_and_values]
+        return next_cursor, [(key_string, self.codec.decode(value_as_bytes))
+                             for key_string, value_as_bytes in keys_and_values]
 
-                all_keys_and_values[key_as_bytes.decode("utf-8")] = json.loads(value_as_bytes.decode('utf=8'))
-
-                slot += slots_count
-                added_records += 1
+    def get_range(self, start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None,
+                  keys_only: bool = False) -> List[Any]:
+        with self.lock.read_lock():
+            if self.sorted_keys is not None:
+                key_strings = self.sorted_keys.irange(start, end)
             else:
-                slot += 1
-
-        return all_keys_and_values
+                key_strings = iter(sorted(key_string for key_string in self.keys_and_offsets
+                                          if is_key_in_range(key_string, start, end)))
+            return self.read_ordered(key_strings, limit, keys_only)
+
+    def get_prefix(self, prefix: str, limit: Optional[int] = None, keys_only: bool = False) -> List[Any]:
+        with self.lock.read_lock():
+            if self.sorted_keys is not None:
+                key_strings = self.sorted_keys.iprefix(prefix)
+            else:
+                key_strings = iter(sorted(key_string for key_string in self.keys_and_offsets
+                                          if key_string.startswith(prefix)))
+            return self.read_ordered(key_strings, limit, keys_only)
+
+    def read_ordered(self, key_strings: Iterator[str], limit: Optional[int], keys_only: bool) -> List[Any]:
+        results = []
+        for key_string in key_strings:
+            if limit is not None and len(results) >= limit:
+                break
+
+            if keys_only:
+                _, _, ttl_in_seconds, _, _ = self.record_manager.read_header(
+                    self.file_pointer,
+                    self.starting_offset + (self.keys_and_offsets[key_string] * self.block_size_in_bytes))
+                if not (ttl_in_seconds > 0 and is_passed(ttl_in_seconds)):
+                    results.append(key_string)
+            else:
+                value, is_expired = self.read_value(key_string)
+                if not is_expired:
+                    results.append((key_string, value))
+        return results
 
     def expire_keys(self):
         while not self.stop_event.is_set():
-            while not self.heap.is_empty():
-                ttl_in_seconds, key_string = self.heap.peek()
-                if is_passed(ttl_in_seconds):
-                    self.delete(key_string)
-                    self.heap.pop()
-                else:
-                    break
-            sleep(self.background_jobs_frequency_in_seconds)
+            self.expire_cycle()
+            self.stop_event.wait(self.active_expiry.next_interval_in_seconds())
+
+    def expire_cycle(self) -> int:
+        return self.active_expiry.run_cycle()
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock.read_lock():
+            free_slots = self.free_slots.free_slots_count()
+            used_slots = self.current_slot - free_slots
+            return {
+                "record_count": self.record_count,
+                "file_size_in_bytes": len(self.file_pointer),
+                "used_bytes": used_slots * self.block_size_in_bytes,
+                "total_slots": self.total_blocks,
+                "current_slot": self.current_slot,
+                "used_slots": used_slots,
+                "free_slots": free_slots,
+                "free_runs": self.free_slots.holes_count(),
+                "slot_utilization": used_slots / self.total_blocks if self.total_blocks else 0.0,
+                "fragmentation": free_slots / self.current_slot if self.current_slot else 0.0,
+                "resizes": self.resizes,
+                "remaps": self.remaps
+            }
 
     def close(self):
+        if self.shared_index is not None:
+            self.shared_index.close()
         if os.path.exists(self.file_path):
             os.remove(self.file_path)
+        if os.path.exists(self.hint_file_path):
+            os.remove(self.hint_file_path)
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from pykv.store import StoreFullException
+
+
+class GrowthPolicy:
+    def __init__(self,
+                 growth_factor: float = 2.0,
+                 minimum_chunk_in_blocks: int = 64,
+                 maximum_file_size_in_bytes: int = 1024 * 1024 * 1024):
+
+        if growth_factor < 1:
+            raise ValueError("Growth factor should be at least 1")
+
+        self.growth_factor = growth_factor
+        self.minimum_chunk_in_blocks = minimum_chunk_in_blocks
+        self.maximum_file_size_in_bytes = maximum_file_size_in_bytes
+
+    def get_total_blocks(self,
+                         total_blocks: int,
+                         blocks_needed: int,
+                         block_size_in_bytes: int,
+                         starting_offset: int) -> int:
+
+        maximum_blocks = (self.maximum_file_size_in_bytes - starting_offset) // block_size_in_bytes
+        if blocks_needed > maximum_blocks:
+            raise StoreFullException(f"Store file would exceed the limit of {self.maximum_file_size_in_bytes} bytes")
+
+        grown_blocks = max(blocks_needed,
+                           int(total_blocks * self.growth_factor),
+                           total_blocks + self.minimum_chunk_in_blocks)
+        return min(grown_blocks, maximum_blocks)
+
+    def get_shrunk_total_blocks(self, total_blocks: int, blocks_used: int, minimum_total_blocks: int) -> Optional[int]:
+        kept_blocks = max(blocks_used + self.minimum_chunk_in_blocks,
+                          int(blocks_used * self.growth_factor),
+                          minimum_total_blocks)
+        if kept_blocks < total_blocks:
+            return kept_blocks
+        return None
@@ -0,0 +1,58 @@
+import os
+import struct
+from typing import List, Optional, Tuple
+
+HINT_MAGIC = b"PKVH"
+HINT_MAGIC_V2 = b"PKV2"
+HINT_HEADER = struct.Struct(">4sIII")  # magic, hint generation, record count, current slot
+HINT_ENTRY = struct.Struct(">IBIB")  # slot, slots count, time to live, key length, followed by key bytes
+HINT_ENTRY_V2 = struct.Struct(">IIIH")  # the same, with the slots count and key length widened for format 2 records
+HINT_ENTRIES = {HINT_MAGIC: HINT_ENTRY, HINT_MAGIC_V2: HINT_ENTRY_V2}
+
+HintRecord = Tuple[bytes, int, int, int]  # key bytes, slot, slots count, time to live
+
+
+def write_hint_file(file_path: str,
+                    hint_generation: int,
+                    record_count: int,
+                    current_slot: int,
+                    records: List[HintRecord]):
+    parts = [HINT_HEADER.pack(HINT_MAGIC_V2, hint_generation, record_count, current_slot)]
+    for key_as_bytes, slot, slots_count, ttl_in_seconds in records:
+        parts.append(HINT_ENTRY_V2.pack(slot, slots_count, ttl_in_seconds, len(key_as_bytes)))
+        parts.append(key_as_bytes)
+
+    temporary_file_path = file_path + ".tmp"
+    with open(temporary_file_path, "wb") as f:
+        f.write(b"".join(parts))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_file_path, file_path)
+
+
+def read_hint_file(file_path: str) -> Optional[Tuple[int, int, int, List[HintRecord]]]:
+    if not os.path.exists(file_path):
+        return None
+
+    with open(file_path, "rb") as f:
+        data = f.read()
+
+    try:
+        magic, hint_generation, record_count, current_slot = HINT_HEADER.unpack_from(data, 0)
+        hint_entry = HINT_ENTRIES.get(magic)
+        if hint_entry is None:
+            return None
+
+        records = []
+        offset = HINT_HEADER.size
+        while offset < len(data):
+            slot, slots_count, ttl_in_seconds, key_len = hint_entry.unpack_from(data, offset)
+            offset += hint_entry.size
+            if offset + key_len > len(data):
+                return None
+            records.append((data[offset:offset + key_len], slot, slots_count, ttl_in_seconds))
+            offset += key_len
+    except struct.error:
+        return None
+
+    return hint_generation, record_count, current_slot, records
@@ -0,0 +1,68 @@
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    def __init__(self):
+        self.condition = threading.Condition(threading.Lock())
+        self.active_readers = 0
+        self.waiting_writers = 0
+        self.writer = None
+        self.writer_holds = 0
+        self.local = threading.local()
+
+    def acquire_read(self):
+        read_holds = getattr(self.local, "read_holds", 0)
+        with self.condition:
+            # A thread that already holds the lock re-enters without waiting, otherwise writers go first.
+            if read_holds == 0 and self.writer != threading.get_ident():
+                while self.writer is not None or self.waiting_writers:
+                    self.condition.wait()
+            self.active_readers += 1
+        self.local.read_holds = read_holds + 1
+
+    def release_read(self):
+        self.local.read_holds -= 1
+        with self.condition:
+            self.active_readers -= 1
+            if self.active_readers == 0:
+                self.condition.notify_all()
+
+    def acquire_write(self):
+        with self.condition:
+            if self.writer == threading.get_ident():
+                self.writer_holds += 1
+                return
+
+            if getattr(self.local, "read_holds", 0):
+                raise RuntimeError("Read lock can not be upgraded to a write lock")
+
+            self.waiting_writers += 1
+            while self.writer is not None or self.active_readers:
+                self.condition.wait()
+            self.waiting_writers -= 1
+            self.writer = threading.get_ident()
+            self.writer_holds = 1
+
+    def release_write(self):
+        with self.condition:
+            self.writer_holds -= 1
+            if self.writer_holds == 0:
+                self.writer = None
+                self.condition.notify_all()
+
+    @contextmanager
+    def read_lock(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_lock(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -1,10 +1,18 @@
-import json
 import os
-from sys import getsizeof
-from typing import Dict, Optional
+import pickle
+from contextlib import contextmanager
+from typing import Dict, Optional, List, Any, Union, Iterator, Tuple
 
+from pykv.codecs import ValueCodec
+from pykv.compression import CompressionPolicy
+from pykv.durability import DurabilityPolicy
+from pykv.expiry import ActiveExpiryPolicy
 from pykv.file_store import FileStore, StoreException
+from pykv.growth import GrowthPolicy
 from pykv.mem_store import MemStore
+from pykv.metrics import StoreMetrics
+from pykv.read_only_store import ReadOnlyFileStore, StoreWriterStalledException
+from pykv.store import StoreFullException, ScanBatch, StoreRecordSizeException
 
 
 class KeyNotFoundException(Exception):
@@ -27,25 +35,105 @@ class InvalidValueException(Exception):
     pass
 
 
+class StoreSizeLimitException(Exception):
+    pass
+
+
+class ReadOnlyStoreException(Exception):
+    pass
+
+
+class WriterStalledException(Exception):
+    pass
+
+
+KEY_VALUE_STORE_OPERATIONS = {method_name: method_name for method_name in (
+    "read", "read_raw", "write", "delete", "read_many", "write_many", "delete_many", "get_all", "scan", "range",
+    "prefix", "compact")}
+
+
 class KeyValueStore:
 
     def __init__(self,
                  file_path: Optional[str] = "default_kv.bin",
                  background_jobs_frequency_in_seconds=10,
-                 mem_store_mode=False):
+                 mem_store_mode=False,
+                 growth_policy: Optional[GrowthPolicy] = None,
+                 hint_interval_in_seconds=60,
+                 scan_workers: Optional[int] = None,
+                 compaction_budget_per_cycle=0,
+                 value_codec: Union[str, ValueCodec, None] = None,
+                 cache_max_entries=0,
+                 cache_max_bytes=0,
+                 cache_copy_on_read=False,
+                 active_expiry_policy: Optional[ActiveExpiryPolicy] = None,
+                 durability_policy: Optional[DurabilityPolicy] = None,
+                 shared_index=False,
+                 read_only=False,
+                 sorted_index=False,
+                 metrics: Optional[StoreMetrics] = None,
+                 compression_policy: Optional[CompressionPolicy] = None,
+                 slot_size_in_bytes: Optional[int] = None,
+                 format_version: Optional[int] = None,
+                 maximum_key_length=32,
+                 maximum_value_size_in_bytes=16000):
 
         self.__file_path__ = file_path
+        self.read_only = read_only
+        self.maximum_key_length = maximum_key_length
+        self.maximum_value_size_in_bytes = maximum_value_size_in_bytes
+        self.metrics = metrics
+        if read_only:
+            self.file_store = ReadOnlyFileStore(file_path=os.getcwd() + "/" + file_path, value_codec=value_codec)
+            self.mem_store = None
+            self.store = self.file_store
+            if metrics is not None:
+                metrics.instrument(self, KEY_VALUE_STORE_OPERATIONS)
+            return
+
         self.file_store = FileStore(
             file_path=os.getcwd() + "/" + file_path,
-            background_jobs_frequency_in_seconds=background_jobs_frequency_in_seconds)
+            background_jobs_frequency_in_seconds=background_jobs_frequency_in_seconds,
+            growth_policy=growth_policy,
+            hint_interval_in_seconds=hint_interval_in_seconds,
+            scan_workers=scan_workers,
+            compaction_budget_per_cycle=compaction_budget_per_cycle,
+            value_codec=value_codec,
+            cache_max_entries=cache_max_entries,
+            cache_max_bytes=cache_max_bytes,
+            cache_copy_on_read=cache_copy_on_read,
+            active_expiry_policy=active_expiry_policy,
+            durability_policy=durability_policy,
+            shared_index=shared_index,
+            sorted_index=sorted_index,
+            compression_policy=compression_policy,
+            slot_size_in_bytes=slot_size_in_bytes,
+            format_version=format_version)
         self.mem_store: MemStore = MemStore(
-            background_jobs_frequency_in_seconds=background_jobs_frequency_in_seconds)
+            background_jobs_frequency_in_seconds=background_jobs_frequency_in_seconds,
+            value_codec=value_codec,
+            active_expiry_policy=active_expiry_policy,
+            sorted_index=sorted_index)
 
         if mem_store_mode:
             self.store = self.mem_store
         else:
             self.store = self.file_store
 
+        if metrics is not None:
+            self.instrument(metrics)
+
+    def instrument(self, metrics: StoreMetrics):
+        metrics.instrument(self, KEY_VALUE_STORE_OPERATIONS)
+        metrics.instrument(self.store, {"expire_cycle": "expire_cycle"})
+        if self.store is self.file_store:
+            metrics.instrument(self.file_store.lock, {"acquire_read": "lock.read_wait",
+                                                      "acquire_write": "lock.write_wait"})
+            metrics.instrument(self.file_store.record_manager, {"read": "record.read",
+                                                                "write": "record.write",
+                                                                "delete": "record.delete"})
+            metrics.instrument(self.file_store.durability, {"flush": "flush"})
+
     def start(self):
         self.start_background_jobs()
 
@@ -53,34 +141,185 @@ class KeyValueStore:
         self.stop_background_jobs()
         self.file_store.close()
 
-    def read(self, key_string: str):
-        if not self.store.is_exists(key_string):
-            raise KeyNotFoundException(f"Given key {key_string} not found in Store")
+    def shutdown(self):
+        self.stop_background_jobs()
+        self.file_store.write_hint_file()
+
+    @contextmanager
+    def translate_writer_stall(self):
+        # Read only stores give up on a writer that died inside a write section, on any read.
         try:
-            return self.store.get(key_string)
-        except StoreException as exception:
-            raise ExpiredKeyException(str(exception))
+            yield
+        except StoreWriterStalledException as exception:
+            raise WriterStalledException(str(exception))
+
+    def read(self, key_string: str):
+        with self.translate_writer_stall():
+            if not self.store.is_exists(key_string):
+                raise KeyNotFoundException(f"Given key {key_string} not found in Store")
+            try:
+                return self.store.get(key_string)
+            except StoreWriterStalledException:
+                raise
+            except StoreException as exception:
+                raise ExpiredKeyException(str(exception))
+
+    def read_raw(self, key_string: str):
+        with self.translate_writer_stall():
+            if not self.store.is_exists(key_string):
+                raise KeyNotFoundException(f"Given key {key_string} not found in Store")
+            try:
+                return self.store.read_raw(key_string)
+            except StoreWriterStalledException:
+                raise
+            except StoreException as exception:
+                raise ExpiredKeyException(str(exception))
 
     def delete(self, key_string: str):
+        self.ensure_writable()
         if not self.store.is_exists(key_string):
             raise KeyNotFoundException(f"Given key {key_string} not found in Store")
         return self.store.delete(key_string)
 
-    def write(self, key_string: str, value: Dict, time_to_live_in_seconds=0):
+    def write(self, key_string: str, value: Any, time_to_live_in_seconds=0):
+        self.ensure_writable()
+        self.write_encoded(key_string, value, self.validate_write(key_string, value), time_to_live_in_seconds)
+
+    def write_encoded(self, key_string: str, value: Any, value_as_bytes: bytes, time_to_live_in_seconds=0):
+        try:
+            self.store.create(key_string, value, time_to_live_in_seconds, value_as_bytes)
+        except StoreFullException as exception:
+            raise StoreSizeLimitException(str(exception))
 
-        if len(key_string) > 32:
-            raise InvalidKeyException(f"Key string length exceeds limit of 32 characters")
+    def ensure_writable(self):
+        if self.read_only:
+            raise ReadOnlyStoreException(f"Store {self.__file_path__} is opened read only")
 
-        if getsizeof(json.dumps(value)) > 16000:
-            raise InvalidKeyException(f"Value size exceeds limit of 16KB")
+    def validate_write(self, key_string: str, value: Any) -> bytes:
+
+        if len(key_string) > self.maximum_key_length:
+            raise InvalidKeyException(f"Key string length exceeds limit of {self.maximum_key_length} characters")
+
+        try:
+            value_as_bytes = self.store.codec.encode(value)
+        except (TypeError, ValueError, AttributeError, pickle.PicklingError) as exception:
+            raise InvalidValueException(f"Value can not be encoded with {self.store.codec.name} codec: {exception}")
+
+        if len(value_as_bytes) > self.maximum_value_size_in_bytes:
+            raise InvalidKeyException(f"Value size exceeds limit of {self.maximum_value_size_in_bytes} bytes")
+
+        try:
+            self.store.check_record_size(key_string, value_as_bytes)
+        except StoreRecordSizeException as exception:
+            raise InvalidValueException(str(exception))
 
         if self.store.is_exists(key_string):
             raise InvalidValueException(f"Given key {key_string} is already exists in Store")
 
-        self.store.create(key_string, value, time_to_live_in_seconds)
+        return value_as_bytes
+
+    def read_many(self, key_strings: List[str]) -> Dict[str, Any]:
+        with self.translate_writer_stall():
+            keys_and_values = self.store.get_many(key_strings)
+
+        results = {}
+        for key_string in key_strings:
+            if key_string not in keys_and_values:
+                results[key_string] = KeyNotFoundException(f"Given key {key_string} not found in Store")
+            elif isinstance(keys_and_values[key_string], StoreException):
+                results[key_string] = ExpiredKeyException(str(keys_and_values[key_string]))
+            else:
+                results[key_string] = keys_and_values[key_string]
+        return results
+
+    def write_many(self, keys_and_values: Dict[str, Any], time_to_live_in_seconds=0) -> Dict[str, Optional[Exception]]:
+        self.ensure_writable()
+        results = {}
+        records = []
+        for key_string, value in keys_and_values.items():
+            try:
+                value_as_bytes = self.validate_write(key_string, value)
+                records.append((key_string, value, time_to_live_in_seconds, value_as_bytes))
+            except (InvalidKeyException, InvalidValueException) as exception:
+                results[key_string] = exception
+
+        results.update(self.write_encoded_many(records))
+        return results
+
+    def write_encoded_many(self, records: List[Tuple[str, Any, int, bytes]]) -> Dict[str, Optional[Exception]]:
+        try:
+            created_keys = self.store.create_many(records)
+        except StoreFullException as exception:
+            raise StoreSizeLimitException(str(exception))
+
+        return {key_string: None if created else InvalidValueException(
+                    f"Given key {key_string} is already exists in Store")
+                for key_string, created in created_keys.items()}
+
+    def delete_many(self, key_strings: List[str]) -> Dict[str, Optional[Exception]]:
+        self.ensure_writable()
+        return {key_string: None if deleted else KeyNotFoundException(f"Given key {key_string} not found in Store")
+                for key_string, deleted in self.store.delete_many(key_strings).items()}
+
+    def compact(self, max_records_to_move: Optional[int] = None) -> int:
+        self.ensure_writable()
+        return self.file_store.compact(max_records_to_move)
+
+    def cache_stats(self) -> Dict[str, int]:
+        if self.file_store.value_cache is None:
+            return {}
+        return self.file_store.value_cache.stats()
+
+    def flush(self):
+        if self.read_only:
+            return
+        self.file_store.durability.flush()
+
+    def durability_stats(self) -> Dict[str, int]:
+        if self.read_only:
+            return {}
+        return self.file_store.durability.stats()
+
+    def expiry_stats(self) -> Dict[str, float]:
+        if self.read_only:
+            return {}
+        return self.store.active_expiry.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "store": self.store.stats(),
+            "operations": self.metrics.stats() if self.metrics is not None else {}
+        }
+        if not self.read_only:
+            stats["expiry"] = self.expiry_stats()
+            stats["durability"] = self.durability_stats()
+            stats["cache"] = self.cache_stats()
+        return stats
 
     def get_all(self):
-        return self.store.get_all_keys_and_values()
+        with self.translate_writer_stall():
+            return self.store.get_all_keys_and_values()
+
+    def scan(self, cursor: int = 0, count: int = 100, match: Optional[str] = None, keys_only=False) -> ScanBatch:
+        with self.translate_writer_stall():
+            return self.store.scan(cursor, count, match, keys_only)
+
+    def range(self, start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None,
+              keys_only=False) -> List[Any]:
+        with self.translate_writer_stall():
+            return self.store.get_range(start, end, limit, keys_only)
+
+    def prefix(self, prefix: str, limit: Optional[int] = None, keys_only=False) -> List[Any]:
+        with self.translate_writer_stall():
+            return self.store.get_prefix(prefix, limit, keys_only)
+
+    def scan_iter(self, match: Optional[str] = None, keys_only=False, count: int = 100) -> Iterator[Any]:
+        cursor = 0
+        while True:
+            cursor, keys_and_values = self.scan(cursor, count, match, keys_only)
+            yield from keys_and_values
+            if cursor == 0:
+                return
 
     def stop_background_jobs(self):
         self.store.stop_background_jobs()
@@ -1,17 +1,32 @@
-from datetime import datetime
-from time import sleep
-from typing import Dict
+from bisect import bisect_left
+from typing import Dict, List, Tuple, Any, Optional, Union, Iterator
 
-from pykv.data_structures.heap import Heap
-from pykv.store import StoreException, Store
-from pykv.utils import get_timestamp, add_seconds, is_passed
+from pykv.codecs import ValueCodec, get_codec, JsonCodec
+from pykv.data_structures.expiry_queue import ExpiryQueue
+from pykv.data_structures.sorted_key_index import SortedKeyIndex
+from pykv.expiry import ActiveExpiry, ActiveExpiryPolicy
+from pykv.store import StoreException, Store, ScanBatch
+from pykv.utils import get_expiry_timestamp, is_passed, is_key_matching, is_key_in_range
 
 
 class MemStore(Store):
-    def __init__(self, background_jobs_frequency_in_seconds):
+    def __init__(self, background_jobs_frequency_in_seconds,
+                 value_codec: Union[str, ValueCodec, None] = None,
+                 active_expiry_policy: Optional[ActiveExpiryPolicy] = None,
+                 sorted_index: bool = False):
         self.keys_and_values = {}
-        self.keys_and_ttls = {}
-        self.heap = Heap()
+        # Scan cursors are insertion sequence numbers, which stay valid however many earlier keys get deleted.
+        # Sequences only grow, so appending keeps scan_sequences sorted; deleted ones are dropped lazily.
+        self.insertion_sequences: Dict[str, int] = {}
+        self.keys_by_insertion_sequence: Dict[int, str] = {}
+        self.scan_sequences: List[int] = []
+        self.next_insertion_sequence = 0
+        self.codec = get_codec(value_codec or JsonCodec.name)
+        self.expiry_queue = ExpiryQueue()
+        self.sorted_keys = SortedKeyIndex() if sorted_index else None
+        self.active_expiry = ActiveExpiry(self.expiry_queue, self.delete_many,
+                                          maximum_interval_in_seconds=background_jobs_frequency_in_seconds,
+                                          policy=active_expiry_policy)
         self.background_jobs_frequency_in_seconds = background_jobs_frequency_in_seconds
 
         super().__init__(self.expire_keys,
@@ -20,40 +35,131 @@ class MemStore(Store):
     def is_exists(self, key_string):
         return key_string in self.keys_and_values
 
-    def create(self, key_string: str, key_value: Dict, time_to_live_in_seconds: int = 0):
+    def create(self, key_string: str, key_value: Any, time_to_live_in_seconds: int = 0,
+               value_as_bytes: Optional[bytes] = None):
+        if not self.is_exists(key_string):
+            if self.sorted_keys is not None:
+                self.sorted_keys.add(key_string)
+            self.insertion_sequences[key_string] = self.next_insertion_sequence
+            self.keys_by_insertion_sequence[self.next_insertion_sequence] = key_string
+            self.scan_sequences.append(self.next_insertion_sequence)
+            self.next_insertion_sequence += 1
         self.keys_and_values[key_string] = key_value
-        time_to_live = get_timestamp(add_seconds(datetime.now())) if time_to_live_in_seconds > 0 else 0
-        if time_to_live > 0:
-            self.keys_and_ttls[key_string] = time_to_live
-            self.heap.push((time_to_live, key_string))
+        if time_to_live_in_seconds > 0:
+            self.expiry_queue.schedule(key_string, get_expiry_timestamp(time_to_live_in_seconds))
+
+    def create_many(self, keys_values_and_ttls: List[Tuple[str, Any, int, Optional[bytes]]]) -> Dict[str, bool]:
+        results = {}
+        for key_string, key_value, time_to_live_in_seconds, _ in keys_values_and_ttls:
+            results[key_string] = not self.is_exists(key_string)
+            if results[key_string]:
+                self.create(key_string, key_value, time_to_live_in_seconds)
+        return results
 
     def get(self, key_string: str):
         if self.is_exists(key_string):
-            if key_string in self.keys_and_ttls and is_passed(self.keys_and_ttls[key_string]):
+            time_to_live = self.expiry_queue.get_expiry(key_string)
+            if time_to_live is not None and is_passed(time_to_live):
                 self.delete(key_string)
                 raise StoreException(f"Attempt to retrieve expired key {key_string}")
 
             return self.keys_and_values[key_string]
 
+    def get_many(self, key_strings: List[str]) -> Dict[str, Any]:
+        keys_and_values = {}
+        for key_string in key_strings:
+            if self.is_exists(key_string):
+                try:
+                    keys_and_values[key_string] = self.get(key_string)
+                except StoreException as exception:
+                    keys_and_values[key_string] = exception
+        return keys_and_values
+
+    def read_raw(self, key_string: str) -> memoryview:
+        return memoryview(self.codec.encode(self.get(key_string)))
+
     def delete(self, key_string: str):
         if self.is_exists(key_string):
             self.keys_and_values.pop(key_string)
-        if key_string in self.keys_and_ttls:
-            self.keys_and_ttls.pop(key_string)
+            if self.sorted_keys is not None:
+                self.sorted_keys.remove(key_string)
+            self.keys_by_insertion_sequence.pop(self.insertion_sequences.pop(key_string))
+            if len(self.scan_sequences) > 2 * len(self.keys_by_insertion_sequence) + 64:
+                self.scan_sequences = list(self.keys_by_insertion_sequence)
+        self.expiry_queue.cancel(key_string)
+
+    def delete_many(self, key_strings: List[str]) -> Dict[str, bool]:
+        results = {}
+        for key_string in key_strings:
+            results[key_string] = self.is_exists(key_string)
+            self.delete(key_string)
+        return results
 
     def get_all_keys_and_values(self):
-        return self.keys_and_values
+        return dict(self.keys_and_values)
+
+    def scan(self, cursor: int = 0, count: int = 100, match: Optional[str] = None, keys_only: bool = False) -> ScanBatch:
+        # The cursor is the insertion sequence to resume from, keys deleted between batches leave later keys in place.
+        scan_sequences = self.scan_sequences
+        key_strings = []
+        position = bisect_left(scan_sequences, cursor)
+        while position < len(scan_sequences) and len(key_strings) < count:
+            key_string = self.keys_by_insertion_sequence.get(scan_sequences[position])
+            if key_string is not None:
+                key_strings.append(key_string)
+            position += 1
+
+        next_cursor = scan_sequences[position] if position < len(scan_sequences) else 0
+        keys_and_values = []
+        for key_string in key_strings:
+            time_to_live = self.expiry_queue.get_expiry(key_string)
+            if (time_to_live is not None and is_passed(time_to_live)) or not is_key_matching(key_string, match):
+                continue
+            if keys_only:
+                keys_and_values.append(key_string)
+                continue
+            try:
+                keys_and_values.append((key_string, self.keys_and_values[key_string]))
+            except KeyError:
+                continue
+        return next_cursor, keys_and_values
+
+    def get_range(self, start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None,
+                  keys_only: bool = False) -> List[Any]:
+        if self.sorted_keys is not None:
+            key_strings = self.sorted_keys.irange(start, end)
+        else:
+            key_strings = iter(sorted(key_string for key_string in self.keys_and_values
+                                      if is_key_in_range(key_string, start, end)))
+        return self.read_ordered(key_strings, limit, keys_only)
+
+    def get_prefix(self, prefix: str, limit: Optional[int] = None, keys_only: bool = False) -> List[Any]:
+        if self.sorted_keys is not None:
+            key_strings = self.sorted_keys.iprefix(prefix)
+        else:
+            key_strings = iter(sorted(key_string for key_string in self.keys_and_values
+                                      if key_string.startswith(prefix)))
+        return self.read_ordered(key_strings, limit, keys_only)
+
+    def read_ordered(self, key_strings: Iterator[str], limit: Optional[int], keys_only: bool) -> List[Any]:
+        results = []
+        for key_string in key_strings:
+            if limit is not None and len(results) >= limit:
+                break
+
+            time_to_live = self.expiry_queue.get_expiry(key_string)
+            if time_to_live is not None and is_passed(time_to_live):
+                continue
+            results.append(key_string if keys_only else (key_string, self.keys_and_values[key_string]))
+        return results
+
+    def stats(self) -> Dict[str, float]:
+        return {"record_count": len(self.keys_and_values)}
 
     def expire_keys(self):
         while not self.stop_event.is_set():
-            while not self.heap.is_empty():
-                ttl_in_seconds, key_string = self.heap.peek()
-                if is_passed(ttl_in_seconds):
-                    self.delete(key_string)
-                    self.heap.pop()
-                else:
-                    break
-            for _ in range(0, self.background_jobs_frequency_in_seconds):
-                if self.stop_event.is_set():
-                    break
-                sleep(1)
+            self.expire_cycle()
+            self.stop_event.wait(self.active_expiry.next_interval_in_seconds())
+
+    def expire_cycle(self) -> int:
+        return self.active_expiry.run_cycle()
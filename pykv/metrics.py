@@ -0,0 +1,111 @@
+import functools
+import threading
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional
+
+OperationHook = Callable[[str, float, Optional[BaseException]], None]  # operation, elapsed seconds, raised exception
+
+PERCENTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+
+
+class LatencyHistogram:
+    def __init__(self, precision_bits: int = 4):
+        # Log-linear buckets in the style of HDR histograms: every power of two is split into
+        # 2 ** (precision_bits - 1) linear sub buckets, so any recorded value is off by at most 1 / 2 ** precision_bits.
+        self.precision_bits = precision_bits
+        self.sub_buckets = 1 << (precision_bits - 1)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.minimum = 0
+        self.maximum = 0
+
+    def get_bucket(self, value: int) -> int:
+        shift = value.bit_length() - self.precision_bits
+        if shift <= 0:
+            return value
+        return shift * self.sub_buckets + (value >> shift)
+
+    def get_bucket_upper_bound(self, bucket: int) -> int:
+        if bucket < 2 * self.sub_buckets:
+            return bucket
+        shift = bucket // self.sub_buckets - 1
+        return ((bucket - shift * self.sub_buckets + 1) << shift) - 1
+
+    def record(self, value: int):
+        bucket = self.get_bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.minimum = value if self.count == 0 else min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.count += 1
+        self.total += value
+
+    def get_percentile(self, fraction: float) -> int:
+        if self.count == 0:
+            return 0
+
+        rank = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self.get_bucket_upper_bound(bucket), self.maximum)
+        return self.maximum
+
+
+class StoreMetrics:
+    def __init__(self, hooks: Optional[List[OperationHook]] = None):
+        self.hooks: List[OperationHook] = list(hooks or [])
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def add_hook(self, hook: OperationHook):
+        self.hooks.append(hook)
+
+    def record(self, operation: str, elapsed_in_nanoseconds: int, exception: Optional[BaseException] = None):
+        with self.lock:
+            histogram = self.histograms.get(operation)
+            if histogram is None:
+                histogram = self.histograms[operation] = LatencyHistogram()
+            histogram.record(elapsed_in_nanoseconds)
+            if exception is not None:
+                self.errors[operation] = self.errors.get(operation, 0) + 1
+
+        for hook in self.hooks:
+            hook(operation, elapsed_in_nanoseconds / 1e9, exception)
+
+    def timed(self, operation: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            started_at = perf_counter_ns()
+            try:
+                result = method(*args, **kwargs)
+            except BaseException as exception:
+                self.record(operation, perf_counter_ns() - started_at, exception)
+                raise
+            self.record(operation, perf_counter_ns() - started_at)
+            return result
+        return wrapper
+
+    def instrument(self, target: Any, operations: Dict[str, str]):
+        # The timed wrappers shadow the methods on this one instance only; stores opened without metrics keep calling
+        # the plain class methods, so disabled metrics cost nothing.
+        for method_name, operation in operations.items():
+            setattr(target, method_name, self.timed(operation, getattr(target, method_name)))
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            operations = {}
+            for operation, histogram in sorted(self.histograms.items()):
+                operation_stats = {
+                    "count": histogram.count,
+                    "errors": self.errors.get(operation, 0),
+                    "mean_in_microseconds": histogram.total / histogram.count / 1000,
+                    "min_in_microseconds": histogram.minimum / 1000,
+                    "max_in_microseconds": histogram.maximum / 1000
+                }
+                for name, fraction in PERCENTILES:
+                    operation_stats[f"{name}_in_microseconds"] = histogram.get_percentile(fraction) / 1000
+                operations[operation] = operation_stats
+            return operations
@@ -0,0 +1,93 @@
+import json
+import socket
+import struct
+from typing import Any, List, Tuple
+
+from pykv.main import KeyNotFoundException, KeyAlreadyExistsException, ExpiredKeyException, InvalidKeyException, \
+    InvalidValueException, StoreSizeLimitException, ReadOnlyStoreException, WriterStalledException
+
+FRAME_HEADER = struct.Struct(">I")
+MAXIMUM_FRAME_SIZE_IN_BYTES = 64 * 1024 * 1024
+
+BATCH_COMMAND = "batch"
+COMMANDS = ("read", "write", "delete", "read_many", "write_many", "delete_many", "get_all", "scan", "range", "prefix",
+            "compact", "flush", "cache_stats", "expiry_stats", "durability_stats", "stats")
+MANY_COMMANDS = ("read_many", "write_many", "delete_many")
+
+ERROR_KEY = "__pykv_error__"
+KNOWN_EXCEPTIONS = {exception_class.__name__: exception_class
+                    for exception_class in (KeyNotFoundException, KeyAlreadyExistsException, ExpiredKeyException,
+                                            InvalidKeyException, InvalidValueException, StoreSizeLimitException,
+                                            ReadOnlyStoreException, WriterStalledException)}
+
+Command = Tuple[str, list]
+
+
+class ProtocolException(Exception):
+    pass
+
+
+class RemoteException(Exception):
+    pass
+
+
+def encode_frame(message: Any) -> bytes:
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def decode_payload(payload: bytes) -> Any:
+    return json.loads(payload)
+
+
+def get_payload_size(header: bytes) -> int:
+    payload_size, = FRAME_HEADER.unpack(header)
+    if payload_size > MAXIMUM_FRAME_SIZE_IN_BYTES:
+        raise ProtocolException(f"Frame of {payload_size} bytes exceeds the limit of "
+                                f"{MAXIMUM_FRAME_SIZE_IN_BYTES} bytes")
+    return payload_size
+
+
+def receive_exactly(connection: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = connection.recv(size - len(buffer))
+        if not chunk:
+            raise ProtocolException("Connection closed by server")
+        buffer += chunk
+    return bytes(buffer)
+
+
+def receive_frame(connection: socket.socket) -> Any:
+    payload_size = get_payload_size(receive_exactly(connection, FRAME_HEADER.size))
+    return decode_payload(receive_exactly(connection, payload_size))
+
+
+def encode_error(exception: Exception) -> dict:
+    return {ERROR_KEY: type(exception).__name__, "message": str(exception)}
+
+
+def decode_error(error: dict) -> Exception:
+    exception_class = KNOWN_EXCEPTIONS.get(error[ERROR_KEY], RemoteException)
+    return exception_class(error["message"])
+
+
+def encode_response(command_name: str, result: Any) -> list:
+    if command_name in MANY_COMMANDS:
+        result = {key_string: encode_error(value) if isinstance(value, Exception) else value
+                  for key_string, value in result.items()}
+    return [True, result]
+
+
+def decode_response(command_name: str, response: list) -> Any:
+    is_success, result = response
+    if not is_success:
+        return decode_error(result)
+    if command_name in MANY_COMMANDS:
+        result = {key_string: decode_error(value) if isinstance(value, dict) and ERROR_KEY in value else value
+                  for key_string, value in result.items()}
+    return result
+
+
+def encode_batch(commands: List[Command]) -> bytes:
+    return encode_frame([BATCH_COMMAND, [[command_name, args] for command_name, args in commands]])
@@ -0,0 +1,221 @@
+import mmap
+import os
+from time import monotonic, sleep
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from pykv.codecs import ValueCodec, get_codec, get_codec_by_id
+from pykv.record import RecordManager, create_record_manager, get_format_version
+from pykv.shared_index import SharedIndexReader
+from pykv.store import StoreException, StoreGetException, Store, ScanBatch
+from pykv.utils import is_passed, is_key_matching, is_key_in_range
+
+
+class StoreReadOnlyException(StoreException):
+    pass
+
+
+class StoreWriterStalledException(StoreException):
+    pass
+
+
+class ReadOnlyFileStore(Store):
+    def __init__(self, file_path: str, maximum_write_wait_in_seconds: float = 5.0,
+                 value_codec: Union[str, ValueCodec, None] = None):
+        self.file_path = file_path
+        self.maximum_write_wait_in_seconds = maximum_write_wait_in_seconds
+        self.index_file_path = file_path + ".index"
+        self.starting_offset = 10
+        self.value_cache = None
+
+        if not os.path.exists(self.index_file_path):
+            raise StoreException(f"No shared index is published for {file_path}, "
+                                 f"open the writer with shared_index=True first")
+        self.shared_index = SharedIndexReader(self.index_file_path)
+        self.file_pointer = self.map_data_file()
+        format_version = get_format_version(self.file_pointer)
+        if format_version is None:
+            raise StoreException("Existing data file is not valid, failed to load")
+        self.block_size_in_bytes = RecordManager.get_slot_size(self.file_pointer)
+        self.record_manager = create_record_manager(self.block_size_in_bytes, format_version)
+        self.codec = get_codec_by_id(self.record_manager.get_codec_id(self.file_pointer),
+                                     None if value_codec is None else get_codec(value_codec))
+
+        super().__init__(lambda: None, 0)
+
+    def map_data_file(self) -> mmap.mmap:
+        with open(self.file_path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read_consistent(self, read: Callable[[], Any]) -> Any:
+        # Seqlock read: retry while the writer is inside a write section or finished one during the read. A sequence
+        # that stays odd for too long means the writer died inside a write section, so the reader gives up.
+        odd_sequence, odd_since = None, 0.0
+        while True:
+            if self.shared_index.is_retired():
+                self.shared_index.reopen()
+            sequence = self.shared_index.read_sequence()
+            if sequence % 2 == 1:
+                if sequence != odd_sequence:
+                    odd_sequence, odd_since = sequence, monotonic()
+                elif monotonic() - odd_since > self.maximum_write_wait_in_seconds:
+                    raise StoreWriterStalledException(f"Writer of {self.file_path} has not finished a write for "
+                                                      f"{self.maximum_write_wait_in_seconds} seconds")
+                sleep(0)
+                continue
+            if self.shared_index.get_data_size() > len(self.file_pointer):
+                self.file_pointer = self.map_data_file()
+
+            try:
+                result, failure = read(), None
+            except Exception as exception:
+                result, failure = None, exception
+
+            if self.shared_index.read_sequence() == sequence and not self.shared_index.is_retired():
+                if failure is not None:
+                    raise failure
+                return result
+
+    def find_record_offset(self, key_as_bytes: bytes) -> Optional[int]:
+        for slot in self.shared_index.find_slots(key_as_bytes):
+            record_offset = self.starting_offset + (slot * self.block_size_in_bytes)
+            if record_offset >= len(self.file_pointer) or \
+                    not self.record_manager.is_available(self.file_pointer, record_offset):
+                continue
+            _, _, _, key_len, _ = self.record_manager.read_header(self.file_pointer, record_offset)
+            if self.record_manager.read_key(self.file_pointer, record_offset, key_len) == key_as_bytes:
+                return record_offset
+        return None
+
+    def read_record(self, key_string: str) -> Optional[Tuple[int, bytes]]:
+        def read():
+            record_offset = self.find_record_offset(str.encode(key_string))
+            if record_offset is None:
+                return None
+            _, _, ttl_in_seconds, _, _, _, value_as_bytes = self.record_manager.read(self.file_pointer, record_offset)
+            return ttl_in_seconds, value_as_bytes
+
+        return self.read_consistent(read)
+
+    def is_exists(self, key_string: str) -> bool:
+        return self.read_consistent(lambda: self.find_record_offset(str.encode(key_string)) is not None)
+
+    def get(self, key_string: str):
+        record = self.read_record(key_string)
+        if record is None:
+            return None
+
+        ttl_in_seconds, value_as_bytes = record
+        if ttl_in_seconds > 0 and is_passed(ttl_in_seconds):
+            raise StoreGetException(f"Attempt to retrieve expired key {key_string}")
+        return self.codec.decode(value_as_bytes)
+
+    def get_many(self, key_strings: List[str]) -> Dict[str, Any]:
+        keys_and_values = {}
+        for key_string in key_strings:
+            try:
+                value = self.get(key_string)
+            except StoreGetException as exception:
+                value = exception
+            if value is not None:
+                keys_and_values[key_string] = value
+        return keys_and_values
+
+    def read_raw(self, key_string: str) -> memoryview:
+        record = self.read_record(key_string)
+        if record is None:
+            return None
+
+        ttl_in_seconds, value_as_bytes = record
+        if ttl_in_seconds > 0 and is_passed(ttl_in_seconds):
+            raise StoreGetException(f"Attempt to retrieve expired key {key_string}")
+        # The writer may reuse the slots at any time, so readers get a copy rather than a view into the mapping.
+        return memoryview(value_as_bytes)
+
+    def get_all_keys_and_values(self) -> Dict[str, Any]:
+        def read():
+            records = []
+            for slot in self.shared_index.get_slots():
+                _, _, ttl_in_seconds, _, _, key_as_bytes, value_as_bytes = self.record_manager.read(
+                    self.file_pointer, self.starting_offset + (slot * self.block_size_in_bytes))
+                if not (ttl_in_seconds > 0 and is_passed(ttl_in_seconds)):
+                    records.append((key_as_bytes, value_as_bytes))
+            return records
+
+        return {key_as_bytes.decode("utf-8"): self.codec.decode(value_as_bytes)
+                for key_as_bytes, value_as_bytes in self.read_consistent(read)}
+
+    def scan(self, cursor: int = 0, count: int = 100, match: Optional[str] = None, keys_only: bool = False) -> ScanBatch:
+        # The cursor is a bucket of the shared index; a rebuild of the index by the writer reorders the buckets.
+        def read():
+            records = []
+            for slot in self.shared_index.get_slots(cursor, cursor + count):
+                _, _, ttl_in_seconds, _, _, key_as_bytes, value_as_bytes = self.record_manager.read(
+                    self.file_pointer, self.starting_offset + (slot * self.block_size_in_bytes))
+                key_string = key_as_bytes.decode("utf-8")
+                if not (ttl_in_seconds > 0 and is_passed(ttl_in_seconds)) and is_key_matching(key_string, match):
+                    records.append((key_string, value_as_bytes))
+            return records, cursor + count if cursor + count < self.shared_index.capacity else 0
+
+        records, next_cursor = self.read_consistent(read)
+        if keys_only:
+            return next_cursor, [key_string for key_string, _ in records]
+        return next_cursor, [(key_string, self.codec.decode(value_as_bytes)) for key_string, value_as_bytes in records]
+
+    def get_range(self, start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None,
+                  keys_only: bool = False) -> List[Any]:
+        return self.read_ordered(lambda key_string: is_key_in_range(key_string, start, end), limit, keys_only)
+
+    def get_prefix(self, prefix: str, limit: Optional[int] = None, keys_only: bool = False) -> List[Any]:
+        return self.read_ordered(lambda key_string: key_string.startswith(prefix), limit, keys_only)
+
+    def read_ordered(self, is_selected: Callable[[str], bool], limit: Optional[int], keys_only: bool) -> List[Any]:
+        # Readers have no ordered index of their own, so matching keys are collected from the shared index and sorted.
+        def read():
+            records = []
+            for slot in self.shared_index.get_slots():
+                record_offset = self.starting_offset + (slot * self.block_size_in_bytes)
+                _, _, ttl_in_seconds, key_len, _ = self.record_manager.read_header(self.file_pointer, record_offset)
+                key_string = self.record_manager.read_key(self.file_pointer, record_offset, key_len).decode("utf-8")
+                if is_selected(key_string) and not (ttl_in_seconds > 0 and is_passed(ttl_in_seconds)):
+                    records.append((key_string, slot))
+            records.sort()
+            records = records[:limit]
+            if keys_only:
+                return records
+            return [(key_string, self.record_manager.read(
+                self.file_pointer, self.starting_offset + (slot * self.block_size_in_bytes))[6])
+                    for key_string, slot in records]
+
+        records = self.read_consistent(read)
+        if keys_only:
+            return [key_string for key_string, _ in records]
+        return [(key_string, self.codec.decode(value_as_bytes)) for key_string, value_as_bytes in records]
+
+    def stats(self) -> Dict[str, float]:
+        return {"file_size_in_bytes": len(self.file_pointer)}
+
+    def raise_read_only(self):
+        raise StoreReadOnlyException(f"Store {self.file_path} is opened read only")
+
+    def create(self, key_string: str, key_value: Any, time_to_live_in_seconds: int = 0,
+               value_as_bytes: Optional[bytes] = None):
+        self.raise_read_only()
+
+    def create_many(self, keys_values_and_ttls: List[Tuple[str, Any, int, Optional[bytes]]]) -> Dict[str, bool]:
+        self.raise_read_only()
+
+    def delete(self, key_string: str):
+        self.raise_read_only()
+
+    def delete_many(self, key_strings: List[str]) -> Dict[str, bool]:
+        self.raise_read_only()
+
+    def compact(self, max_records_to_move: Optional[int] = None) -> int:
+        self.raise_read_only()
+
+    def write_hint_file(self):
+        pass
+
+    def close(self):
+        self.shared_index.close()
+        self.file_pointer.close()
@@ -1,11 +1,14 @@
 import functools
 import math
 import os
+import struct
 import threading
 from mmap import mmap
 from typing import Tuple, Any, Optional
 
-TYPE_FLAG = int  # 1 byte , 0 - deleted/Empty/available to store , 1 - Primary, 2 - Sub slot
+from pykv.compression import decompress
+
+TYPE_FLAG = int  # 1 byte , 0 - deleted/Empty/available to store , 1 - Primary, 2 - Sub slot, 3 - Compressed primary
 SLOTS_COUNT = int  # 1 byte , length of slots for this record, applicable only for primary slot
 TIME_TO_LIVE = int  # 4 byte, UNIX Epoch timestamp
 KEY_LEN = int  # 1 byte , length of key byte string
@@ -14,6 +17,58 @@ KEY_BYTES = bytes
 VALUE_BYTES = bytes
 
 Record = Tuple[TYPE_FLAG, SLOTS_COUNT, TIME_TO_LIVE, KEY_LEN, VAL_LEN, KEY_BYTES, VALUE_BYTES]
+RecordHeader = Tuple[TYPE_FLAG, SLOTS_COUNT, TIME_TO_LIVE, KEY_LEN, VAL_LEN]
+
+EMPTY_SLOT = 0
+PRIMARY_SLOT = 1
+SUB_SLOT = 2
+COMPRESSED_PRIMARY_SLOT = 3
+
+RECORD_HEADER = struct.Struct(">BBIBH")
+# Format 2 widens the lengths to type 1 byte, slots count 4 bytes, time to live 4 bytes, key length 2 bytes and
+# value length 4 bytes, and keeps the key and value contiguous behind a single header.
+RECORD_HEADER_V2 = struct.Struct(">BIIHI")
+RECORD_COUNT = struct.Struct(">I")
+
+CODEC_ID_OFFSET = 5
+SLOT_SIZE_SHIFT_OFFSET = 6
+HINT_GENERATION_OFFSET = 7
+HINT_GENERATION_LENGTH = 3
+
+DEFAULT_SLOT_SIZE_IN_BYTES = 512
+MINIMUM_SLOT_SIZE_IN_BYTES = 64
+MAXIMUM_SLOT_SIZE_IN_BYTES = 65536
+
+FORMAT_V1 = 1
+FORMAT_V2 = 2
+MAGIC_NUMBERS = {FORMAT_V1: 99, FORMAT_V2: 100}
+
+
+def is_primary_slot(type_flag: TYPE_FLAG) -> bool:
+    return type_flag == PRIMARY_SLOT or type_flag == COMPRESSED_PRIMARY_SLOT
+
+
+def validate_slot_size(slot_size_in_bytes: int):
+    if not MINIMUM_SLOT_SIZE_IN_BYTES <= slot_size_in_bytes <= MAXIMUM_SLOT_SIZE_IN_BYTES or \
+            slot_size_in_bytes & (slot_size_in_bytes - 1):
+        raise ValueError(f"Slot size should be a power of two between {MINIMUM_SLOT_SIZE_IN_BYTES} "
+                         f"and {MAXIMUM_SLOT_SIZE_IN_BYTES} bytes")
+
+
+def get_format_version(file_pointer) -> Optional[int]:
+    for format_version, magic_number in MAGIC_NUMBERS.items():
+        if file_pointer[0] == magic_number:
+            return format_version
+    return None
+
+
+def create_record_manager(slot_size_in_bytes: int = DEFAULT_SLOT_SIZE_IN_BYTES,
+                          format_version: int = FORMAT_V1) -> "RecordManager":
+    if format_version not in MAGIC_NUMBERS:
+        raise ValueError(f"Unknown record format {format_version}, expected one of "
+                         f"{', '.join(str(version) for version in MAGIC_NUMBERS)}")
+    record_manager_class = RecordManagerV2 if format_version == FORMAT_V2 else RecordManager
+    return record_manager_class(slot_size_in_bytes)
 
 
 def extend_file(bytes_to_append: int, file_path: str):
@@ -31,208 +86,218 @@ def thread_safe(func):
 
 
 class RecordManager:
-
-    def __init__(self):
-        self.slot_size_in_bytes = 512
-        self.magic_number = 99
-        self.metadata_bytes_length_in_a_slot = 9
+    format_version = FORMAT_V1
+    record_header = RECORD_HEADER
+
+    def __init__(self, slot_size_in_bytes: int = DEFAULT_SLOT_SIZE_IN_BYTES):
+        validate_slot_size(slot_size_in_bytes)
+        self.slot_size_in_bytes = slot_size_in_bytes
+        self.magic_number = MAGIC_NUMBERS[self.format_version]
+        self.metadata_bytes_length_in_a_slot = self.record_header.size
         self.usable_bytes_in_a_slot = self.slot_size_in_bytes - self.metadata_bytes_length_in_a_slot
-        self.file_lock = threading.Lock()
+        self.maximum_slots_count = 255
+        # The key has to fit in the first slot, and its length in the one byte KEY_LEN.
+        self.maximum_key_length_in_bytes = min(self.slot_size_in_bytes - 5, 255)
+        self.maximum_value_length_in_bytes = 0xFFFF
+        self.file_lock = threading.RLock()
 
     @thread_safe
     def write_magic_bytes(self, file_pointer):
-        file_pointer.seek(0)
-        file_pointer.write(self.magic_number.to_bytes(1))
+        file_pointer[0] = self.magic_number
 
-    @thread_safe
     def is_magic_bytes_exists(self, file_pointer):
-        file_pointer.seek(0)
-        value = int.from_bytes(file_pointer.read(1))
-        return self.magic_number == value
+        return self.magic_number == file_pointer[0]
 
     @staticmethod
     def set_record_count(file_pointer, value):
-        file_pointer.seek(1)
-        file_pointer.write(value.to_bytes(4, 'big'))
+        RECORD_COUNT.pack_into(file_pointer, 1, value)
 
     @staticmethod
     def get_record_count(file_pointer):
-        file_pointer.seek(1)
-        record_count = int.from_bytes(file_pointer.read(4), 'big')
+        record_count, = RECORD_COUNT.unpack_from(file_pointer, 1)
         return record_count
 
+    @staticmethod
+    def set_codec_id(file_pointer, value):
+        file_pointer[CODEC_ID_OFFSET] = value
+
+    @staticmethod
+    def get_codec_id(file_pointer):
+        return file_pointer[CODEC_ID_OFFSET]
+
+    @staticmethod
+    def set_slot_size(file_pointer, slot_size_in_bytes):
+        # Files written before slot sizes were configurable have a zero here and use 512-byte slots.
+        file_pointer[SLOT_SIZE_SHIFT_OFFSET] = 0 if slot_size_in_bytes == DEFAULT_SLOT_SIZE_IN_BYTES \
+            else slot_size_in_bytes.bit_length() - 1
+
+    @staticmethod
+    def get_slot_size(file_pointer) -> int:
+        slot_size_shift = file_pointer[SLOT_SIZE_SHIFT_OFFSET]
+        return DEFAULT_SLOT_SIZE_IN_BYTES if slot_size_shift == 0 else 1 << slot_size_shift
+
+    @staticmethod
+    def set_hint_generation(file_pointer, value):
+        file_pointer[HINT_GENERATION_OFFSET:HINT_GENERATION_OFFSET + HINT_GENERATION_LENGTH] = \
+            value.to_bytes(HINT_GENERATION_LENGTH, 'big')
+
+    @staticmethod
+    def get_hint_generation(file_pointer):
+        return int.from_bytes(file_pointer[HINT_GENERATION_OFFSET:HINT_GENERATION_OFFSET + HINT_GENERATION_LENGTH],
+                              'big')
+
     @thread_safe
     def write(self,
               file_pointer,
               offset: int,
               key_as_bytes: bytes,
               value_as_bytes: bytes,
-              ttl_in_seconds: int = 0) -> SLOTS_COUNT:
+              ttl_in_seconds: int = 0,
+              is_compressed: bool = False) -> SLOTS_COUNT:
 
         key_len: int = len(key_as_bytes)
         value_len: int = len(value_as_bytes)
 
-        usable_bytes_in_a_record = self.slot_size_in_bytes - 5
-
         slots_count = self.get_slots_needed(key_len, value_len)
 
-        file_pointer.seek(offset)
-        file_pointer.write((1).to_bytes(1))
-
-        offset += 1
-
-        file_pointer.seek(offset)
-        file_pointer.write(slots_count.to_bytes(1))
-
-        offset += 1
-
-        file_pointer.seek(offset)
-        file_pointer.write(ttl_in_seconds.to_bytes(4))
-
-        offset += 4
-
-        file_pointer.seek(offset)
-        file_pointer.write(key_len.to_bytes(1))
-
-        offset += 1
+        RECORD_HEADER.pack_into(file_pointer, offset, COMPRESSED_PRIMARY_SLOT if is_compressed else PRIMARY_SLOT,
+                                slots_count, ttl_in_seconds, key_len, value_len)
 
-        file_pointer.seek(offset)
-        file_pointer.write(value_len.to_bytes(2, byteorder='big'))
-
-        offset += 2
-        file_pointer.seek(offset)
-        file_pointer.write(key_as_bytes)
-
-        offset += key_len
-
-        byte_array = list(value_as_bytes)
-
-        available_bytes_in_current_record = usable_bytes_in_a_record - key_len
-        remaining_bytes_to_write = value_len
+        key_pointer = offset + self.metadata_bytes_length_in_a_slot
+        file_pointer[key_pointer:key_pointer + key_len] = key_as_bytes
 
+        value_view = memoryview(value_as_bytes)
         starts_at = 0
-        while True:
-
-            bytes_to_write = bytes(byte_array[starts_at:starts_at + available_bytes_in_current_record])
-            file_pointer.seek(offset)
-            file_pointer.write(bytes_to_write)
-            remaining_bytes_to_write = remaining_bytes_to_write - available_bytes_in_current_record
-
-            starts_at = starts_at + available_bytes_in_current_record
-
-            if remaining_bytes_to_write <= 0:
-                break
-
-            offset += available_bytes_in_current_record
-            offset += 1
-
-            file_pointer.seek(offset)
-            file_pointer.write((2).to_bytes(1))
-
-            available_bytes_in_current_record = usable_bytes_in_a_record
-
-            offset += 8
+        for segment_offset, segment_length in self.get_value_segments(offset, key_len, value_len):
+            if starts_at > 0:
+                file_pointer[segment_offset - self.metadata_bytes_length_in_a_slot + 1] = SUB_SLOT
+            file_pointer[segment_offset:segment_offset + segment_length] = value_view[starts_at:starts_at + segment_length]
+            starts_at += segment_length
 
         return slots_count
 
-    @thread_safe
     def read(self,
              file_pointer,
              record_offset: int) -> Record:
 
-        slot_count_pointer = record_offset + 1
-        ttl_pointer = record_offset + 2
-        key_len_pointer = record_offset + 6
-        value_len_pointer = record_offset + 7
-        key_value_bytes_starts_at = 9
+        type_flag, slots_count, ttl_seconds, key_len, val_len = self.record_header.unpack_from(file_pointer,
+                                                                                                record_offset)
 
-        file_pointer.seek(record_offset)
-        type_flag = int.from_bytes(file_pointer.read(1))
+        key_pointer = record_offset + self.metadata_bytes_length_in_a_slot
+        key_as_bytes = file_pointer[key_pointer:key_pointer + key_len]
 
-        file_pointer.seek(slot_count_pointer)
-        slots_count = int.from_bytes(file_pointer.read(1))
+        segments = self.get_value_segments(record_offset, key_len, val_len)
+        if len(segments) == 1:
+            segment_offset, segment_length = segments[0]
+            value_as_bytes = file_pointer[segment_offset:segment_offset + segment_length]
+        else:
+            value_as_bytes = b"".join([file_pointer[segment_offset:segment_offset + segment_length]
+                                       for segment_offset, segment_length in segments])
 
-        file_pointer.seek(ttl_pointer)
-        ttl_seconds = int.from_bytes(file_pointer.read(4), 'big')
+        # Value lengths in the header are stored lengths, callers always get the decompressed value.
+        if type_flag == COMPRESSED_PRIMARY_SLOT:
+            value_as_bytes = decompress(value_as_bytes)
 
-        file_pointer.seek(key_len_pointer)
-        key_len_in_bytes = file_pointer.read(1)
+        return (type_flag,
+                slots_count,
+                ttl_seconds,
+                key_len,
+                val_len,
+                key_as_bytes,
+                value_as_bytes)
 
-        file_pointer.seek(value_len_pointer)
-        val_len_in_bytes = file_pointer.read(2)
+    def read_header(self,
+                    file_pointer,
+                    record_offset: int) -> RecordHeader:
+        return self.record_header.unpack_from(file_pointer, record_offset)
 
-        key_len = int.from_bytes(key_len_in_bytes, 'big')
-        val_len = int.from_bytes(val_len_in_bytes, 'big')
+    def read_key(self,
+                 file_pointer,
+                 record_offset: int,
+                 key_len: int) -> KEY_BYTES:
+        key_pointer = record_offset + self.metadata_bytes_length_in_a_slot
+        return file_pointer[key_pointer:key_pointer + key_len]
 
-        key_pointer: int = record_offset + key_value_bytes_starts_at
-        value_pointer: int = record_offset + key_value_bytes_starts_at + key_len
+    def is_available(self,
+                     file_pointer,
+                     record_offset: int):
+        return is_primary_slot(file_pointer[record_offset])
 
-        file_pointer.seek(key_pointer)
-        key_as_bytes = file_pointer.read(key_len)
+    @thread_safe
+    def delete(self,
+               file_pointer: mmap,
+               record_offset: int):
 
-        value_as_byte_list = []
+        _, slots_count, _, _, _ = self.read_header(file_pointer, record_offset)
+
+        for offset in range(record_offset,
+                            record_offset + slots_count * self.slot_size_in_bytes,
+                            self.slot_size_in_bytes):
+            file_pointer[offset] = EMPTY_SLOT
+
+        return slots_count
 
+    def get_value_segments(self, record_offset: int, key_len: int, value_len: int):
+        # Value bytes continue past the slot boundary: every chunk after the first
+        # is preceded by a 9-byte sub slot header, of which only the type flag (its second byte) is written.
         usable_bytes_in_a_record = self.slot_size_in_bytes - 5
         available_bytes_in_current_record = usable_bytes_in_a_record - key_len
-        offset = value_pointer
-        bytes_to_read = min(val_len, available_bytes_in_current_record)
-        remaining_to_read = val_len
+        offset = record_offset + self.metadata_bytes_length_in_a_slot + key_len
+        remaining_bytes = value_len
 
+        segments = []
         while True:
+            segments.append((offset, min(remaining_bytes, available_bytes_in_current_record)))
+            remaining_bytes -= available_bytes_in_current_record
 
-            file_pointer.seek(offset)
-            bytes_read = file_pointer.read(bytes_to_read)
-            value_as_byte_list.extend(list(bytes_read))
-            remaining_to_read = remaining_to_read - bytes_to_read
+            if remaining_bytes <= 0:
+                return segments
 
-            if remaining_to_read <= 0:
-                break
-
-            offset += available_bytes_in_current_record
-            offset += self.metadata_bytes_length_in_a_slot
+            offset += available_bytes_in_current_record + self.metadata_bytes_length_in_a_slot
             available_bytes_in_current_record = usable_bytes_in_a_record
 
-            bytes_to_read = min(remaining_to_read,
-                                available_bytes_in_current_record)
+    def get_maximum_value_length(self, key_len: int) -> int:
+        return min(self.maximum_slots_count * self.usable_bytes_in_a_slot - key_len, self.maximum_value_length_in_bytes)
 
-        return (type_flag,
-                slots_count,
-                ttl_seconds,
-                key_len,
-                val_len,
-                key_as_bytes,
-                bytes(value_as_byte_list))
+    def get_slots_needed(self, key_len, value_len):
+        slots_count = math.ceil((key_len + value_len) * 1.0 / self.usable_bytes_in_a_slot)
+        return slots_count
 
-    @thread_safe
-    def is_available(self,
-                     file_pointer,
-                     record_offset: int):
 
-        file_pointer.seek(record_offset)
-        type_flag = int.from_bytes(file_pointer.read(1))
+class RecordManagerV2(RecordManager):
+    format_version = FORMAT_V2
+    record_header = RECORD_HEADER_V2
 
-        if type_flag == 1:
-            return True
-        return False
+    def __init__(self, slot_size_in_bytes: int = DEFAULT_SLOT_SIZE_IN_BYTES):
+        super().__init__(slot_size_in_bytes)
+        self.maximum_slots_count = 0xFFFFFFFF
+        self.maximum_key_length_in_bytes = 0xFFFF
+        self.maximum_value_length_in_bytes = 0xFFFFFFFF
 
     @thread_safe
-    def delete(self,
-               file_pointer: mmap,
-               record_offset: int):
+    def write(self,
+              file_pointer,
+              offset: int,
+              key_as_bytes: bytes,
+              value_as_bytes: bytes,
+              ttl_in_seconds: int = 0,
+              is_compressed: bool = False) -> SLOTS_COUNT:
+
+        key_len: int = len(key_as_bytes)
+        value_len: int = len(value_as_bytes)
+
+        slots_count = self.get_slots_needed(key_len, value_len)
 
-        slot_count_pointer = record_offset + 1
+        RECORD_HEADER_V2.pack_into(file_pointer, offset, COMPRESSED_PRIMARY_SLOT if is_compressed else PRIMARY_SLOT,
+                                   slots_count, ttl_in_seconds, key_len, value_len)
 
-        file_pointer.seek(slot_count_pointer)
-        slots_count = int.from_bytes(file_pointer.read(1))
+        key_pointer = offset + self.metadata_bytes_length_in_a_slot
+        file_pointer[key_pointer:key_pointer + key_len] = key_as_bytes
+        file_pointer[key_pointer + key_len:key_pointer + key_len + value_len] = value_as_bytes
+        return slots_count
 
-        index = 0
-        offset = record_offset
-        while index < slots_count:
-            file_pointer.seek(offset)
-            file_pointer.write((0).to_bytes(1))
-            offset += self.slot_size_in_bytes
-            index += 1
+    def get_value_segments(self, record_offset: int, key_len: int, value_len: int):
+        return [(record_offset + self.metadata_bytes_length_in_a_slot + key_len, value_len)]
 
     def get_slots_needed(self, key_len, value_len):
-        slots_count = math.ceil((key_len + value_len) * 1.0 / self.usable_bytes_in_a_slot)
-        return slots_count
+        return -(-(self.metadata_bytes_length_in_a_slot + key_len + value_len) // self.slot_size_in_bytes)
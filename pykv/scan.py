@@ -0,0 +1,109 @@
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from pykv.record import RecordManager, create_record_manager
+
+ScannedRecord = Tuple[bytes, int, int, int, Optional[bytes]]  # key bytes, slot, slots count, time to live, value bytes
+
+
+def scan_slot_range(file_pointer,
+                    record_manager: RecordManager,
+                    starting_offset: int,
+                    start_slot: int,
+                    end_slot: int,
+                    with_values: bool = False,
+                    follow_records: bool = True,
+                    limit: Optional[int] = None) -> List[ScannedRecord]:
+    records = []
+    slot = start_slot
+    block_size_in_bytes = record_manager.slot_size_in_bytes
+
+    while slot < end_slot and (limit is None or len(records) < limit):
+        record_offset = starting_offset + (slot * block_size_in_bytes)
+        if not record_manager.is_available(file_pointer, record_offset):
+            slot += 1
+            continue
+
+        if with_values:
+            _, slots_count, ttl_in_seconds, _, _, key_as_bytes, value_as_bytes = record_manager.read(
+                file_pointer, record_offset)
+        else:
+            _, slots_count, ttl_in_seconds, key_len, _ = record_manager.read_header(file_pointer, record_offset)
+            key_as_bytes = record_manager.read_key(file_pointer, record_offset, key_len)
+            value_as_bytes = None
+
+        records.append((key_as_bytes, slot, slots_count, ttl_in_seconds, value_as_bytes))
+        slot += slots_count if follow_records else 1
+
+    return records
+
+
+def merge_scanned_records(records: List[ScannedRecord], end_slot: int) -> List[ScannedRecord]:
+    # Ranges scanned independently may start inside a record, so every primary flag is reported and the
+    # ones falling inside an earlier record (or running past the end of the file) are dropped here.
+    merged = []
+    next_slot = 0
+    for record in sorted(records, key=lambda scanned_record: scanned_record[1]):
+        _, slot, slots_count, _, _ = record
+        if slot >= next_slot and slots_count > 0 and slot + slots_count <= end_slot:
+            merged.append(record)
+            next_slot = slot + slots_count
+    return merged
+
+
+def scan_file_range(file_path: str,
+                    starting_offset: int,
+                    slot_size_in_bytes: int,
+                    format_version: int,
+                    start_slot: int,
+                    end_slot: int) -> List[ScannedRecord]:
+    with open(file_path, "rb") as f:
+        file_pointer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return scan_slot_range(file_pointer=file_pointer,
+                               record_manager=create_record_manager(slot_size_in_bytes, format_version),
+                               starting_offset=starting_offset,
+                               start_slot=start_slot,
+                               end_slot=end_slot,
+                               follow_records=False)
+    finally:
+        file_pointer.close()
+
+
+def parallel_scan(file_path: str,
+                  starting_offset: int,
+                  slot_size_in_bytes: int,
+                  format_version: int,
+                  end_slot: int,
+                  workers: int,
+                  with_values: bool = False) -> List[ScannedRecord]:
+    ranges_count = workers * 4
+    range_size = max(1, -(-end_slot // ranges_count))
+    start_slots = list(range(0, end_slot, range_size))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        scanned_ranges = executor.map(scan_file_range,
+                                      [file_path] * len(start_slots),
+                                      [starting_offset] * len(start_slots),
+                                      [slot_size_in_bytes] * len(start_slots),
+                                      [format_version] * len(start_slots),
+                                      start_slots,
+                                      [min(start_slot + range_size, end_slot) for start_slot in start_slots])
+        records = [record for scanned_range in scanned_ranges for record in scanned_range]
+
+    records = merge_scanned_records(records, end_slot)
+    if not with_values:
+        return records
+
+    # Workers only read headers: a primary flag found inside a value is not a record, and reading a value for it
+    # could run far past the record or fail to decompress, so values are read once the real records are known.
+    record_manager = create_record_manager(slot_size_in_bytes, format_version)
+    with open(file_path, "rb") as f:
+        file_pointer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return [(key_as_bytes, slot, slots_count, ttl_in_seconds,
+                 record_manager.read(file_pointer, starting_offset + (slot * slot_size_in_bytes))[6])
+                for key_as_bytes, slot, slots_count, ttl_in_seconds, _ in records]
+    finally:
+        file_pointer.close()
@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import os
+import signal
+from typing import List, Optional
+
+from pykv.async_store import AsyncKeyValueStore
+from pykv.compression import CompressionPolicy
+from pykv.durability import DurabilityPolicy, DURABILITY_MODES
+from pykv.protocol import BATCH_COMMAND, COMMANDS, FRAME_HEADER, Command, ProtocolException, decode_payload, \
+    encode_error, encode_frame, encode_response, get_payload_size
+from pykv.record import FORMAT_V1, FORMAT_V2
+
+
+class KeyValueServer:
+    def __init__(self,
+                 async_store: AsyncKeyValueStore,
+                 host: str = "127.0.0.1",
+                 port: int = 7070,
+                 unix_socket_path: Optional[str] = None):
+        self.async_store = async_store
+        self.host = host
+        self.port = port
+        self.unix_socket_path = unix_socket_path
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self.async_store.start()
+        if self.unix_socket_path is not None:
+            if os.path.exists(self.unix_socket_path):
+                os.remove(self.unix_socket_path)
+            self.server = await asyncio.start_unix_server(self.handle_connection, path=self.unix_socket_path)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, host=self.host, port=self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.async_store.shutdown()
+        if self.unix_socket_path is not None and os.path.exists(self.unix_socket_path):
+            os.remove(self.unix_socket_path)
+
+    async def serve_forever(self):
+        await self.start()
+        stop_event = asyncio.Event()
+        for stop_signal in (signal.SIGINT, signal.SIGTERM):
+            asyncio.get_running_loop().add_signal_handler(stop_signal, stop_event.set)
+        await stop_event.wait()
+        await self.stop()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Requests are answered in the order they arrive, so clients may pipeline any number of frames.
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(FRAME_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                payload = await reader.readexactly(get_payload_size(header))
+                writer.write(encode_frame(await self.handle_request(payload)))
+                await writer.drain()
+        except (ConnectionError, ProtocolException, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, payload: bytes) -> list:
+        try:
+            command_name, args = decode_payload(payload)
+        except (ValueError, TypeError) as exception:
+            return [False, encode_error(ProtocolException(f"Malformed request: {exception}"))]
+
+        if command_name == BATCH_COMMAND:
+            commands = args
+        else:
+            commands = [(command_name, args)]
+
+        responses = await self.async_store.run_blocking(self.execute_commands, commands)
+        if command_name == BATCH_COMMAND:
+            return [True, responses]
+        return responses[0]
+
+    def execute_commands(self, commands: List[Command]) -> List[list]:
+        # A whole batch runs in one executor call, so it costs a single hop off the event loop.
+        return [self.execute_command(command) for command in commands]
+
+    def execute_command(self, command: Command) -> list:
+        try:
+            command_name, args = command
+            if command_name not in COMMANDS:
+                raise ProtocolException(f"Unknown command {command_name}")
+            return encode_response(command_name, getattr(self.async_store.kv_store, command_name)(*args))
+        except Exception as exception:
+            return [False, encode_error(exception)]
+
+
+def parse_arguments(arguments: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m pykv.server", description="Serve a pykv store over a socket")
+    parser.add_argument("--file-path", default="default_kv.bin")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7070)
+    parser.add_argument("--unix-socket", dest="unix_socket_path")
+    parser.add_argument("--mem-store-mode", action="store_true")
+    parser.add_argument("--background-jobs-frequency-in-seconds", type=int, default=10)
+    parser.add_argument("--cache-max-entries", type=int, default=0)
+    parser.add_argument("--cache-max-bytes", type=int, default=0)
+    parser.add_argument("--durability", choices=DURABILITY_MODES, default=DURABILITY_MODES[0])
+    parser.add_argument("--flush-interval-in-milliseconds", type=int, default=100)
+    parser.add_argument("--compression-minimum-size", type=int,
+                        help="compress values of at least this many bytes, compression is off when not given")
+    parser.add_argument("--format-version", type=int, choices=(FORMAT_V1, FORMAT_V2),
+                        help="record format of a new store file, 2 allows values beyond 64KB")
+    parser.add_argument("--maximum-key-length", type=int, default=32)
+    parser.add_argument("--maximum-value-size-in-bytes", type=int, default=16000)
+    parser.add_argument("--workers", type=int, default=4)
+    return parser.parse_args(arguments)
+
+
+def main(arguments: Optional[List[str]] = None):
+    options = parse_arguments(arguments)
+    async_store = AsyncKeyValueStore(
+        max_workers=options.workers,
+        file_path=options.file_path,
+        mem_store_mode=options.mem_store_mode,
+        background_jobs_frequency_in_seconds=options.background_jobs_frequency_in_seconds,
+        cache_max_entries=options.cache_max_entries,
+        cache_max_bytes=options.cache_max_bytes,
+        durability_policy=DurabilityPolicy(mode=options.durability,
+                                           flush_interval_in_milliseconds=options.flush_interval_in_milliseconds),
+        compression_policy=None if options.compression_minimum_size is None else
+        CompressionPolicy(minimum_size_in_bytes=options.compression_minimum_size),
+        format_version=options.format_version,
+        maximum_key_length=options.maximum_key_length,
+        maximum_value_size_in_bytes=options.maximum_value_size_in_bytes)
+    server = KeyValueServer(async_store,
+                            host=options.host,
+                            port=options.port,
+                            unix_socket_path=options.unix_socket_path)
+    asyncio.run(server.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+import heapq
+import multiprocessing
+import os
+import threading
+import zlib
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pykv.main import KeyValueStore
+from pykv.store import ScanBatch
+
+MAXIMUM_STAT_KEYS = ("lag_in_seconds", "maximum_lag_in_seconds", "last_cycle_duration_in_seconds",
+                     "next_interval_in_seconds")
+
+
+def get_shard_index(key_string: str, shard_count: int) -> int:
+    return zlib.crc32(str.encode(key_string)) % shard_count
+
+
+def get_shard_file_path(file_path: str, shard_index: int) -> str:
+    root, extension = os.path.splitext(file_path)
+    return f"{root}.shard{shard_index}{extension}"
+
+
+def merge_stats(shards_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    merged_stats = {}
+    for shard_stats in shards_stats:
+        for name, value in shard_stats.items():
+            if name not in merged_stats:
+                merged_stats[name] = value
+            elif name in MAXIMUM_STAT_KEYS:
+                merged_stats[name] = max(merged_stats[name], value)
+            else:
+                merged_stats[name] += value
+    return merged_stats
+
+
+def run_shard_process(connection, key_value_store_options: Dict[str, Any]):
+    kv_store = KeyValueStore(**key_value_store_options)
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+
+        method_name, args = request
+        try:
+            result = getattr(kv_store, method_name)(*args)
+            # Views into the shard's mapping can not leave the process, so raw values are copied out.
+            if isinstance(result, memoryview):
+                result = result.tobytes()
+            elif isinstance(result, list) and method_name == "read_raw":
+                result = b"".join(result)
+            connection.send((True, result))
+        except Exception as exception:
+            connection.send((False, exception))
+    connection.close()
+
+
+class LocalShard:
+    def __init__(self, key_value_store_options: Dict[str, Any]):
+        self.kv_store = KeyValueStore(**key_value_store_options)
+        self.pending_result = None
+
+    def call(self, method_name: str, *args):
+        return getattr(self.kv_store, method_name)(*args)
+
+    def send(self, method_name: str, *args):
+        try:
+            self.pending_result = True, self.call(method_name, *args)
+        except Exception as exception:
+            self.pending_result = False, exception
+
+    def receive(self):
+        (is_success, result), self.pending_result = self.pending_result, None
+        if not is_success:
+            raise result
+        return result
+
+    def acquire(self):
+        pass
+
+    def release(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class ProcessShard:
+    def __init__(self, key_value_store_options: Dict[str, Any]):
+        self.connection, worker_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=run_shard_process,
+                                               args=(worker_connection, key_value_store_options),
+                                               daemon=True)
+        self.process.start()
+        worker_connection.close()
+        self.lock = threading.Lock()
+
+    def call(self, method_name: str, *args):
+        with self.lock:
+            self.send(method_name, *args)
+            return self.receive()
+
+    def send(self, method_name: str, *args):
+        self.connection.send((method_name, args))
+
+    def receive(self):
+        is_success, result = self.connection.recv()
+        if not is_success:
+            raise result
+        return result
+
+    def acquire(self):
+        self.lock.acquire()
+
+    def release(self):
+        self.lock.release()
+
+    def stop(self):
+        with self.lock:
+            self.connection.send(None)
+            self.process.join()
+            self.connection.close()
+
+
+class ShardedKeyValueStore:
+
+    def __init__(self,
+                 shard_count: int = 4,
+                 file_path: Optional[str] = "default_kv.bin",
+                 use_processes: bool = False,
+                 **key_value_store_options):
+
+        if shard_count < 1:
+            raise ValueError("Shard count should be at least 1")
+
+        self.shard_count = shard_count
+        self.file_path = file_path
+        shard_class = ProcessShard if use_processes else LocalShard
+        self.shards = [shard_class(dict(key_value_store_options, file_path=get_shard_file_path(file_path, index)))
+                       for index in range(shard_count)]
+
+    def get_shard(self, key_string: str):
+        return self.shards[get_shard_index(key_string, self.shard_count)]
+
+    def group_by_shard(self, key_strings) -> Dict[int, List[str]]:
+        keys_by_shard = {}
+        for key_string in key_strings:
+            keys_by_shard.setdefault(get_shard_index(key_string, self.shard_count), []).append(key_string)
+        return keys_by_shard
+
+    def fan_out(self, requests: Dict[int, Tuple[str, tuple]]) -> Dict[int, Any]:
+        # Every shard gets its request before any result is awaited, so process shards work in parallel.
+        shard_indexes = sorted(requests)
+        for shard_index in shard_indexes:
+            self.shards[shard_index].acquire()
+        try:
+            for shard_index in shard_indexes:
+                method_name, args = requests[shard_index]
+                self.shards[shard_index].send(method_name, *args)
+
+            results, first_exception = {}, None
+            for shard_index in shard_indexes:
+                try:
+                    results[shard_index] = self.shards[shard_index].receive()
+                except Exception as exception:
+                    first_exception = first_exception or exception
+            if first_exception is not None:
+                raise first_exception
+            return results
+        finally:
+            for shard_index in shard_indexes:
+                self.shards[shard_index].release()
+
+    def fan_out_to_all(self, method_name: str, *args) -> List[Any]:
+        results = self.fan_out({shard_index: (method_name, args) for shard_index in range(self.shard_count)})
+        return [results[shard_index] for shard_index in range(self.shard_count)]
+
+    def start(self):
+        self.fan_out_to_all("start")
+
+    def close(self):
+        self.fan_out_to_all("close")
+        for shard in self.shards:
+            shard.stop()
+
+    def shutdown(self):
+        self.fan_out_to_all("shutdown")
+        for shard in self.shards:
+            shard.stop()
+
+    def read(self, key_string: str):
+        return self.get_shard(key_string).call("read", key_string)
+
+    def read_raw(self, key_string: str):
+        return self.get_shard(key_string).call("read_raw", key_string)
+
+    def delete(self, key_string: str):
+        return self.get_shard(key_string).call("delete", key_string)
+
+    def write(self, key_string: str, value: Any, time_to_live_in_seconds=0):
+        return self.get_shard(key_string).call("write", key_string, value, time_to_live_in_seconds)
+
+    def read_many(self, key_strings: List[str]) -> Dict[str, Any]:
+        results = self.fan_out({shard_index: ("read_many", (shard_keys,))
+                                for shard_index, shard_keys in self.group_by_shard(key_strings).items()})
+        merged_results = {}
+        for shard_results in results.values():
+            merged_results.update(shard_results)
+        return {key_string: merged_results[key_string] for key_string in key_strings}
+
+    def write_many(self, keys_and_values: Dict[str, Any], time_to_live_in_seconds=0) -> Dict[str, Optional[Exception]]:
+        results = self.fan_out({shard_index: ("write_many", ({key_string: keys_and_values[key_string]
+                                                              for key_string in shard_keys},
+                                                             time_to_live_in_seconds))
+                                for shard_index, shard_keys in self.group_by_shard(keys_and_values).items()})
+        merged_results = {}
+        for shard_results in results.values():
+            merged_results.update(shard_results)
+        return merged_results
+
+    def delete_many(self, key_strings: List[str]) -> Dict[str, Optional[Exception]]:
+        results = self.fan_out({shard_index: ("delete_many", (shard_keys,))
+                                for shard_index, shard_keys in self.group_by_shard(key_strings).items()})
+        merged_results = {}
+        for shard_results in results.values():
+            merged_results.update(shard_results)
+        return merged_results
+
+    def compact(self, max_records_to_move: Optional[int] = None) -> int:
+        return sum(self.fan_out_to_all("compact", max_records_to_move))
+
+    def flush(self):
+        self.fan_out_to_all("flush")
+
+    def cache_stats(self) -> Dict[str, int]:
+        return merge_stats(self.fan_out_to_all("cache_stats"))
+
+    def durability_stats(self) -> Dict[str, int]:
+        return merge_stats(self.fan_out_to_all("durability_stats"))
+
+    def expiry_stats(self) -> Dict[str, float]:
+        return merge_stats(self.fan_out_to_all("expiry_stats"))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"shards": self.fan_out_to_all("stats")}
+
+    def get_all(self):
+        keys_and_values = {}
+        for shard_keys_and_values in self.fan_out_to_all("get_all"):
+            keys_and_values.update(shard_keys_and_values)
+        return keys_and_values
+
+    def range(self, start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None,
+              keys_only=False) -> List[Any]:
+        return self.merge_ordered(self.fan_out_to_all("range", start, end, limit, keys_only), limit, keys_only)
+
+    def prefix(self, prefix: str, limit: Optional[int] = None, keys_only=False) -> List[Any]:
+        return self.merge_ordered(self.fan_out_to_all("prefix", prefix, limit, keys_only), limit, keys_only)
+
+    @staticmethod
+    def merge_ordered(shards_results: List[List[Any]], limit: Optional[int], keys_only: bool) -> List[Any]:
+        merged_results = heapq.merge(*shards_results, key=None if keys_only else lambda key_and_value: key_and_value[0])
+        return list(islice(merged_results, limit))
+
+    def scan(self, cursor: int = 0, count: int = 100, match: Optional[str] = None, keys_only=False) -> ScanBatch:
+        # The shard being scanned is kept in the low part of the cursor, the shard's own cursor above it.
+        shard_index, shard_cursor = cursor % self.shard_count, cursor // self.shard_count
+        shard_cursor, keys_and_values = self.shards[shard_index].call("scan", shard_cursor, count, match, keys_only)
+        if shard_cursor != 0:
+            return shard_cursor * self.shard_count + shard_index, keys_and_values
+        if shard_index + 1 < self.shard_count:
+            return shard_index + 1, keys_and_values
+        return 0, keys_and_values
+
+    def scan_iter(self, match: Optional[str] = None, keys_only=False, count: int = 100) -> Iterator[Any]:
+        cursor = 0
+        while True:
+            cursor, keys_and_values = self.scan(cursor, count, match, keys_only)
+            yield from keys_and_values
+            if cursor == 0:
+                return
+
+    def stop_background_jobs(self):
+        self.fan_out_to_all("stop_background_jobs")
+
+    def start_background_jobs(self):
+        self.fan_out_to_all("start_background_jobs")
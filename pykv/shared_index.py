@@ -0,0 +1,188 @@
+import mmap
+import os
+import struct
+import zlib
+from typing import Dict, Iterator, Optional
+
+INDEX_MAGIC = b"PKVX"
+INDEX_HEADER = struct.Struct(">4sB3xQQII")  # magic, retired, sequence, data file size, capacity, used buckets
+INDEX_SEQUENCE = struct.Struct(">Q")
+INDEX_DATA_SIZE = struct.Struct(">Q")
+INDEX_USED_BUCKETS = struct.Struct(">I")
+RETIRED_OFFSET = 4
+SEQUENCE_OFFSET = 8
+DATA_SIZE_OFFSET = 16
+USED_BUCKETS_OFFSET = 28
+
+BUCKET = struct.Struct(">BII")  # state, key hash, slot
+EMPTY_BUCKET = 0
+USED_BUCKET = 1
+DELETED_BUCKET = 2
+
+MINIMUM_CAPACITY = 64
+
+
+def get_key_hash(key_as_bytes: bytes) -> int:
+    return zlib.crc32(key_as_bytes)
+
+
+def get_capacity(keys_count: int) -> int:
+    capacity = MINIMUM_CAPACITY
+    while capacity < keys_count * 4:
+        capacity *= 2
+    return capacity
+
+
+def open_index_file(index_file_path: str, access: int) -> mmap.mmap:
+    with open(index_file_path, "r+b" if access == mmap.ACCESS_WRITE else "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=access)
+
+
+class SharedIndexWriter:
+    def __init__(self, index_file_path: str):
+        self.index_file_path = index_file_path
+        self.index_pointer: Optional[mmap.mmap] = None
+        self.capacity = 0
+        self.used_buckets = 0
+        self.sequence = 0
+        self.write_depth = 0
+
+    def rebuild(self, keys_and_offsets: Dict[str, int], data_size_in_bytes: int):
+        # The new index is written aside and swapped in, readers of the old one see it retired and reopen.
+        self.capacity = get_capacity(len(keys_and_offsets))
+        self.used_buckets = 0
+        index_bytes = bytearray(INDEX_HEADER.size + self.capacity * BUCKET.size)
+        for key_string, slot in keys_and_offsets.items():
+            self.put_into(index_bytes, str.encode(key_string), slot)
+        INDEX_HEADER.pack_into(index_bytes, 0, INDEX_MAGIC, 0, self.sequence,
+                               data_size_in_bytes, self.capacity, self.used_buckets)
+
+        temporary_file_path = self.index_file_path + ".tmp"
+        with open(temporary_file_path, "wb") as f:
+            f.write(index_bytes)
+
+        # The file being replaced may come from an earlier writer process, whose readers are still mapping it.
+        previous_index_pointer = self.index_pointer or self.open_previous_index_file()
+        os.replace(temporary_file_path, self.index_file_path)
+
+        self.index_pointer = open_index_file(self.index_file_path, mmap.ACCESS_WRITE)
+        if previous_index_pointer is not None:
+            previous_index_pointer[RETIRED_OFFSET] = 1
+            previous_index_pointer.close()
+
+    def open_previous_index_file(self) -> Optional[mmap.mmap]:
+        try:
+            index_pointer = open_index_file(self.index_file_path, mmap.ACCESS_WRITE)
+        except (OSError, ValueError):
+            return None
+        if len(index_pointer) < INDEX_HEADER.size or index_pointer[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            index_pointer.close()
+            return None
+        return index_pointer
+
+    def begin_write(self):
+        self.write_depth += 1
+        if self.write_depth == 1:
+            self.sequence += 1
+            INDEX_SEQUENCE.pack_into(self.index_pointer, SEQUENCE_OFFSET, self.sequence)
+
+    def end_write(self):
+        self.write_depth -= 1
+        if self.write_depth == 0:
+            self.sequence += 1
+            INDEX_SEQUENCE.pack_into(self.index_pointer, SEQUENCE_OFFSET, self.sequence)
+
+    def set_data_size(self, data_size_in_bytes: int):
+        INDEX_DATA_SIZE.pack_into(self.index_pointer, DATA_SIZE_OFFSET, data_size_in_bytes)
+
+    def put(self, key_as_bytes: bytes, slot: int) -> bool:
+        if (self.used_buckets + 1) * 2 > self.capacity:
+            return False
+        self.put_into(self.index_pointer, key_as_bytes, slot)
+        INDEX_USED_BUCKETS.pack_into(self.index_pointer, USED_BUCKETS_OFFSET, self.used_buckets)
+        return True
+
+    def put_into(self, index_buffer, key_as_bytes: bytes, slot: int):
+        key_hash = get_key_hash(key_as_bytes)
+        bucket = key_hash % self.capacity
+        while True:
+            bucket_offset = INDEX_HEADER.size + bucket * BUCKET.size
+            if index_buffer[bucket_offset] == EMPTY_BUCKET:
+                self.used_buckets += 1
+                break
+            if index_buffer[bucket_offset] == DELETED_BUCKET:
+                break
+            bucket = (bucket + 1) % self.capacity
+        BUCKET.pack_into(index_buffer, bucket_offset, USED_BUCKET, key_hash, slot)
+
+    def move(self, key_as_bytes: bytes, slot: int, new_slot: int):
+        bucket_offset = self.find_bucket(key_as_bytes, slot)
+        BUCKET.pack_into(self.index_pointer, bucket_offset, USED_BUCKET, get_key_hash(key_as_bytes), new_slot)
+
+    def delete(self, key_as_bytes: bytes, slot: int):
+        self.index_pointer[self.find_bucket(key_as_bytes, slot)] = DELETED_BUCKET
+
+    def find_bucket(self, key_as_bytes: bytes, slot: int) -> int:
+        # The writer knows the key's slot, and slots are unique, so hash plus slot identifies the bucket.
+        key_hash = get_key_hash(key_as_bytes)
+        bucket = key_hash % self.capacity
+        while True:
+            bucket_offset = INDEX_HEADER.size + bucket * BUCKET.size
+            state, bucket_key_hash, bucket_slot = BUCKET.unpack_from(self.index_pointer, bucket_offset)
+            if state == USED_BUCKET and bucket_key_hash == key_hash and bucket_slot == slot:
+                return bucket_offset
+            bucket = (bucket + 1) % self.capacity
+
+    def close(self):
+        if self.index_pointer is not None:
+            self.index_pointer.close()
+            self.index_pointer = None
+        if os.path.exists(self.index_file_path):
+            os.remove(self.index_file_path)
+
+
+class SharedIndexReader:
+    def __init__(self, index_file_path: str):
+        self.index_file_path = index_file_path
+        self.index_pointer = None
+        self.capacity = 0
+        self.reopen()
+
+    def reopen(self):
+        if self.index_pointer is not None:
+            self.index_pointer.close()
+        self.index_pointer = open_index_file(self.index_file_path, mmap.ACCESS_READ)
+        magic, _, _, _, self.capacity, _ = INDEX_HEADER.unpack_from(self.index_pointer, 0)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{self.index_file_path} is not a shared index file")
+
+    def read_sequence(self) -> int:
+        sequence, = INDEX_SEQUENCE.unpack_from(self.index_pointer, SEQUENCE_OFFSET)
+        return sequence
+
+    def is_retired(self) -> bool:
+        return self.index_pointer[RETIRED_OFFSET] == 1
+
+    def get_data_size(self) -> int:
+        data_size_in_bytes, = INDEX_DATA_SIZE.unpack_from(self.index_pointer, DATA_SIZE_OFFSET)
+        return data_size_in_bytes
+
+    def find_slots(self, key_as_bytes: bytes) -> Iterator[int]:
+        key_hash = get_key_hash(key_as_bytes)
+        bucket = key_hash % self.capacity
+        for _ in range(self.capacity):
+            state, bucket_key_hash, slot = BUCKET.unpack_from(self.index_pointer, INDEX_HEADER.size + bucket * BUCKET.size)
+            if state == EMPTY_BUCKET:
+                return
+            if state == USED_BUCKET and bucket_key_hash == key_hash:
+                yield slot
+            bucket = (bucket + 1) % self.capacity
+
+    def get_slots(self, start_bucket: int = 0, end_bucket: Optional[int] = None) -> Iterator[int]:
+        for bucket in range(start_bucket, self.capacity if end_bucket is None else min(end_bucket, self.capacity)):
+            state, _, slot = BUCKET.unpack_from(self.index_pointer, INDEX_HEADER.size + bucket * BUCKET.size)
+            if state == USED_BUCKET:
+                yield slot
+
+    def close(self):
+        self.index_pointer.close()
@@ -0,0 +1,210 @@
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pykv.main import KeyValueStore, KeyNotFoundException, InvalidKeyException, InvalidValueException
+from pykv.record import validate_slot_size
+from pykv.sharded_store import ShardedKeyValueStore, merge_stats
+from pykv.store import ScanBatch
+
+
+def get_size_class_file_path(file_path: str, slot_size_in_bytes: int) -> str:
+    root, extension = os.path.splitext(file_path)
+    return f"{root}.slot{slot_size_in_bytes}{extension}"
+
+
+class SizeClassKeyValueStore:
+
+    def __init__(self,
+                 slot_sizes_in_bytes: Sequence[int] = (64, 512, 4096),
+                 file_path: Optional[str] = "default_kv.bin",
+                 **key_value_store_options):
+
+        if not slot_sizes_in_bytes:
+            raise ValueError("At least one slot size is needed")
+        for slot_size_in_bytes in slot_sizes_in_bytes:
+            validate_slot_size(slot_size_in_bytes)
+
+        self.slot_sizes_in_bytes = sorted(set(slot_sizes_in_bytes))
+        self.file_path = file_path
+        self.size_classes = [KeyValueStore(file_path=get_size_class_file_path(file_path, slot_size_in_bytes),
+                                           slot_size_in_bytes=slot_size_in_bytes,
+                                           **key_value_store_options)
+                             for slot_size_in_bytes in self.slot_sizes_in_bytes]
+        # Checking that a key is new and writing it into its class has to be atomic across all the classes.
+        self.write_lock = threading.Lock()
+
+    def find_size_class(self, key_string: str) -> Optional[KeyValueStore]:
+        for size_class in self.size_classes:
+            if size_class.store.is_exists(key_string):
+                return size_class
+        return None
+
+    def get_size_class(self, key_string: str, value_as_bytes: bytes) -> KeyValueStore:
+        # The class allocating the fewest bytes for the record wins, ties going to the bigger slots, which split the
+        # value into fewer segments.
+        key_len = len(str.encode(key_string))
+        best_size_class, best_allocated_bytes = self.size_classes[-1], None
+        for size_class in reversed(self.size_classes):
+            record_manager = size_class.file_store.record_manager
+            if key_len > record_manager.maximum_key_length_in_bytes or \
+                    len(value_as_bytes) > record_manager.get_maximum_value_length(key_len):
+                continue
+            allocated_bytes = record_manager.get_slots_needed(key_len, len(value_as_bytes)) * \
+                record_manager.slot_size_in_bytes
+            if best_allocated_bytes is None or allocated_bytes < best_allocated_bytes:
+                best_size_class, best_allocated_bytes = size_class, allocated_bytes
+        return best_size_class
+
+    def group_by_size_class(self, key_strings) -> Tuple[Dict[int, List[str]], List[str]]:
+        keys_by_size_class, missing_keys = {}, []
+        for key_string in key_strings:
+            size_class = self.find_size_class(key_string)
+            if size_class is None:
+                missing_keys.append(key_string)
+            else:
+                keys_by_size_class.setdefault(self.size_classes.index(size_class), []).append(key_string)
+        return keys_by_size_class, missing_keys
+
+    def validate_write(self, key_string: str, value: Any) -> bytes:
+        # The class with the biggest slots accepts every record any class accepts, so it validates for all of them.
+        value_as_bytes = self.size_classes[-1].validate_write(key_string, value)
+        if self.find_size_class(key_string) is not None:
+            raise InvalidValueException(f"Given key {key_string} is already exists in Store")
+        return value_as_bytes
+
+    def start(self):
+        for size_class in self.size_classes:
+            size_class.start()
+
+    def close(self):
+        for size_class in self.size_classes:
+            size_class.close()
+
+    def shutdown(self):
+        for size_class in self.size_classes:
+            size_class.shutdown()
+
+    def read(self, key_string: str):
+        size_class = self.find_size_class(key_string)
+        if size_class is None:
+            raise KeyNotFoundException(f"Given key {key_string} not found in Store")
+        return size_class.read(key_string)
+
+    def read_raw(self, key_string: str):
+        size_class = self.find_size_class(key_string)
+        if size_class is None:
+            raise KeyNotFoundException(f"Given key {key_string} not found in Store")
+        return size_class.read_raw(key_string)
+
+    def delete(self, key_string: str):
+        size_class = self.find_size_class(key_string)
+        if size_class is None:
+            raise KeyNotFoundException(f"Given key {key_string} not found in Store")
+        return size_class.delete(key_string)
+
+    def write(self, key_string: str, value: Any, time_to_live_in_seconds=0):
+        self.size_classes[0].ensure_writable()
+        with self.write_lock:
+            value_as_bytes = self.validate_write(key_string, value)
+            self.get_size_class(key_string, value_as_bytes).write_encoded(key_string, value, value_as_bytes,
+                                                                          time_to_live_in_seconds)
+
+    def read_many(self, key_strings: List[str]) -> Dict[str, Any]:
+        keys_by_size_class, missing_keys = self.group_by_size_class(key_strings)
+        results = {key_string: KeyNotFoundException(f"Given key {key_string} not found in Store")
+                   for key_string in missing_keys}
+        for size_class_index, size_class_keys in keys_by_size_class.items():
+            results.update(self.size_classes[size_class_index].read_many(size_class_keys))
+        return {key_string: results[key_string] for key_string in key_strings}
+
+    def write_many(self, keys_and_values: Dict[str, Any], time_to_live_in_seconds=0) -> Dict[str, Optional[Exception]]:
+        self.size_classes[0].ensure_writable()
+        results = {}
+        records_by_size_class: Dict[int, list] = {}
+        with self.write_lock:
+            for key_string, value in keys_and_values.items():
+                try:
+                    value_as_bytes = self.validate_write(key_string, value)
+                except (InvalidKeyException, InvalidValueException) as exception:
+                    results[key_string] = exception
+                    continue
+                size_class_index = self.size_classes.index(self.get_size_class(key_string, value_as_bytes))
+                records_by_size_class.setdefault(size_class_index, []).append(
+                    (key_string, value, time_to_live_in_seconds, value_as_bytes))
+
+            for size_class_index, records in records_by_size_class.items():
+                results.update(self.size_classes[size_class_index].write_encoded_many(records))
+        return results
+
+    def delete_many(self, key_strings: List[str]) -> Dict[str, Optional[Exception]]:
+        keys_by_size_class, missing_keys = self.group_by_size_class(key_strings)
+        results = {key_string: KeyNotFoundException(f"Given key {key_string} not found in Store")
+                   for key_string in missing_keys}
+        for size_class_index, size_class_keys in keys_by_size_class.items():
+            results.update(self.size_classes[size_class_index].delete_many(size_class_keys))
+        return results
+
+    def compact(self, max_records_to_move: Optional[int] = None) -> int:
+        return sum(size_class.compact(max_records_to_move) for size_class in self.size_classes)
+
+    def flush(self):
+        for size_class in self.size_classes:
+            size_class.flush()
+
+    def cache_stats(self) -> Dict[str, int]:
+        return merge_stats([size_class.cache_stats() for size_class in self.size_classes])
+
+    def durability_stats(self) -> Dict[str, int]:
+        return merge_stats([size_class.durability_stats() for size_class in self.size_classes])
+
+    def expiry_stats(self) -> Dict[str, float]:
+        return merge_stats([size_class.expiry_stats() for size_class in self.size_classes])
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size_classes": {slot_size_in_bytes: size_class.stats()
+                                 for slot_size_in_bytes, size_class in zip(self.slot_sizes_in_bytes,
+                                                                           self.size_classes)}}
+
+    def get_all(self):
+        keys_and_values = {}
+        for size_class in self.size_classes:
+            keys_and_values.update(size_class.get_all())
+        return keys_and_values
+
+    def range(self, start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None,
+              keys_only=False) -> List[Any]:
+        return ShardedKeyValueStore.merge_ordered([size_class.range(start, end, limit, keys_only)
+                                                   for size_class in self.size_classes], limit, keys_only)
+
+    def prefix(self, prefix: str, limit: Optional[int] = None, keys_only=False) -> List[Any]:
+        return ShardedKeyValueStore.merge_ordered([size_class.prefix(prefix, limit, keys_only)
+                                                   for size_class in self.size_classes], limit, keys_only)
+
+    def scan(self, cursor: int = 0, count: int = 100, match: Optional[str] = None, keys_only=False) -> ScanBatch:
+        # As in the sharded store, the class being scanned is kept in the low part of the cursor.
+        size_class_count = len(self.size_classes)
+        size_class_index, size_class_cursor = cursor % size_class_count, cursor // size_class_count
+        size_class_cursor, keys_and_values = self.size_classes[size_class_index].scan(size_class_cursor, count,
+                                                                                      match, keys_only)
+        if size_class_cursor != 0:
+            return size_class_cursor * size_class_count + size_class_index, keys_and_values
+        if size_class_index + 1 < size_class_count:
+            return size_class_index + 1, keys_and_values
+        return 0, keys_and_values
+
+    def scan_iter(self, match: Optional[str] = None, keys_only=False, count: int = 100) -> Iterator[Any]:
+        cursor = 0
+        while True:
+            cursor, keys_and_values = self.scan(cursor, count, match, keys_only)
+            yield from keys_and_values
+            if cursor == 0:
+                return
+
+    def stop_background_jobs(self):
+        for size_class in self.size_classes:
+            size_class.stop_background_jobs()
+
+    def start_background_jobs(self):
+        for size_class in self.size_classes:
+            size_class.start_background_jobs()
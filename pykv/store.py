@@ -1,4 +1,8 @@
 import threading
+from typing import Any, List, Tuple, Union
+
+
+ScanBatch = Tuple[int, List[Union[str, Tuple[str, Any]]]]  # next cursor (0 once the scan is complete), keys or items
 
 
 class StoreException(Exception):
@@ -9,19 +13,37 @@ class StoreGetException(StoreException):
     pass
 
 
+class StoreFullException(StoreException):
+    pass
+
+
+class StoreRecordSizeException(StoreException):
+    pass
+
+
 class Store:
     def __init__(self, background_job,
                  background_jobs_frequency_in_seconds):
         self.stop_event = threading.Event()
-        self.background_job_thread = None
-        self.background_job = background_job
+        self.background_job_threads = []
+        self.background_jobs = [background_job]
         self.background_jobs_frequency_in_seconds = background_jobs_frequency_in_seconds
 
+    def check_record_size(self, key_string: str, value_as_bytes: bytes):
+        pass
+
+    def add_background_job(self, background_job):
+        self.background_jobs.append(background_job)
+
     def start_background_jobs(self):
-        self.background_job_thread = threading.Thread(target=self.background_job)
-        self.background_job_thread.daemon = True
-        self.background_job_thread.start()
+        for background_job in self.background_jobs:
+            background_job_thread = threading.Thread(target=background_job)
+            background_job_thread.daemon = True
+            background_job_thread.start()
+            self.background_job_threads.append(background_job_thread)
 
     def stop_background_jobs(self):
         self.stop_event.set()
-        self.background_job_thread.join()
+        for background_job_thread in self.background_job_threads:
+            background_job_thread.join()
+        self.background_job_threads = []
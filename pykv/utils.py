@@ -1,6 +1,8 @@
+import math
+from fnmatch import fnmatchcase
 import mmap
 import os
-from datetime import datetime, timezone, timedelta
+import time
 
 
 def create_file_if_not_exists(file_path: str):
@@ -13,9 +15,12 @@ def create_file_if_not_exists(file_path: str):
 
 def extend_file(bytes_to_append: int, file_path: str):
     if os.path.exists(file_path):
-        f = open(file_path, "ab")
-        f.write(bytes_to_append * b'\0')
-        f.close()
+        os.truncate(file_path, os.path.getsize(file_path) + bytes_to_append)
+
+
+def resize_file(size_in_bytes: int, file_path: str):
+    if os.path.exists(file_path):
+        os.truncate(file_path, size_in_bytes)
 
 
 def get_memory_mapped_file_pointer(file_path):
@@ -24,14 +29,20 @@ def get_memory_mapped_file_pointer(file_path):
 
 
 def is_passed(timestamp: int):
-    given_time = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-    current_time = datetime.now(timezone.utc)
-    return current_time > given_time
+    return time.time() > timestamp
 
 
-def add_seconds(input_time: datetime):
-    return input_time + timedelta(0, 3)
+def get_expiry_timestamp(time_to_live_in_seconds: int):
+    return math.ceil(time.time()) + time_to_live_in_seconds
 
 
-def get_timestamp(input_time: datetime):
-    return int(input_time.timestamp())
+def is_key_in_range(key_string: str, start: str = None, end: str = None) -> bool:
+    return (start is None or key_string >= start) and (end is None or key_string < end)
+
+
+def is_key_matching(key_string: str, match: str = None) -> bool:
+    if match is None:
+        return True
+    if any(wildcard in match for wildcard in "*?["):
+        return fnmatchcase(key_string, match)
+    return key_string.startswith(match)
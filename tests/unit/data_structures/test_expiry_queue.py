@@ -0,0 +1,56 @@
+from pykv.data_structures.expiry_queue import ExpiryQueue
+
+
+def test_should_pop_expired_keys_in_expiry_order():
+    expiry_queue = ExpiryQueue()
+    expiry_queue.schedule("key_1", 30)
+    expiry_queue.schedule("key_2", 10)
+    expiry_queue.schedule("key_3", 20)
+
+    assert expiry_queue.peek_expiry() == 10
+    assert expiry_queue.pop_expired(25) == ["key_2", "key_3"]
+    assert expiry_queue.pop_expired(25) == []
+    assert len(expiry_queue) == 1
+
+
+def test_should_skip_cancelled_and_rescheduled_keys():
+    expiry_queue = ExpiryQueue()
+    expiry_queue.schedule("key_1", 10)
+    expiry_queue.schedule("key_2", 10)
+    expiry_queue.schedule("key_2", 50)
+    expiry_queue.cancel("key_1")
+
+    assert expiry_queue.get_expiry("key_1") is None
+    assert expiry_queue.get_expiry("key_2") == 50
+    assert expiry_queue.peek_expiry() == 50
+    assert expiry_queue.pop_expired(100) == ["key_2"]
+    assert expiry_queue.is_empty()
+
+
+def test_should_limit_popped_keys():
+    expiry_queue = ExpiryQueue()
+    for index in range(5):
+        expiry_queue.schedule(f"key_{index}", index)
+
+    assert expiry_queue.pop_expired(10, limit=2) == ["key_0", "key_1"]
+    assert len(expiry_queue) == 3
+
+
+def test_should_drop_stale_entries_when_they_dominate_the_heap():
+    expiry_queue = ExpiryQueue()
+    for index in range(1000):
+        expiry_queue.schedule(f"key_{index}", index)
+        expiry_queue.cancel(f"key_{index}")
+
+    assert len(expiry_queue.heap) <= 64
+    assert expiry_queue.peek_expiry() is None
+
+
+def test_should_count_expired_keys_without_popping_them():
+    expiry_queue = ExpiryQueue()
+    for index in range(20):
+        expiry_queue.schedule(f"key_{index}", index)
+    expiry_queue.cancel("key_3")
+
+    assert expiry_queue.count_expired(10) == 9
+    assert len(expiry_queue) == 19
@@ -0,0 +1,37 @@
+from pykv.data_structures.lru_cache import LRUCache
+
+
+def test_should_evict_least_recently_used_entries():
+    cache = LRUCache(max_entries=2)
+    cache.put("key_1", {'1': 2}, 0, 10)
+    cache.put("key_2", {'1': 3}, 0, 10)
+    cache.get("key_1")
+    cache.put("key_3", {'1': 4}, 0, 10)
+
+    assert cache.get("key_2") is None
+    assert cache.get("key_1") == ({'1': 2}, 0)
+    assert cache.stats() == {"entries": 2, "size_in_bytes": 20, "hits": 2, "misses": 1, "evictions": 1}
+
+
+def test_should_bound_cache_by_size_in_bytes():
+    cache = LRUCache(max_bytes=100)
+    cache.put("key_1", 1, 0, 60)
+    cache.put("key_2", 2, 0, 60)
+    cache.put("key_3", 3, 0, 500)
+
+    assert list(cache.entries) == ["key_2"]
+    assert cache.size_in_bytes == 60
+
+    cache.invalidate("key_2")
+    assert cache.size_in_bytes == 0
+
+
+def test_should_share_cached_values_unless_copying_on_read():
+    cache = LRUCache(max_entries=2)
+    cache.put("key_1", {'1': [2]}, 0, 10)
+    assert cache.get("key_1")[0] is cache.get("key_1")[0]
+
+    cache = LRUCache(max_entries=2, copy_on_read=True)
+    cache.put("key_1", {'1': [2]}, 0, 10)
+    cache.get("key_1")[0]['1'].append(3)
+    assert cache.get("key_1") == ({'1': [2]}, 0)
@@ -0,0 +1,32 @@
+from pykv.data_structures.size_tree import SizeTree
+
+
+def test_should_find_smallest_size_at_least_given_one():
+    size_tree = SizeTree(capacity=8)
+    for size in (3, 5, 8):
+        size_tree.add(size)
+
+    assert size_tree.find_at_least(1) == 3
+    assert size_tree.find_at_least(4) == 5
+    assert size_tree.find_at_least(8) == 8
+    assert size_tree.find_at_least(9) is None
+
+    size_tree.remove(5)
+    assert size_tree.find_at_least(4) == 8
+    assert list(size_tree) == [3, 8]
+
+
+def test_should_grow_past_initial_capacity():
+    size_tree = SizeTree(capacity=4)
+    size_tree.add(2)
+    size_tree.add(1000)
+    size_tree.add(70)
+
+    assert size_tree.capacity == 1024
+    assert list(size_tree) == [2, 70, 1000]
+    assert size_tree.find_at_least(71) == 1000
+    assert size_tree.find_at_least(1001) is None
+    assert len(size_tree) == 3
+
+    size_tree.clear()
+    assert size_tree.find_at_least(1) is None
@@ -0,0 +1,76 @@
+from pykv.data_structures.slot_allocator import SlotAllocator
+
+
+def test_should_allocate_best_fit_hole():
+    allocator = SlotAllocator()
+    allocator.release(0, 8)
+    allocator.release(20, 3)
+    allocator.release(40, 5)
+
+    assert allocator.allocate(4) == 40
+    assert allocator.allocate(3) == 20
+    assert allocator.allocate(9) is None
+    assert allocator.holes_by_size == {1: {44: None}, 8: {0: None}}
+    assert list(allocator.hole_sizes) == [1, 8]
+
+
+def test_should_keep_distinct_hole_sizes_in_order():
+    allocator = SlotAllocator()
+    for start in range(0, 40, 4):
+        allocator.release(start, 2)
+    allocator.release(100, 7)
+
+    assert list(allocator.hole_sizes) == [2, 7]
+    assert allocator.allocate(2) == 0
+    assert allocator.allocate(3) == 100
+    assert list(allocator.hole_sizes) == [2, 4]
+
+    for _ in range(9):
+        allocator.allocate(2)
+    assert list(allocator.hole_sizes) == [4]
+    assert allocator.holes_by_size == {4: {103: None}}
+
+
+def test_should_merge_adjacent_holes():
+    allocator = SlotAllocator()
+    allocator.release(10, 2)
+    allocator.release(14, 2)
+    allocator.release(12, 2)
+
+    assert allocator.holes_by_start == {10: 6}
+    assert allocator.free_slots_count() == 6
+    assert allocator.holes_count() == 1
+
+
+def test_should_trim_hole_at_end():
+    allocator = SlotAllocator()
+    allocator.release(3, 2)
+    allocator.release(7, 3)
+
+    assert allocator.trim(10) == 7
+    assert allocator.trim(7) == 7
+    assert allocator.holes_by_start == {3: 2}
+
+
+def test_should_match_naive_best_fit_and_free_slot_count():
+    allocator = SlotAllocator()
+    holes = {}
+    next_start = 0
+    for index in range(300):
+        count = index * 7 % 23 + 1
+        if index % 3:
+            allocator.release(next_start, count)
+            holes[next_start] = count
+        next_start += count + 1
+
+    for count in (5, 1, 23, 17, 2, 40, 9, 9, 9):
+        fitting_sizes = [size for size in holes.values() if size >= count]
+        start = allocator.allocate(count)
+        if not fitting_sizes:
+            assert start is None
+            continue
+        assert holes[start] == min(fitting_sizes)
+        if holes[start] > count:
+            holes[start + count] = holes[start] - count
+        del holes[start]
+        assert allocator.free_slots_count() == sum(holes.values())
@@ -0,0 +1,25 @@
+from pykv.data_structures.sorted_key_index import SortedKeyIndex
+
+
+def test_should_keep_keys_ordered_across_chunks():
+    sorted_key_index = SortedKeyIndex(chunk_size=2)
+    for key_string in ["d", "a", "f", "b", "e", "c", "g"]:
+        sorted_key_index.add(key_string)
+
+    assert list(sorted_key_index.irange()) == ["a", "b", "c", "d", "e", "f", "g"]
+    assert len(sorted_key_index.chunks) > 1
+    assert sorted_key_index.remove("d")
+    assert not sorted_key_index.remove("x")
+    assert list(sorted_key_index.irange("b", "f")) == ["b", "c", "e"]
+    assert len(sorted_key_index) == 6
+    assert "c" in sorted_key_index
+    assert "d" not in sorted_key_index
+
+
+def test_should_list_keys_by_prefix():
+    sorted_key_index = SortedKeyIndex(chunk_size=2)
+    sorted_key_index.rebuild(["user:42:name", "user:4", "user:42:age", "user:43:name", "order:1"])
+
+    assert list(sorted_key_index.iprefix("user:42:")) == ["user:42:age", "user:42:name"]
+    assert list(sorted_key_index.iprefix("z")) == []
+    assert list(sorted_key_index.irange("user:43")) == ["user:43:name"]
@@ -0,0 +1,74 @@
+import asyncio
+import os
+
+from pytest import raises
+
+from pykv.async_store import AsyncKeyValueStore
+from pykv.main import KeyNotFoundException
+
+
+class TestAsyncKeyValueStore:
+    file_path = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.file_path = "test_db.bin"
+
+    @classmethod
+    def teardown_method(cls):
+        if os.path.exists(cls.file_path):
+            os.remove(cls.file_path)
+
+    def test_should_read_and_write_in_file_store(self):
+        async def run():
+            kv_store = AsyncKeyValueStore(file_path=self.file_path, cache_max_entries=10)
+            kv_store.start()
+
+            await kv_store.write("key_1", {'1': 2, '3': 55})
+            await kv_store.write_many({"key_2": {'1': 1000 * 'amuthan'}, "key_3": {'1': 'ss'}})
+
+            assert await kv_store.read("key_1") == {'1': 2, '3': 55}
+            assert await kv_store.read("key_1") == {'1': 2, '3': 55}
+            assert kv_store.kv_store.cache_stats()["hits"] == 1
+
+            await kv_store.delete("key_3")
+            assert (await kv_store.read_many(["key_2"]))["key_2"] == {'1': 1000 * 'amuthan'}
+            assert await kv_store.get_all() == {"key_1": {'1': 2, '3': 55}, "key_2": {'1': 1000 * 'amuthan'}}
+
+            await kv_store.close()
+
+        asyncio.run(run())
+
+    def test_should_serve_cached_none_values_without_blocking_read(self):
+        async def run():
+            kv_store = AsyncKeyValueStore(file_path=self.file_path, cache_max_entries=10)
+            await kv_store.write("key_1", None)
+
+            assert kv_store.read_cached("key_1") == (False, None)
+            assert await kv_store.read("key_1") is None
+            assert kv_store.read_cached("key_1") == (True, None)
+            assert await kv_store.read("key_1") is None
+            assert kv_store.kv_store.cache_stats()["hits"] == 2
+
+            await kv_store.close()
+
+        asyncio.run(run())
+
+    def test_should_expire_keys_from_event_loop(self):
+        async def run():
+            kv_store = AsyncKeyValueStore(file_path=self.file_path,
+                                          mem_store_mode=True,
+                                          background_jobs_frequency_in_seconds=1)
+            kv_store.start()
+
+            await kv_store.write("key_1", {'1': 2}, time_to_live_in_seconds=1)
+            await kv_store.write("key_2", {'1': 3})
+            await asyncio.sleep(5)
+
+            assert await kv_store.get_all() == {"key_2": {'1': 3}}
+            with raises(KeyNotFoundException):
+                await kv_store.read("key_1")
+
+            await kv_store.close()
+
+        asyncio.run(run())
@@ -0,0 +1,57 @@
+import os
+
+from pykv.main import KeyValueStore, KeyNotFoundException, InvalidKeyException
+
+
+class TestBatchOperations:
+    file_path = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.file_path = "test_db.bin"
+
+    @classmethod
+    def teardown_method(cls):
+        if os.path.exists(cls.file_path):
+            os.remove(cls.file_path)
+
+    def test_should_write_read_and_delete_many_in_file_store(self):
+        self.should_write_read_and_delete_many(KeyValueStore(file_path=self.file_path))
+
+    def test_should_write_read_and_delete_many_in_mem_store(self):
+        self.should_write_read_and_delete_many(KeyValueStore(file_path=self.file_path, mem_store_mode=True))
+
+    def test_should_update_record_count_once_for_file_store_batch(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+
+        kv_store.write_many({f"key_{index}": {'1': index * 'amuthan'} for index in range(200)})
+
+        assert kv_store.file_store.record_count == 200
+        assert kv_store.file_store.record_manager.get_record_count(kv_store.file_store.file_pointer) == 200
+        assert kv_store.read('key_199') == {'1': 199 * 'amuthan'}
+
+    @staticmethod
+    def should_write_read_and_delete_many(kv_store):
+        kv_store.write("key_1", {'1': 2})
+
+        results = kv_store.write_many({
+            "key_1": {'1': 3},
+            "key_2": {'1': 1000 * 'amuthan', '3': 55},
+            "key_3": {'1': 'ss', '3': 55},
+            40 * "k": {'1': 'ss'}
+        })
+
+        assert results["key_2"] is None and results["key_3"] is None
+        assert results["key_1"] is not None
+        assert isinstance(results[40 * "k"], InvalidKeyException)
+
+        values = kv_store.read_many(["key_1", "key_2", "key_4"])
+        assert values["key_1"] == {'1': 2}
+        assert values["key_2"] == {'1': 1000 * 'amuthan', '3': 55}
+        assert isinstance(values["key_4"], KeyNotFoundException)
+
+        deleted = kv_store.delete_many(["key_1", "key_3", "key_4"])
+        assert deleted["key_1"] is None and deleted["key_3"] is None
+        assert isinstance(deleted["key_4"], KeyNotFoundException)
+
+        assert kv_store.get_all() == {"key_2": {'1': 1000 * 'amuthan', '3': 55}}
@@ -0,0 +1,46 @@
+import json
+
+from pykv.bench import run_benchmarks, compare_with_baseline, get_benchmark_targets, main
+
+
+def test_should_run_store_benchmarks_for_every_store_kind():
+    report = run_benchmarks(store_kinds=["file", "mem"],
+                            benchmark_names=["write_single", "read_30_slot", "load_scan", "record_read"],
+                            records=60, load_records=60, repeat=1)
+
+    assert set(report["results"]) == {"file/write_single", "mem/write_single", "file/read_30_slot",
+                                      "mem/read_30_slot", "file/load_scan", "record/record_read"}
+    assert report["results"]["file/load_scan"]["operations"] == 60
+    assert all(result["operations_per_second"] > 0 for result in report["results"].values())
+    assert report["meta"]["records"] == 60
+
+
+def test_should_run_load_benchmarks_only_for_file_store():
+    assert get_benchmark_targets(["mem"], ["load_hint", "get_all"]) == [("mem", "get_all")]
+
+
+def test_should_flag_regressions_against_baseline():
+    baseline = {"results": {"file/get_all": {"operations_per_second": 1000},
+                            "mem/get_all": {"operations_per_second": 1000}}}
+    report = {"results": {"file/get_all": {"operations_per_second": 950},
+                          "mem/get_all": {"operations_per_second": 500},
+                          "mem/write_single": {"operations_per_second": 10}}}
+
+    comparisons = {comparison["name"]: comparison for comparison in compare_with_baseline(report, baseline, 0.1)}
+
+    assert set(comparisons) == {"file/get_all", "mem/get_all"}
+    assert not comparisons["file/get_all"]["is_regression"]
+    assert comparisons["mem/get_all"]["is_regression"]
+
+
+def test_should_write_report_and_exit_with_failure_on_regression(tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps({"results": {"mem/get_all": {"operations_per_second": 1e30}}}))
+    output_path = tmp_path / "report.json"
+
+    exit_code = main(["--stores", "mem", "--benchmarks", "get_all", "--records", "10", "--repeat", "1",
+                      "--output", str(output_path), "--baseline", str(baseline_path)])
+
+    report = json.loads(output_path.read_text())
+    assert exit_code == 1
+    assert report["comparison"][0]["is_regression"]
@@ -0,0 +1,117 @@
+import os
+
+from pytest import raises
+
+from pykv.codecs import (get_codec, get_codec_by_id, register_codec, JsonCodec, PickleCodec, ValueCodec,
+                         VALUE_CODECS, VALUE_CODECS_BY_ID)
+from pykv.main import KeyValueStore, InvalidValueException
+from pykv.store import StoreException
+
+
+def test_should_round_trip_values_through_codecs():
+    value = {'1': 2, '3': [55, 'amuthan'], '4': {'1': 2.5}}
+
+    for codec_name in ("json", "marshal", "pickle"):
+        codec = get_codec(codec_name)
+        assert codec.decode(codec.encode(value)) == value
+        assert get_codec_by_id(codec.codec_id) is codec
+
+    assert get_codec("bytes").decode(get_codec("bytes").encode(bytearray(b"amuthan"))) == b"amuthan"
+
+    with raises(TypeError):
+        get_codec("bytes").encode({'1': 2})
+
+
+class TestValueCodecs:
+    file_path = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.file_path = "test_db.bin"
+
+    @classmethod
+    def teardown_method(cls):
+        for path in (cls.file_path, cls.file_path + ".hint"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_should_store_values_with_recorded_codec(self):
+        kv_store = KeyValueStore(file_path=self.file_path, value_codec="pickle")
+        kv_store.write("key_1", {'1': (2, 3), '3': {55}})
+        kv_store.write("key_2", {'1': 1000 * 'amuthan'})
+
+        kv_store = KeyValueStore(file_path=self.file_path)
+
+        assert isinstance(kv_store.file_store.codec, PickleCodec)
+        assert kv_store.read("key_1") == {'1': (2, 3), '3': {55}}
+        assert kv_store.get_all() == {"key_1": {'1': (2, 3), '3': {55}}, "key_2": {'1': 1000 * 'amuthan'}}
+
+        with raises(StoreException):
+            KeyValueStore(file_path=self.file_path, value_codec="json")
+
+    def test_should_store_raw_bytes(self):
+        kv_store = KeyValueStore(file_path=self.file_path, value_codec="bytes")
+        kv_store.write("key_1", b"\x00\x01\x02" * 400)
+
+        assert kv_store.read("key_1") == b"\x00\x01\x02" * 400
+        assert b"".join(kv_store.read_raw("key_1")) == b"\x00\x01\x02" * 400
+
+        with raises(InvalidValueException):
+            kv_store.write("key_2", {'1': 2})
+
+    def test_should_reject_custom_codec_without_valid_id_before_creating_file(self):
+        class UpperCodec(ValueCodec):
+            name = "upper"
+
+            def encode(self, value):
+                return str.encode(value.upper())
+
+            def decode(self, value_as_bytes):
+                return value_as_bytes.decode()
+
+        with raises(ValueError):
+            KeyValueStore(file_path=self.file_path, value_codec=UpperCodec())
+        UpperCodec.codec_id = 256
+        with raises(ValueError):
+            KeyValueStore(file_path=self.file_path, value_codec=UpperCodec())
+        assert not os.path.exists(self.file_path)
+
+        with raises(TypeError):
+            ValueCodec()
+
+    def test_should_reopen_file_written_with_custom_codec(self):
+        class ReversedCodec(ValueCodec):
+            codec_id = 42
+            name = "reversed"
+
+            def encode(self, value):
+                return str.encode(value[::-1])
+
+            def decode(self, value_as_bytes):
+                return value_as_bytes.decode()[::-1]
+
+        kv_store = KeyValueStore(file_path=self.file_path, value_codec=ReversedCodec())
+        kv_store.write("key_1", "amuthan")
+        kv_store.shutdown()
+
+        with raises(StoreException):
+            KeyValueStore(file_path=self.file_path)
+
+        kv_store = KeyValueStore(file_path=self.file_path, value_codec=ReversedCodec())
+        assert kv_store.read("key_1") == "amuthan"
+        kv_store.shutdown()
+
+        register_codec(ReversedCodec())
+        try:
+            assert KeyValueStore(file_path=self.file_path).read("key_1") == "amuthan"
+            assert get_codec("reversed").codec_id == 42
+            with raises(ValueError):
+                register_codec(UnregisteredJsonCodec())
+        finally:
+            VALUE_CODECS.pop("reversed")
+            VALUE_CODECS_BY_ID.pop(42)
+
+
+class UnregisteredJsonCodec(JsonCodec):
+    codec_id = 42
+    name = "json_42"
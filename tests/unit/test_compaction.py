@@ -0,0 +1,72 @@
+import os
+
+from pykv.growth import GrowthPolicy
+from pykv.main import KeyValueStore
+
+
+class TestCompaction:
+    file_path = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.file_path = "test_db.bin"
+
+    @classmethod
+    def teardown_method(cls):
+        if os.path.exists(cls.file_path):
+            os.remove(cls.file_path)
+
+    def test_should_move_tail_records_into_holes_and_shrink_file(self):
+        kv_store = KeyValueStore(file_path=self.file_path,
+                                 growth_policy=GrowthPolicy(minimum_chunk_in_blocks=8))
+
+        for index in range(60):
+            kv_store.write(f"key_{index}", {'1': (index % 3) * 200 * 'amuthan'})
+        for index in range(0, 50):
+            kv_store.delete(f"key_{index}")
+
+        size_before_compaction = os.path.getsize(self.file_path)
+        expected_keys_and_values = kv_store.get_all()
+
+        moved_records = kv_store.compact()
+
+        assert moved_records == 10
+        assert kv_store.file_store.free_slots.holes_count() == 0
+        assert os.path.getsize(self.file_path) < size_before_compaction
+        assert kv_store.get_all() == expected_keys_and_values
+        assert kv_store.read("key_59") == {'1': 400 * 'amuthan'}
+
+        kv_store = KeyValueStore(file_path=self.file_path)
+        assert kv_store.get_all() == expected_keys_and_values
+
+    def test_should_respect_compaction_budget(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+
+        for index in range(20):
+            kv_store.write(f"key_{index}", {'1': index})
+        for index in range(0, 10):
+            kv_store.delete(f"key_{index}")
+
+        assert kv_store.compact(max_records_to_move=4) == 4
+        assert kv_store.file_store.current_slot == 16
+
+    def test_should_not_truncate_file_under_views_of_remapped_mappings(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+        kv_store.write_many({f"key_{index}": {'1': index} for index in range(200)})
+        kv_store.write("A", {'1': 'A'})
+        raw_value = kv_store.read_raw("A")
+
+        kv_store.write_many({f"key_{index}": {'1': index} for index in range(200, 400)})
+        assert kv_store.file_store.remaps == 1
+        kv_store.delete_many([f"key_{index}" for index in range(400)])
+        kv_store.compact()
+
+        assert os.path.getsize(self.file_path) >= len(kv_store.file_store.retired_file_pointers[0])
+        assert len(bytes(raw_value)) == len(b'{"1": "A"}')
+        assert kv_store.read("A") == {'1': 'A'}
+
+        raw_value.release()
+        kv_store.compact()
+        assert kv_store.file_store.retired_file_pointers == []
+        assert os.path.getsize(self.file_path) < 100 * 512
+        kv_store.close()
@@ -0,0 +1,72 @@
+import os
+
+from pytest import raises
+
+from pykv.compression import CompressionPolicy
+from pykv.main import KeyValueStore
+from pykv.record import RecordManager, COMPRESSED_PRIMARY_SLOT, PRIMARY_SLOT, is_primary_slot
+
+
+def test_should_compress_only_values_above_minimum_size():
+    policy = CompressionPolicy(minimum_size_in_bytes=100)
+
+    assert policy.compress(99 * b"a") is None
+    assert len(policy.compress(1000 * b"a")) < 1000
+    with raises(ValueError):
+        CompressionPolicy(level=10)
+
+
+def test_should_read_compressed_record_decompressed():
+    record_manager = RecordManager()
+    file_pointer = bytearray(10 * record_manager.slot_size_in_bytes)
+    value_as_bytes = 2000 * b"v"
+
+    record_manager.write(file_pointer, 0, b"key", CompressionPolicy().compress(value_as_bytes), is_compressed=True)
+    type_flag, slots_count, _, _, value_len, key_as_bytes, read_value = record_manager.read(file_pointer, 0)
+
+    assert type_flag == COMPRESSED_PRIMARY_SLOT
+    assert slots_count == 1
+    assert value_len < 2000
+    assert read_value == value_as_bytes
+    assert record_manager.is_available(file_pointer, 0)
+    assert is_primary_slot(PRIMARY_SLOT) and is_primary_slot(COMPRESSED_PRIMARY_SLOT)
+
+
+class TestCompressedStore:
+    file_path = "test_db.bin"
+
+    def teardown_method(self):
+        for file_path in (self.file_path, self.file_path + ".hint"):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def test_should_store_repetitive_values_in_fewer_slots(self):
+        kv_store = KeyValueStore(file_path=self.file_path, compression_policy=CompressionPolicy())
+        kv_store.write("key_1", {'1': 1000 * 'amuthan'})
+        kv_store.write("key_2", {'1': 'small'})
+        kv_store.write("key_3", {'1': os.urandom(3000).hex()})
+
+        assert kv_store.file_store.keys_and_offsets == {"key_1": 0, "key_2": 1, "key_3": 2}
+        file_store = kv_store.file_store
+        assert [file_store.record_manager.read_header(file_store.file_pointer, file_store.starting_offset + slot * 512)[0]
+                for slot in (0, 1)] == [COMPRESSED_PRIMARY_SLOT, PRIMARY_SLOT]
+        assert file_store.current_slot < 2 + 12
+        assert kv_store.read("key_1") == {'1': 1000 * 'amuthan'}
+        assert bytes(kv_store.read_raw("key_1")) == str.encode('{"1": "' + 1000 * 'amuthan' + '"}')
+        assert kv_store.get_all()["key_1"] == {'1': 1000 * 'amuthan'}
+        assert dict(kv_store.scan_iter())["key_3"] == kv_store.read("key_3")
+        kv_store.close()
+
+    def test_should_load_mixed_records_without_compression_policy(self):
+        kv_store = KeyValueStore(file_path=self.file_path, compression_policy=CompressionPolicy())
+        kv_store.write_many({"key_1": {'1': 1000 * 'amuthan'}, "key_2": {'1': 'small'}})
+        kv_store.shutdown()
+        os.remove(self.file_path + ".hint")
+
+        kv_store = KeyValueStore(file_path=self.file_path)
+        kv_store.write("key_3", {'1': 1000 * 'amuthan'})
+
+        assert kv_store.read("key_1") == {'1': 1000 * 'amuthan'}
+        assert kv_store.read("key_2") == {'1': 'small'}
+        assert kv_store.file_store.current_slot == 2 + 14
+        kv_store.close()
@@ -0,0 +1,91 @@
+import os
+from time import sleep
+
+from pykv.main import KeyValueStore
+from pykv.sharded_store import ShardedKeyValueStore, get_shard_file_path
+
+
+class TestCursorScan:
+    file_path = "test_db.bin"
+
+    @classmethod
+    def teardown_method(cls):
+        paths = [cls.file_path] + [get_shard_file_path(cls.file_path, shard_index) for shard_index in range(3)]
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_should_scan_file_store_in_batches(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+        for index in range(30):
+            kv_store.write(f"user:{index}", {'1': 1000 * 'a' if index % 7 == 0 else index})
+        kv_store.write("order:1", {'1': 1})
+        kv_store.write("user:expired", {'1': 1}, time_to_live_in_seconds=1)
+        sleep(2.1)
+
+        cursor, batch = kv_store.scan(0, count=7)
+        assert cursor > 0
+        assert len(batch) == 7
+
+        keys_and_values = dict(kv_store.scan_iter(count=7))
+        assert keys_and_values == dict([(f"user:{index}", {'1': 1000 * 'a' if index % 7 == 0 else index})
+                                        for index in range(30)] + [("order:1", {'1': 1})])
+        assert sorted(kv_store.scan_iter(match="user:1", keys_only=True)) == \
+               ["user:1"] + [f"user:{index}" for index in range(10, 20)]
+        assert list(kv_store.scan_iter(match="order:?", keys_only=True)) == ["order:1"]
+        kv_store.close()
+
+    def test_should_tolerate_writes_between_batches(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+        for index in range(20):
+            kv_store.write(f"key_{index}", {'1': 1000 * 'a' if index % 3 == 0 else index})
+
+        scanned_keys = []
+        cursor = 0
+        while True:
+            cursor, keys = kv_store.scan(cursor, count=4, keys_only=True)
+            scanned_keys.extend(keys)
+            if cursor == 0:
+                break
+            # Freeing a scanned record and filling the hole with a longer value leaves the next cursors pointing
+            # into the middle of records.
+            kv_store.delete(keys[0])
+            kv_store.write(keys[0] + "_new", {'1': 3000 * 'b'})
+
+        assert {f"key_{index}" for index in range(20)} <= set(scanned_keys)
+        assert len(scanned_keys) == len(set(scanned_keys))
+        kv_store.close()
+
+    def test_should_scan_mem_store_without_exposing_its_dict(self):
+        kv_store = KeyValueStore(file_path=self.file_path, mem_store_mode=True)
+        for index in range(10):
+            kv_store.write(f"key_{index}", index)
+
+        kv_store.get_all().clear()
+
+        assert kv_store.scan(0, count=4) == (4, [("key_0", 0), ("key_1", 1), ("key_2", 2), ("key_3", 3)])
+        assert list(kv_store.scan_iter(count=4, keys_only=True)) == [f"key_{index}" for index in range(10)]
+        kv_store.close()
+
+    def test_should_not_skip_keys_when_mem_store_keys_are_deleted_between_batches(self):
+        kv_store = KeyValueStore(file_path=self.file_path, mem_store_mode=True)
+        for index in range(6):
+            kv_store.write(f"k{index}", index)
+
+        cursor, keys = kv_store.scan(0, count=3, keys_only=True)
+        assert keys == ["k0", "k1", "k2"]
+
+        kv_store.delete("k0")
+        kv_store.write("k6", 6)
+
+        cursor, keys = kv_store.scan(cursor, count=3, keys_only=True)
+        assert keys == ["k3", "k4", "k5"]
+        assert kv_store.scan(cursor, count=3, keys_only=True) == (0, ["k6"])
+        kv_store.close()
+
+    def test_should_scan_across_shards(self):
+        kv_store = ShardedKeyValueStore(shard_count=3, file_path=self.file_path)
+        kv_store.write_many({f"key_{index}": index for index in range(25)})
+
+        assert dict(kv_store.scan_iter(count=4)) == {f"key_{index}": index for index in range(25)}
+        kv_store.close()
@@ -0,0 +1,126 @@
+import os
+import threading
+from time import sleep
+
+from pytest import raises
+
+from pykv.durability import DurabilityPolicy, DirtyRangeFlusher
+from pykv.main import KeyValueStore
+
+
+def test_should_reject_unknown_durability_mode():
+    with raises(ValueError):
+        DurabilityPolicy(mode="always")
+
+
+def test_should_coalesce_dirty_pages_into_ranges():
+    flushed_ranges = []
+    flusher = DirtyRangeFlusher(DurabilityPolicy(mode="group_commit"), flushed_ranges.extend, page_size_in_bytes=4096)
+    flusher.mark_dirty(0, 10)
+    flusher.mark_dirty(4096 + 5, 10)
+    flusher.mark_dirty(5 * 4096, 5000)
+
+    flusher.commit()
+
+    assert flushed_ranges == [(0, 8192), (5 * 4096, 8192)]
+    assert flusher.stats() == {"dirty_pages": 0, "flushes": 1, "flushed_bytes": 16384}
+
+
+def test_should_not_track_or_flush_without_durability():
+    flushed_ranges = []
+    flusher = DirtyRangeFlusher(DurabilityPolicy(), flushed_ranges.extend)
+    flusher.mark_dirty(0, 10)
+
+    flusher.flush()
+
+    assert flushed_ranges == []
+    assert flusher.stats()["dirty_pages"] == 0
+
+
+def test_should_share_one_flush_between_concurrent_committers():
+    def slow_flush(flush_ranges):
+        sleep(0.05)
+
+    flusher = DirtyRangeFlusher(DurabilityPolicy(mode="group_commit"), slow_flush, page_size_in_bytes=4096)
+
+    def write_and_commit(index):
+        flusher.mark_dirty(index * 4096, 100)
+        flusher.commit()
+
+    threads = [threading.Thread(target=write_and_commit, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert flusher.stats()["dirty_pages"] == 0
+    assert flusher.stats()["flushes"] < 8
+    assert flusher.stats()["flushed_bytes"] == 8 * 4096
+
+
+class TestDurableStore:
+    file_path = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.file_path = "test_db.bin"
+
+    @classmethod
+    def teardown_method(cls):
+        if os.path.exists(cls.file_path):
+            os.remove(cls.file_path)
+
+    def test_should_flush_every_batch_with_group_commit(self):
+        kv_store = KeyValueStore(file_path=self.file_path,
+                                 durability_policy=DurabilityPolicy(mode="group_commit"))
+
+        kv_store.write("key_1", {'1': 2})
+        kv_store.write_many({"key_2": {'1': 3}, "key_3": {'1': 4}})
+
+        assert kv_store.durability_stats()["flushes"] == 2
+        assert kv_store.durability_stats()["dirty_pages"] == 0
+        assert kv_store.read("key_3") == {'1': 4}
+
+    def test_should_flush_periodically(self):
+        kv_store = KeyValueStore(file_path=self.file_path,
+                                 durability_policy=DurabilityPolicy(mode="periodic",
+                                                                    flush_interval_in_milliseconds=20))
+        kv_store.start()
+
+        kv_store.write("key_1", {'1': 2})
+        sleep(0.2)
+
+        assert kv_store.durability_stats()["dirty_pages"] == 0
+        assert kv_store.durability_stats()["flushes"] == 1
+        kv_store.stop_background_jobs()
+
+    def test_should_flush_every_slot_of_deleted_and_moved_records(self):
+        kv_store = KeyValueStore(file_path=self.file_path,
+                                 durability_policy=DurabilityPolicy(mode="group_commit"))
+        file_store = kv_store.file_store
+        flushed_ranges = []
+        flush_ranges = file_store.durability.flush_ranges
+        file_store.durability.flush_ranges = lambda ranges: (flushed_ranges.extend(ranges), flush_ranges(ranges))
+
+        def is_flushed(slot, slots_count):
+            record_start = file_store.starting_offset + slot * file_store.block_size_in_bytes
+            record_end = record_start + slots_count * file_store.block_size_in_bytes
+            return all(any(start <= offset < start + length for start, length in flushed_ranges)
+                       for offset in range(record_start, record_end, file_store.block_size_in_bytes))
+
+        kv_store.write("key_1", {'1': 15000 * 'a'})
+        kv_store.write("key_2", {'1': 15000 * 'b'})
+        kv_store.write("key_3", {'1': 15000 * 'c'})
+        key_1_slot, key_2_slot = file_store.keys_and_offsets["key_1"], file_store.keys_and_offsets["key_2"]
+        slots_count = key_2_slot - key_1_slot
+
+        flushed_ranges.clear()
+        kv_store.delete("key_2")
+        assert is_flushed(key_2_slot, slots_count)
+
+        kv_store.delete("key_1")
+        flushed_ranges.clear()
+        key_3_slot = file_store.keys_and_offsets["key_3"]
+        assert kv_store.compact() == 1
+        assert is_flushed(key_3_slot, slots_count)
+        assert kv_store.read("key_3") == {'1': 15000 * 'c'}
@@ -0,0 +1,65 @@
+from time import time
+
+from pykv.data_structures.expiry_queue import ExpiryQueue
+from pykv.expiry import ActiveExpiry, ActiveExpiryPolicy
+from pykv.main import KeyValueStore
+
+
+def create_expired_keys(expiry_queue: ExpiryQueue, count: int):
+    expired_at = int(time()) - 10
+    for index in range(count):
+        expiry_queue.schedule(f"key_{index}", expired_at)
+
+
+def test_should_bound_keys_expired_per_cycle():
+    expiry_queue = ExpiryQueue()
+    create_expired_keys(expiry_queue, 250)
+    deleted_batches = []
+    active_expiry = ActiveExpiry(expiry_queue, deleted_batches.append, maximum_interval_in_seconds=10,
+                                 policy=ActiveExpiryPolicy(keys_per_cycle=100, keys_per_batch=40,
+                                                           time_budget_per_cycle_in_seconds=0))
+
+    assert active_expiry.run_cycle() == 100
+    assert [len(batch) for batch in deleted_batches] == [40, 40, 20]
+    assert active_expiry.stats()["backlog"] == 150
+    assert active_expiry.stats()["lag_in_seconds"] >= 10
+    assert active_expiry.next_interval_in_seconds() == 0.05
+
+    assert active_expiry.run_cycle() == 100
+    assert active_expiry.run_cycle() == 50
+    assert active_expiry.stats()["backlog"] == 0
+    assert active_expiry.stats()["expired_keys"] == 250
+    assert active_expiry.stats()["cycles"] == 3
+
+
+def test_should_back_off_until_next_expiry_when_nothing_is_expired():
+    expiry_queue = ExpiryQueue()
+    active_expiry = ActiveExpiry(expiry_queue, lambda keys: None, maximum_interval_in_seconds=10,
+                                 policy=ActiveExpiryPolicy())
+
+    assert active_expiry.run_cycle() == 0
+    assert active_expiry.next_interval_in_seconds() == 10
+
+    expiry_queue.schedule("key_1", int(time()) + 3)
+    assert 2 <= active_expiry.next_interval_in_seconds() <= 3
+
+
+def test_should_drain_all_expired_keys_without_policy():
+    expiry_queue = ExpiryQueue()
+    create_expired_keys(expiry_queue, 250)
+    active_expiry = ActiveExpiry(expiry_queue, lambda keys: None, maximum_interval_in_seconds=10)
+
+    assert active_expiry.run_cycle() == 250
+    assert active_expiry.next_interval_in_seconds() == 10
+
+
+def test_should_expose_expiry_stats_from_store():
+    kv_store = KeyValueStore(file_path="test_expiry_stats.bin", mem_store_mode=True,
+                             active_expiry_policy=ActiveExpiryPolicy(keys_per_cycle=1))
+    kv_store.write("key_1", {'1': 2}, time_to_live_in_seconds=100)
+    kv_store.write("key_2", {'1': 3})
+
+    stats = kv_store.expiry_stats()
+    assert stats["tracked_keys"] == 1
+    assert stats["backlog"] == 0
+    kv_store.close()
@@ -0,0 +1,78 @@
+import os
+
+from pytest import raises
+
+from pykv.growth import GrowthPolicy
+from pykv.main import KeyValueStore, StoreSizeLimitException
+from pykv.store import StoreFullException
+
+
+def test_should_grow_geometrically_with_minimum_chunk():
+    growth_policy = GrowthPolicy(growth_factor=2, minimum_chunk_in_blocks=16)
+
+    assert growth_policy.get_total_blocks(10, 11, 512, 10) == 26
+    assert growth_policy.get_total_blocks(100, 101, 512, 10) == 200
+    assert growth_policy.get_total_blocks(100, 500, 512, 10) == 500
+
+
+def test_should_cap_growth_at_maximum_file_size():
+    growth_policy = GrowthPolicy(maximum_file_size_in_bytes=10 + 40 * 512)
+
+    assert growth_policy.get_total_blocks(30, 31, 512, 10) == 40
+
+    with raises(StoreFullException):
+        growth_policy.get_total_blocks(30, 41, 512, 10)
+
+
+class TestFileGrowth:
+    file_path = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.file_path = "test_db.bin"
+
+    @classmethod
+    def teardown_method(cls):
+        if os.path.exists(cls.file_path):
+            os.remove(cls.file_path)
+
+    def test_should_grow_file_in_place(self):
+        kv_store = KeyValueStore(file_path=self.file_path,
+                                 growth_policy=GrowthPolicy(minimum_chunk_in_blocks=32))
+
+        for index in range(40):
+            kv_store.write(f"key_{index}", {'1': index})
+
+        assert kv_store.file_store.total_blocks == 42
+        assert os.path.getsize(self.file_path) == 10 + 42 * 512
+        assert kv_store.read('key_0') == {'1': 0}
+        assert kv_store.read('key_39') == {'1': 39}
+
+    def test_should_raise_exception_when_size_limit_reached(self):
+        kv_store = KeyValueStore(file_path=self.file_path,
+                                 growth_policy=GrowthPolicy(maximum_file_size_in_bytes=10 + 20 * 512))
+
+        for index in range(20):
+            kv_store.write(f"key_{index}", {'1': index})
+
+        with raises(StoreSizeLimitException):
+            kv_store.write("key_20", {'1': 20})
+
+    def test_should_fill_freed_slots_with_batch_writes_at_size_limit(self):
+        kv_store = KeyValueStore(file_path=self.file_path,
+                                 growth_policy=GrowthPolicy(maximum_file_size_in_bytes=10 + 20 * 512))
+        kv_store.write_many({f"key_{index}": {'1': index} for index in range(20)})
+        kv_store.delete_many([f"key_{index}" for index in range(0, 18, 2)])
+
+        results = kv_store.write_many({f"new_key_{index}": {'1': index} for index in range(9)})
+
+        assert results == {f"new_key_{index}": None for index in range(9)}
+        assert kv_store.file_store.total_blocks == 20
+        assert kv_store.read("new_key_8") == {'1': 8}
+
+        # A batch that does not fit gives the holes it had planned to use back.
+        kv_store.delete("key_1")
+        with raises(StoreSizeLimitException):
+            kv_store.write_many({"key_20": {'1': 20}, "key_21": {'1': 21}})
+        kv_store.write("key_22", {'1': 22})
+        assert kv_store.read("key_22") == {'1': 22}
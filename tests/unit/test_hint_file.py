@@ -0,0 +1,65 @@
+import os
+
+from pykv.main import KeyValueStore
+
+
+class TestHintFile:
+    file_path = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.file_path = "test_db.bin"
+
+    @classmethod
+    def teardown_method(cls):
+        for file_path in (cls.file_path, cls.file_path + ".hint"):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def test_should_load_index_from_hint_file_after_shutdown(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+        kv_store.write("key_1", {'1': 2, '3': 55})
+        kv_store.write("key_2", {'1': 1000 * 'amuthan', '3': 55}, time_to_live_in_seconds=100)
+        kv_store.write("key_3", {'1': 'ss', '3': 55})
+        kv_store.delete("key_1")
+        kv_store.shutdown()
+
+        assert os.path.exists(self.file_path + ".hint")
+
+        kv_store = KeyValueStore(file_path=self.file_path)
+
+        assert kv_store.file_store.hint_is_fresh
+        assert kv_store.file_store.keys_and_offsets == {"key_2": 1, "key_3": 15}
+        assert kv_store.file_store.free_slots.holes_by_start == {0: 1}
+        assert kv_store.file_store.expiry_queue.get_expiry("key_2") is not None
+        assert kv_store.read("key_3") == {'1': 'ss', '3': 55}
+
+    def test_should_fall_back_to_scan_when_hint_file_is_stale(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+        kv_store.write("key_1", {'1': 2, '3': 55})
+        kv_store.shutdown()
+
+        kv_store = KeyValueStore(file_path=self.file_path)
+        kv_store.write("key_2", {'1': 'ss', '3': 55})
+
+        kv_store = KeyValueStore(file_path=self.file_path)
+
+        assert not kv_store.file_store.hint_is_fresh
+        assert not os.path.exists(self.file_path + ".hint")
+        assert kv_store.get_all() == {"key_1": {'1': 2, '3': 55}, "key_2": {'1': 'ss', '3': 55}}
+
+    def test_should_refresh_hint_file_after_writes_to_store_loaded_from_hint(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+        kv_store.write("a", 1)
+        kv_store.shutdown()
+
+        kv_store = KeyValueStore(file_path=self.file_path)
+        assert kv_store.file_store.hint_is_fresh
+        kv_store.write("b", 2)
+        assert kv_store.file_store.changed_since_hint_file
+        kv_store.shutdown()
+
+        assert os.path.exists(self.file_path + ".hint")
+        kv_store = KeyValueStore(file_path=self.file_path)
+        assert kv_store.file_store.hint_is_fresh
+        assert kv_store.read("b") == 2
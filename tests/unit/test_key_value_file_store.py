@@ -1,8 +1,9 @@
 import os
-from time import sleep
+from time import sleep, time
 
 from _pytest.python_api import raises
 
+from pykv.codecs import JsonCodec
 from pykv.main import KeyValueStore, ExpiredKeyException
 
 
@@ -51,6 +52,81 @@ class TestKeyValueStore:
             "key_3": {'1': 'ss', '3': 55}
         }
 
+    def test_should_reuse_deleted_slots(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+        kv_store.start()
+
+        kv_store.write("key_1", {'1': 2})
+        kv_store.write("key_2", {'1': 1000 * 'amuthan', '3': 55})
+        kv_store.write("key_3", {'1': 'ss', '3': 55})
+        current_slot = kv_store.file_store.current_slot
+
+        kv_store.delete('key_2')
+        kv_store.write("key_4", {'1': 500 * 'amuthan'})
+        kv_store.write("key_5", {'1': 'ss'})
+
+        assert kv_store.file_store.current_slot == current_slot
+        assert kv_store.read('key_4') == {'1': 500 * 'amuthan'}
+        assert kv_store.read('key_5') == {'1': 'ss'}
+
+    def test_should_read_raw_value_bytes(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+        kv_store.start()
+
+        kv_store.write("key_1", {'1': 'ss', '3': 55})
+        kv_store.write("key_2", {'1': 1000 * 'amuthan', '3': 55})
+
+        single_slot_value = kv_store.read_raw('key_1')
+        assert isinstance(single_slot_value, memoryview)
+        assert bytes(single_slot_value) == b'{"1": "ss", "3": 55}'
+
+        segments = kv_store.read_raw('key_2')
+        assert len(segments) == 14
+        assert b"".join(segments) == str.encode('{"1": "' + 1000 * 'amuthan' + '", "3": 55}')
+
+    def test_should_serve_reads_from_value_cache(self):
+        kv_store = KeyValueStore(file_path=self.file_path, cache_max_entries=10)
+        kv_store.start()
+
+        kv_store.write("key_1", {'1': 2, '3': 55})
+
+        assert kv_store.read('key_1') == {'1': 2, '3': 55}
+        assert kv_store.read('key_1') == {'1': 2, '3': 55}
+
+        kv_store.delete('key_1')
+        kv_store.write("key_1", {'1': 'ss'})
+
+        assert kv_store.read('key_1') == {'1': 'ss'}
+        assert kv_store.cache_stats() == {"entries": 1, "size_in_bytes": 11, "hits": 1, "misses": 2, "evictions": 0}
+
+    def test_should_skip_decoding_on_value_cache_hits(self):
+        class CountingCodec(JsonCodec):
+            decode_calls = 0
+
+            def decode(self, value_as_bytes):
+                CountingCodec.decode_calls += 1
+                return super().decode(value_as_bytes)
+
+        kv_store = KeyValueStore(file_path=self.file_path, cache_max_entries=10, value_codec=CountingCodec())
+        kv_store.write("key_1", {'1': [2], '3': 55})
+
+        for _ in range(5):
+            assert kv_store.read('key_1') == {'1': [2], '3': 55}
+
+        assert CountingCodec.decode_calls == 1
+        assert kv_store.cache_stats()["hits"] == 4
+
+    def test_should_copy_cached_values_on_read_when_asked(self):
+        kv_store = KeyValueStore(file_path=self.file_path, cache_max_entries=10, cache_copy_on_read=True)
+        kv_store.write("key_1", {'1': [2], '3': 55})
+
+        kv_store.read('key_1')['1'].append(3)
+        value = kv_store.read('key_1')
+        value['3'] = 56
+
+        assert kv_store.read('key_1') == {'1': [2], '3': 55}
+        assert kv_store.cache_stats()["hits"] == 2
+
     def test_should_load_existing_file(self):
         kv_store = KeyValueStore(file_path='tests/unit/test_data_fixture.bin')
         kv_store.start()
@@ -78,6 +154,20 @@ class TestKeyValueStore:
             "key_3": {'1': 'ss', '3': 55}
         }
 
+    def test_should_honour_given_time_to_live(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+
+        kv_store.write("key_1", {'1': 2}, time_to_live_in_seconds=1000)
+        kv_store.write("key_2", {'1': 3})
+
+        expiry = kv_store.file_store.expiry_queue.get_expiry("key_1")
+        assert 1000 <= expiry - time() <= 1001
+        assert kv_store.file_store.expiry_queue.get_expiry("key_2") is None
+        assert kv_store.read("key_1") == {'1': 2}
+
+        kv_store.delete("key_1")
+        assert kv_store.file_store.expiry_queue.is_empty()
+
     def test_should_delete_key_accessed_after_time_to_live_expired(self):
         kv_store = KeyValueStore(file_path=self.file_path,
                                  background_jobs_frequency_in_seconds=2)
@@ -0,0 +1,86 @@
+import os
+
+from pytest import raises
+
+from pykv.file_store import FileStore
+from pykv.hint import HINT_HEADER, HINT_ENTRY, HINT_MAGIC, read_hint_file
+from pykv.main import KeyValueStore, InvalidKeyException
+from pykv.record import FORMAT_V2, create_record_manager, get_format_version
+from pykv.store import StoreException
+
+
+def test_should_write_format_2_records_contiguously():
+    record_manager = create_record_manager(format_version=FORMAT_V2)
+    file_pointer = bytearray(200 * record_manager.slot_size_in_bytes)
+    value_as_bytes = os.urandom(70000)
+
+    slots_count = record_manager.write(file_pointer, 0, 300 * b"k", value_as_bytes, 17)
+    _, read_slots_count, ttl_in_seconds, key_len, value_len, key_as_bytes, read_value = record_manager.read(
+        file_pointer, 0)
+
+    assert slots_count == read_slots_count == -(-(15 + 300 + 70000) // 512)
+    assert (ttl_in_seconds, key_len, value_len) == (17, 300, 70000)
+    assert record_manager.get_value_segments(0, key_len, value_len) == [(15 + 300, 70000)]
+    assert read_value == value_as_bytes
+    with raises(ValueError):
+        create_record_manager(format_version=3)
+
+
+def test_should_read_hint_files_with_narrow_entries(tmp_path):
+    hint_file_path = str(tmp_path / "legacy.hint")
+    with open(hint_file_path, "wb") as f:
+        f.write(HINT_HEADER.pack(HINT_MAGIC, 3, 1, 2) + HINT_ENTRY.pack(0, 2, 0, 5) + b"key_1")
+
+    assert read_hint_file(hint_file_path) == (3, 1, 2, [(b"key_1", 0, 2, 0)])
+
+
+class TestLargeValues:
+    file_path = "test_db.bin"
+
+    def teardown_method(self):
+        for file_path in (self.file_path, self.file_path + ".hint"):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def test_should_store_large_values_in_one_slice(self):
+        kv_store = KeyValueStore(file_path=self.file_path, format_version=FORMAT_V2, value_codec="bytes",
+                                 maximum_key_length=200, maximum_value_size_in_bytes=4 * 1024 * 1024)
+        large_value = os.urandom(2 * 1024 * 1024)
+        kv_store.write(150 * "k", large_value)
+        kv_store.write_many({"key_1": b"small", "key_2": os.urandom(100000)})
+
+        raw_value = kv_store.read_raw(150 * "k")
+        assert isinstance(raw_value, memoryview)
+        assert raw_value == large_value
+        raw_value.release()
+        assert kv_store.read("key_1") == b"small"
+        assert get_format_version(kv_store.file_store.file_pointer) == FORMAT_V2
+
+        expected_keys_and_values = kv_store.get_all()
+        kv_store.delete("key_1")
+        kv_store.compact()
+        del expected_keys_and_values["key_1"]
+        assert kv_store.get_all() == expected_keys_and_values
+        kv_store.shutdown()
+
+        kv_store = KeyValueStore(file_path=self.file_path)
+        assert kv_store.file_store.hint_is_fresh
+        assert kv_store.read(150 * "k") == large_value
+        kv_store.shutdown()
+
+        os.remove(self.file_path + ".hint")
+        file_store = FileStore(file_path=self.file_path, background_jobs_frequency_in_seconds=10,
+                               scan_workers=2, parallel_scan_minimum_slots=0)
+        assert file_store.get_all_keys_and_values() == expected_keys_and_values
+
+    def test_should_keep_default_limits_and_reject_format_mismatch(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+        with raises(InvalidKeyException):
+            kv_store.write(33 * "k", 1)
+        with raises(InvalidKeyException):
+            kv_store.write("key_1", 16001 * "v")
+        kv_store.write("key_1", 1)
+        kv_store.shutdown()
+
+        with raises(StoreException):
+            KeyValueStore(file_path=self.file_path, format_version=FORMAT_V2)
@@ -0,0 +1,79 @@
+import os
+import threading
+
+from pytest import raises
+
+from pykv.locks import ReadWriteLock
+from pykv.main import KeyValueStore
+
+
+def test_should_let_readers_share_the_lock():
+    lock = ReadWriteLock()
+    both_readers_inside = threading.Barrier(2, timeout=5)
+
+    def read():
+        with lock.read_lock():
+            both_readers_inside.wait()
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join()
+
+    assert not both_readers_inside.broken
+
+
+def test_should_keep_writer_exclusive():
+    lock = ReadWriteLock()
+    events = []
+
+    def write():
+        with lock.write_lock():
+            events.append("write")
+
+    with lock.read_lock():
+        writer = threading.Thread(target=write)
+        writer.start()
+        writer.join(timeout=0.2)
+        events.append("read")
+
+    writer.join()
+    assert events == ["read", "write"]
+
+
+def test_should_reenter_and_reject_upgrade():
+    lock = ReadWriteLock()
+
+    with lock.write_lock():
+        with lock.write_lock():
+            with lock.read_lock():
+                pass
+
+    with lock.read_lock():
+        with lock.read_lock():
+            with raises(RuntimeError):
+                lock.acquire_write()
+
+
+def test_should_reserve_distinct_slots_for_concurrent_writers():
+    file_path = "test_db.bin"
+    kv_store = KeyValueStore(file_path=file_path)
+
+    def write(thread_index):
+        for index in range(50):
+            kv_store.write(f"key_{thread_index}_{index}", {'1': (index % 4) * 300 * 'amuthan'})
+
+    writers = [threading.Thread(target=write, args=(thread_index,)) for thread_index in range(8)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    try:
+        assert kv_store.file_store.record_count == 400
+        for thread_index in range(8):
+            for index in range(50):
+                assert kv_store.read(f"key_{thread_index}_{index}") == {'1': (index % 4) * 300 * 'amuthan'}
+    finally:
+        os.remove(file_path)
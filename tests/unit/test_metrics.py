@@ -0,0 +1,92 @@
+from pytest import raises
+
+from pykv.main import KeyValueStore, KeyNotFoundException
+from pykv.metrics import LatencyHistogram, StoreMetrics
+from pykv.record import RecordManager
+
+
+def test_should_keep_histogram_percentiles_within_bucket_precision():
+    histogram = LatencyHistogram()
+    for value in range(1, 10001):
+        histogram.record(value)
+
+    assert histogram.count == 10000
+    assert histogram.minimum == 1
+    assert histogram.maximum == 10000
+    assert abs(histogram.get_percentile(0.5) - 5000) <= 5000 / 16
+    assert abs(histogram.get_percentile(0.99) - 9900) <= 9900 / 16
+    assert histogram.get_percentile(1.0) == 10000
+
+
+def test_should_map_every_value_below_its_bucket_upper_bound():
+    histogram = LatencyHistogram()
+    for value in list(range(0, 300)) + [12345, 987654321]:
+        bucket = histogram.get_bucket(value)
+        assert value <= histogram.get_bucket_upper_bound(bucket)
+        assert bucket == 0 or histogram.get_bucket_upper_bound(bucket - 1) < value
+
+
+class TestStoreMetrics:
+    file_path = "test_db.bin"
+
+    def setup_method(self):
+        self.traced_operations = []
+        self.metrics = StoreMetrics(hooks=[lambda operation, elapsed_in_seconds, exception:
+                                           self.traced_operations.append((operation, exception is not None))])
+        self.kv_store = KeyValueStore(file_path=self.file_path, metrics=self.metrics)
+
+    def teardown_method(self):
+        self.kv_store.close()
+
+    def test_should_count_operations_errors_and_internal_calls(self):
+        self.kv_store.write("key_1", {'1': 2})
+        self.kv_store.write_many({"key_2": 2, "key_3": 3})
+        self.kv_store.read("key_1")
+        with raises(KeyNotFoundException):
+            self.kv_store.read("missing_key")
+
+        operations = self.kv_store.stats()["operations"]
+
+        assert operations["write"]["count"] == 1
+        assert operations["write_many"]["count"] == 1
+        assert operations["read"]["count"] == 2
+        assert operations["read"]["errors"] == 1
+        assert operations["record.write"]["count"] == 3
+        assert operations["lock.write_wait"]["count"] >= 2
+        assert operations["read"]["p99_in_microseconds"] <= operations["read"]["max_in_microseconds"]
+        assert ("read", True) in self.traced_operations
+        assert ("record.write", False) in self.traced_operations
+
+    def test_should_report_store_gauges(self):
+        for index in range(10):
+            self.kv_store.write(f"key_{index}", {'1': 2})
+        self.kv_store.delete("key_3")
+
+        store_stats = self.kv_store.stats()["store"]
+
+        assert store_stats["record_count"] == 9
+        assert store_stats["current_slot"] == 10
+        assert store_stats["used_slots"] == 9
+        assert store_stats["free_slots"] == 1
+        assert store_stats["fragmentation"] == 0.1
+        assert store_stats["used_bytes"] == 9 * 512
+        assert store_stats["file_size_in_bytes"] >= store_stats["used_bytes"]
+
+    def test_should_time_expiry_cycles(self):
+        self.kv_store.store.expire_cycle()
+
+        assert self.kv_store.stats()["operations"]["expire_cycle"]["count"] == 1
+
+
+def test_should_leave_stores_without_metrics_uninstrumented():
+    kv_store = KeyValueStore(file_path="test_db.bin")
+    try:
+        kv_store.write("key_1", 1)
+
+        assert "read" not in vars(kv_store)
+        assert "write" not in vars(kv_store.file_store.record_manager)
+        assert kv_store.file_store.record_manager.write.__func__ is RecordManager.write
+        assert kv_store.stats()["operations"] == {}
+        assert kv_store.stats()["store"]["record_count"] == 1
+    finally:
+        kv_store.close()
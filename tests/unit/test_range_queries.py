@@ -0,0 +1,67 @@
+import os
+from time import sleep
+
+from pykv.main import KeyValueStore
+from pykv.sharded_store import ShardedKeyValueStore, get_shard_file_path
+
+
+class TestRangeQueries:
+    file_path = "test_db.bin"
+
+    @classmethod
+    def teardown_method(cls):
+        paths = [cls.file_path, cls.file_path + ".hint"] + \
+                [get_shard_file_path(cls.file_path, shard_index) for shard_index in range(3)]
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def write_users(self, kv_store):
+        kv_store.write_many({f"user:{user_id}:{field}": {'1': f"{user_id}-{field}"}
+                             for user_id in (41, 42, 43) for field in ("name", "age")})
+        kv_store.write("order:1", {'1': 1})
+
+    def test_should_query_ordered_index(self):
+        kv_store = KeyValueStore(file_path=self.file_path, sorted_index=True)
+        self.write_users(kv_store)
+
+        assert kv_store.prefix("user:42:") == [("user:42:age", {'1': "42-age"}), ("user:42:name", {'1': "42-name"})]
+        assert kv_store.prefix("user:", limit=3, keys_only=True) == ["user:41:age", "user:41:name", "user:42:age"]
+        assert kv_store.range("user:42", "user:43", keys_only=True) == ["user:42:age", "user:42:name"]
+        assert kv_store.range(end="user", keys_only=True) == ["order:1"]
+
+        kv_store.delete("user:42:age")
+        kv_store.write("user:42:city", {'1': "x"}, time_to_live_in_seconds=1)
+        assert kv_store.prefix("user:42:", keys_only=True) == ["user:42:city", "user:42:name"]
+        sleep(2.1)
+        assert kv_store.prefix("user:42:", keys_only=True) == ["user:42:name"]
+        kv_store.file_store.expire_cycle()
+        assert "user:42:city" not in kv_store.file_store.sorted_keys
+        kv_store.shutdown()
+
+        kv_store = KeyValueStore(file_path=self.file_path, sorted_index=True)
+        assert kv_store.prefix("user:4", keys_only=True) == \
+               ["user:41:age", "user:41:name", "user:42:name", "user:43:age", "user:43:name"]
+
+    def test_should_answer_queries_without_index(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+        self.write_users(kv_store)
+
+        assert kv_store.prefix("user:43:", keys_only=True) == ["user:43:age", "user:43:name"]
+        assert kv_store.range("order", "user:42", keys_only=True) == ["order:1", "user:41:age", "user:41:name"]
+
+    def test_should_query_mem_store_and_shards(self):
+        kv_store = KeyValueStore(file_path=self.file_path, mem_store_mode=True, sorted_index=True)
+        self.write_users(kv_store)
+        kv_store.delete("user:41:age")
+
+        assert kv_store.prefix("user:41", keys_only=True) == ["user:41:name"]
+        assert kv_store.range("user:43") == [("user:43:age", {'1': "43-age"}), ("user:43:name", {'1': "43-name"})]
+
+        sharded_store = ShardedKeyValueStore(shard_count=3, file_path=self.file_path, sorted_index=True)
+        self.write_users(sharded_store)
+
+        assert sharded_store.prefix("user:", limit=4, keys_only=True) == \
+               ["user:41:age", "user:41:name", "user:42:age", "user:42:name"]
+        assert sharded_store.range("user:43")[0] == ("user:43:age", {'1': "43-age"})
+        sharded_store.close()
@@ -0,0 +1,29 @@
+import mmap
+
+from pykv.record import RecordManager, PRIMARY_SLOT, SUB_SLOT
+
+
+def test_should_write_record_header_and_sub_slot_flags():
+    record_manager = RecordManager()
+    file_pointer = mmap.mmap(-1, 4 * 512)
+
+    slots_count = record_manager.write(file_pointer, 0, b"key", 1200 * b"a", ttl_in_seconds=7)
+
+    assert slots_count == 3
+    assert file_pointer[0:12] == bytes([PRIMARY_SLOT, 3, 0, 0, 0, 7, 3, 4, 176]) + b"key"
+    assert file_pointer[517] == SUB_SLOT
+    assert file_pointer[1033] == SUB_SLOT
+
+
+def test_should_read_record_spanning_multiple_slots():
+    record_manager = RecordManager()
+    file_pointer = mmap.mmap(-1, 40 * 512)
+    value = bytes(range(100, 120)) * 700
+
+    record_manager.write(file_pointer, 512, b"key_1", value)
+
+    assert record_manager.read(file_pointer, 512) == (PRIMARY_SLOT, 28, 0, 5, len(value), b"key_1", value)
+    assert record_manager.read_header(file_pointer, 512) == (PRIMARY_SLOT, 28, 0, 5, len(value))
+
+    assert record_manager.delete(file_pointer, 512) == 28
+    assert not record_manager.is_available(file_pointer, 512)
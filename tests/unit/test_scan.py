@@ -0,0 +1,51 @@
+import os
+
+from pykv.file_store import FileStore
+from pykv.scan import merge_scanned_records
+
+
+def test_should_drop_primary_flags_inside_earlier_records():
+    records = [
+        (b"key_3", 9, 1, 0, None),
+        (b"key_1", 0, 4, 0, None),
+        (b"bogus", 2, 30, 0, None),
+        (b"key_2", 4, 5, 0, None),
+        (b"tail", 10, 5, 0, None),
+    ]
+
+    assert merge_scanned_records(records, 12) == [
+        (b"key_1", 0, 4, 0, None),
+        (b"key_2", 4, 5, 0, None),
+        (b"key_3", 9, 1, 0, None),
+    ]
+
+
+class TestParallelScan:
+    file_path = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.file_path = os.getcwd() + "/test_db.bin"
+
+    @classmethod
+    def teardown_method(cls):
+        if os.path.exists(cls.file_path):
+            os.remove(cls.file_path)
+
+    def test_should_load_and_dump_with_parallel_scan(self):
+        file_store = FileStore(file_path=self.file_path, background_jobs_frequency_in_seconds=10)
+        for index in range(100):
+            file_store.create(f"key_{index}", {'1': (index % 7) * 100 * 'amuthan'})
+        for index in range(0, 100, 3):
+            file_store.delete(f"key_{index}")
+
+        expected_keys_and_offsets = dict(file_store.keys_and_offsets)
+        expected_keys_and_values = file_store.get_all_keys_and_values()
+
+        file_store = FileStore(file_path=self.file_path,
+                               background_jobs_frequency_in_seconds=10,
+                               scan_workers=2,
+                               parallel_scan_minimum_slots=0)
+
+        assert file_store.keys_and_offsets == expected_keys_and_offsets
+        assert file_store.get_all_keys_and_values() == expected_keys_and_values
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import threading
+
+from pytest import raises
+
+from pykv.async_store import AsyncKeyValueStore
+from pykv.client import KeyValueClient
+from pykv.main import KeyNotFoundException, InvalidKeyException
+from pykv.protocol import RemoteException
+from pykv.server import KeyValueServer
+
+
+class TestKeyValueServer:
+    file_path = "test_db.bin"
+
+    def setup_method(self):
+        self.loop = asyncio.new_event_loop()
+        self.server = KeyValueServer(AsyncKeyValueStore(file_path=self.file_path), port=0)
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.loop_thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result()
+        self.client = KeyValueClient(port=self.server.port, max_connections=2)
+
+    def teardown_method(self):
+        self.client.close()
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join()
+        self.loop.close()
+        for path in (self.file_path, self.file_path + ".hint"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_should_serve_store_commands(self):
+        self.client.write("key_1", {'1': 2, '3': 55})
+        self.client.write_many({"key_2": {'1': 'ss'}, "key_3": [1, 2]})
+
+        assert self.client.read("key_1") == {'1': 2, '3': 55}
+        assert self.client.get_all() == {"key_1": {'1': 2, '3': 55}, "key_2": {'1': 'ss'}, "key_3": [1, 2]}
+
+        results = self.client.read_many(["key_2", "missing"])
+        assert results["key_2"] == {'1': 'ss'}
+        assert isinstance(results["missing"], KeyNotFoundException)
+
+        self.client.delete("key_1")
+        with raises(KeyNotFoundException):
+            self.client.read("key_1")
+        with raises(InvalidKeyException):
+            self.client.write(40 * "k", 1)
+        with raises(RemoteException):
+            self.client.execute("close")
+        assert self.client.stats()["store"]["record_count"] == 2
+
+    def test_should_pipeline_commands_in_one_round_trip(self):
+        pipeline = self.client.pipeline()
+        pipeline.write("key_1", 1).write("key_2", 2).read("key_1").read("missing")
+
+        results = pipeline.execute()
+
+        assert results[:3] == [None, None, 1]
+        assert isinstance(results[3], KeyNotFoundException)
+
+    def test_should_batch_concurrent_calls(self):
+        def write_keys(thread_index):
+            for index in range(20):
+                self.client.write(f"key_{thread_index}_{index}", index)
+
+        threads = [threading.Thread(target=write_keys, args=(thread_index,)) for thread_index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(self.client.get_all()) == 80
+        assert self.client.read("key_3_19") == 19
@@ -0,0 +1,66 @@
+import os
+
+from pytest import raises
+
+from pykv.main import KeyNotFoundException
+from pykv.sharded_store import ShardedKeyValueStore, get_shard_index, get_shard_file_path
+
+
+def test_should_hash_keys_to_stable_shards():
+    assert get_shard_index("key_1", 4) == get_shard_index("key_1", 4)
+    assert {get_shard_index(f"key_{index}", 4) for index in range(100)} == {0, 1, 2, 3}
+    assert get_shard_file_path("test_db.bin", 2) == "test_db.shard2.bin"
+
+
+class TestShardedKeyValueStore:
+    file_path = "test_db.bin"
+
+    @classmethod
+    def teardown_method(cls):
+        for shard_index in range(4):
+            shard_file_path = get_shard_file_path(cls.file_path, shard_index)
+            for path in (shard_file_path, shard_file_path + ".hint"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def test_should_spread_keys_across_shard_files(self):
+        kv_store = ShardedKeyValueStore(shard_count=4, file_path=self.file_path)
+
+        results = kv_store.write_many({f"key_{index}": {'1': index} for index in range(40)})
+        kv_store.write("key_40", {'1': 40}, time_to_live_in_seconds=100)
+
+        assert all(result is None for result in results.values())
+        assert all(os.path.exists(get_shard_file_path(self.file_path, index)) for index in range(4))
+        assert all(len(shard.kv_store.file_store.keys_and_offsets) > 0 for shard in kv_store.shards)
+        assert kv_store.read("key_7") == {'1': 7}
+        assert bytes(kv_store.read_raw("key_7")) == b'{"1": 7}'
+        assert kv_store.get_all() == {f"key_{index}": {'1': index} for index in range(41)}
+        assert kv_store.expiry_stats()["tracked_keys"] == 1
+
+        read_results = kv_store.read_many(["key_1", "key_2", "missing"])
+        assert read_results["key_1"] == {'1': 1}
+        assert isinstance(read_results["missing"], KeyNotFoundException)
+
+        delete_results = kv_store.delete_many(["key_1", "key_2", "missing"])
+        assert delete_results["key_1"] is None
+        assert isinstance(delete_results["missing"], KeyNotFoundException)
+        with raises(KeyNotFoundException):
+            kv_store.read("key_1")
+
+        kv_store.close()
+        assert not os.path.exists(get_shard_file_path(self.file_path, 0))
+
+    def test_should_run_shards_in_worker_processes(self):
+        kv_store = ShardedKeyValueStore(shard_count=2, file_path=self.file_path, use_processes=True)
+
+        kv_store.write("key_1", {'1': 2})
+        kv_store.write_many({f"key_{index}": {'1': index} for index in range(2, 10)})
+
+        assert kv_store.read("key_1") == {'1': 2}
+        assert kv_store.read_raw("key_1") == b'{"1": 2}'
+        assert kv_store.read_many(["key_5"]) == {"key_5": {'1': 5}}
+        assert len(kv_store.get_all()) == 9
+        with raises(KeyNotFoundException):
+            kv_store.read("missing")
+
+        kv_store.close()
@@ -0,0 +1,143 @@
+import multiprocessing
+import os
+
+from pytest import raises
+
+from pykv.main import KeyValueStore, KeyNotFoundException, ReadOnlyStoreException, WriterStalledException
+from pykv.read_only_store import StoreWriterStalledException
+from pykv.shared_index import SharedIndexReader, SharedIndexWriter
+
+
+def read_in_process(file_path, key_string, results):
+    results.put(KeyValueStore(file_path=file_path, read_only=True).read(key_string))
+
+
+def test_should_publish_slots_through_shared_index():
+    index_file_path = "test_db.bin.index"
+    writer = SharedIndexWriter(index_file_path)
+    writer.rebuild({"key_1": 0, "key_2": 3}, 4096)
+    reader = SharedIndexReader(index_file_path)
+
+    writer.begin_write()
+    writer.put(b"key_3", 7)
+    writer.move(b"key_2", 3, 1)
+    writer.delete(b"key_1", 0)
+    assert reader.read_sequence() % 2 == 1
+    writer.end_write()
+
+    assert reader.read_sequence() == 2
+    assert list(reader.find_slots(b"key_1")) == []
+    assert list(reader.find_slots(b"key_2")) == [1]
+    assert sorted(reader.get_slots()) == [1, 7]
+
+    writer.rebuild({"key_2": 1}, 4096)
+    assert reader.is_retired()
+    reader.reopen()
+    assert list(reader.get_slots()) == [1]
+
+    reader.close()
+    writer.close()
+    assert not os.path.exists(index_file_path)
+
+
+class TestReadOnlyStore:
+    file_path = "test_db.bin"
+
+    @classmethod
+    def teardown_method(cls):
+        for path in (cls.file_path, cls.file_path + ".hint", cls.file_path + ".index"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_should_read_writer_changes_through_shared_index(self):
+        writer = KeyValueStore(file_path=self.file_path, shared_index=True)
+        writer.write("key_1", {'1': 2, '3': 55})
+        reader = KeyValueStore(file_path=self.file_path, read_only=True)
+
+        assert reader.read("key_1") == {'1': 2, '3': 55}
+
+        for index in range(200):
+            writer.write(f"key_{index + 2}", {'1': 1000 * 'a' if index % 10 == 0 else index})
+        writer.delete("key_1")
+
+        assert reader.read("key_150") == {'1': 148}
+        assert reader.read("key_2") == {'1': 1000 * 'a'}
+        assert bytes(reader.read_raw("key_3")) == b'{"1": 1}'
+        assert len(reader.get_all()) == 200
+        with raises(KeyNotFoundException):
+            reader.read("key_1")
+        with raises(ReadOnlyStoreException):
+            reader.write("key_1", {'1': 2})
+        with raises(ReadOnlyStoreException):
+            reader.delete("key_2")
+
+        writer.write("key_1", {'1': 3})
+        writer.compact()
+        assert reader.read("key_1") == {'1': 3}
+
+        reader.close()
+        writer.close()
+
+    def test_should_share_index_with_reader_processes(self):
+        writer = KeyValueStore(file_path=self.file_path, shared_index=True)
+        writer.write("key_1", {'1': 2})
+
+        results = multiprocessing.Queue()
+        reader_process = multiprocessing.Process(target=read_in_process, args=(self.file_path, "key_1", results))
+        reader_process.start()
+        reader_process.join()
+
+        assert results.get(timeout=5) == {'1': 2}
+        writer.close()
+
+    def test_should_follow_restarted_writer_and_give_up_on_stalled_one(self):
+        writer = KeyValueStore(file_path=self.file_path, shared_index=True)
+        writer.write("key_1", {'1': 2})
+        reader = KeyValueStore(file_path=self.file_path, read_only=True)
+        assert reader.read("key_1") == {'1': 2}
+        writer.shutdown()
+
+        restarted_writer = KeyValueStore(file_path=self.file_path, shared_index=True)
+        restarted_writer.write("key_2", {'1': 3})
+        assert reader.read("key_2") == {'1': 3}
+
+        reader.file_store.maximum_write_wait_in_seconds = 0.1
+        restarted_writer.file_store.shared_index.begin_write()
+        with raises(StoreWriterStalledException):
+            reader.file_store.get("key_1")
+        restarted_writer.file_store.shared_index.end_write()
+        assert reader.read("key_1") == {'1': 2}
+
+        reader.close()
+        restarted_writer.close()
+
+    def test_should_report_stalled_writer_on_every_read(self):
+        writer = KeyValueStore(file_path=self.file_path, shared_index=True)
+        writer.write("key_1", {'1': 2})
+        reader = KeyValueStore(file_path=self.file_path, read_only=True)
+        reader.file_store.maximum_write_wait_in_seconds = 0.1
+
+        writer.file_store.shared_index.begin_write()
+        for read in (lambda: reader.read("key_1"), lambda: reader.read_raw("key_1"),
+                     lambda: reader.read_many(["key_1"]), reader.get_all, reader.scan, reader.range):
+            with raises(WriterStalledException):
+                read()
+        writer.file_store.shared_index.end_write()
+
+        # The writer stalls after the key was found, while its value is read.
+        is_exists = reader.file_store.is_exists
+
+        def is_exists_then_stall(key_string):
+            is_found = is_exists(key_string)
+            writer.file_store.shared_index.begin_write()
+            return is_found
+
+        reader.file_store.is_exists = is_exists_then_stall
+        with raises(WriterStalledException):
+            reader.read("key_1")
+        writer.file_store.shared_index.end_write()
+        reader.file_store.is_exists = is_exists
+        assert reader.read("key_1") == {'1': 2}
+
+        reader.close()
+        writer.close()
@@ -0,0 +1,99 @@
+import os
+
+from pytest import raises
+
+from pykv.file_store import FileStore
+from pykv.main import KeyValueStore, KeyNotFoundException, InvalidValueException
+from pykv.record import RecordManager, SLOT_SIZE_SHIFT_OFFSET
+from pykv.size_class_store import SizeClassKeyValueStore, get_size_class_file_path
+from pykv.store import StoreException
+
+
+class TestSlotSize:
+    file_path = "test_db.bin"
+
+    def teardown_method(self):
+        for file_path in (self.file_path, self.file_path + ".hint"):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def test_should_record_slot_size_in_file_header(self):
+        kv_store = KeyValueStore(file_path=self.file_path, slot_size_in_bytes=64)
+        kv_store.write_many({f"key_{index}": {'1': index * 'v'} for index in range(100)})
+        kv_store.shutdown()
+        os.remove(self.file_path + ".hint")
+
+        file_store = FileStore(file_path=self.file_path, background_jobs_frequency_in_seconds=10,
+                               scan_workers=2, parallel_scan_minimum_slots=0)
+
+        assert file_store.file_pointer[SLOT_SIZE_SHIFT_OFFSET] == 6
+        assert file_store.block_size_in_bytes == 64
+        assert file_store.get_all_keys_and_values() == {f"key_{index}": {'1': index * 'v'} for index in range(100)}
+        assert file_store.get("key_99") == {'1': 99 * 'v'}
+        with raises(StoreException):
+            FileStore(file_path=self.file_path, background_jobs_frequency_in_seconds=10, slot_size_in_bytes=4096)
+
+    def test_should_keep_default_slot_size_readable_as_legacy_header(self):
+        kv_store = KeyValueStore(file_path=self.file_path)
+        kv_store.write("key_1", 1)
+
+        assert kv_store.file_store.file_pointer[SLOT_SIZE_SHIFT_OFFSET] == 0
+        assert RecordManager.get_slot_size(kv_store.file_store.file_pointer) == 512
+        kv_store.close()
+
+    def test_should_reject_invalid_slot_sizes_and_records_too_big_for_slots(self):
+        with raises(ValueError):
+            RecordManager(100)
+        with raises(ValueError):
+            RecordManager(32)
+
+        kv_store = KeyValueStore(file_path=self.file_path, slot_size_in_bytes=64)
+        with raises(InvalidValueException):
+            kv_store.write("key_1", 15000 * 'v')
+        assert not os.path.exists(self.file_path + ".hint")
+        kv_store.close()
+
+
+class TestSizeClassKeyValueStore:
+    file_path = "test_db.bin"
+
+    def teardown_method(self):
+        for slot_size_in_bytes in (64, 512, 4096):
+            file_path = get_size_class_file_path(self.file_path, slot_size_in_bytes)
+            for path in (file_path, file_path + ".hint"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def test_should_route_values_to_the_tightest_size_class(self):
+        kv_store = SizeClassKeyValueStore(file_path=self.file_path)
+        kv_store.write("small", 1)
+        kv_store.write_many({"medium": 450 * 'v', "large": 4000 * 'v'})
+
+        small_class, medium_class, large_class = kv_store.size_classes
+        assert get_size_class_file_path(self.file_path, 64) == "test_db.slot64.bin"
+        assert list(small_class.file_store.keys_and_offsets) == ["small"]
+        assert list(medium_class.file_store.keys_and_offsets) == ["medium"]
+        assert list(large_class.file_store.keys_and_offsets) == ["large"]
+        assert kv_store.read("large") == 4000 * 'v'
+        assert kv_store.get_all() == {"small": 1, "medium": 450 * 'v', "large": 4000 * 'v'}
+        assert kv_store.prefix("", keys_only=True) == ["large", "medium", "small"]
+        assert sorted(kv_store.scan_iter(keys_only=True, count=1)) == ["large", "medium", "small"]
+        kv_store.close()
+
+    def test_should_keep_keys_unique_across_size_classes(self):
+        kv_store = SizeClassKeyValueStore(file_path=self.file_path)
+        kv_store.write("key_1", 1)
+
+        with raises(InvalidValueException):
+            kv_store.write("key_1", 4000 * 'v')
+        results = kv_store.write_many({"key_1": 2, "key_2": 2})
+        assert isinstance(results["key_1"], InvalidValueException)
+        assert results["key_2"] is None
+
+        kv_store.delete("key_1")
+        kv_store.write("key_1", 4000 * 'v')
+        assert kv_store.read_many(["key_1", "missing"])["key_1"] == 4000 * 'v'
+        assert isinstance(kv_store.delete_many(["key_2", "missing"])["missing"], KeyNotFoundException)
+        with raises(KeyNotFoundException):
+            kv_store.read("key_2")
+        kv_store.close()